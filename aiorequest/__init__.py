@@ -1,9 +1,36 @@
 """Package provides asynchronous user-friendly HTTP client with clean objects."""
 from typing import Tuple
 from aiorequest.types import Credentials
-from aiorequest.responses import JsonType, Response, ResponseError, safe_response
-from aiorequest.sessions import HttpSession, LoggedHttpSession, Session
-from aiorequest.urls import Address, HttpUrl, HttpsUrl, Url
+from aiorequest.responses import JsonType, Response, ResponseError, SlimResponse, safe_response
+from aiorequest.caches import CacheStorage, CachedSession, DiskCache, MemoryCache
+from aiorequest.codecs import JsonCodec, OrJsonCodec, StdJsonCodec, UJsonCodec, fastest_codec
+from aiorequest.diagnostics import BlockingDetector, CallStats, DiagnosedSession, SlowCall
+from aiorequest.encodings import Compression
+from aiorequest.flights import SingleFlight
+from aiorequest.limits import RateLimiter, TokenBucket
+from aiorequest.multipart import Multipart
+from aiorequest.pages import CursorPages, LinkPages, OffsetPages, PageStrategy
+from aiorequest.pools import ConnectionPool, PoolLimits, PoolStats
+from aiorequest.resolvers import (
+    AioDnsResolver,
+    CachingResolver,
+    Resolution,
+    Resolver,
+    SystemResolver,
+)
+from aiorequest.retries import Backoff, RetryPolicy
+from aiorequest.sessions import HttpSession, LoggedHttpSession, Session, SessionOptions
+from aiorequest.timeouts import Deadline, Timeouts
+from aiorequest.traces import LatencyStats, Percentiles, Trace, TraceEvent, Tracer
+from aiorequest.transports import (
+    Http2Transport,
+    RequestOptions,
+    RequestsTransport,
+    StreamTransport,
+    Transport,
+)
+from aiorequest.uploads import BytesUpload, FileUpload, IterableUpload, Upload
+from aiorequest.urls import Address, HttpUrl, HttpsUrl, Url, UrlTemplate
 
 __author__: str = "Volodymyr Yahello"
 __email__: str = "vyahello@gmail.com"
@@ -15,13 +42,64 @@ __all__: Tuple[str, ...] = (
     "Credentials",
     "Session",
     "HttpSession",
+    "SessionOptions",
     "LoggedHttpSession",
     "JsonType",
     "Response",
     "ResponseError",
+    "SlimResponse",
     "safe_response",
+    "CachedSession",
+    "CacheStorage",
+    "MemoryCache",
+    "DiskCache",
+    "JsonCodec",
+    "StdJsonCodec",
+    "OrJsonCodec",
+    "UJsonCodec",
+    "fastest_codec",
+    "BlockingDetector",
+    "CallStats",
+    "DiagnosedSession",
+    "SlowCall",
+    "Compression",
+    "ConnectionPool",
+    "PoolLimits",
+    "PoolStats",
+    "Resolver",
+    "Resolution",
+    "SystemResolver",
+    "CachingResolver",
+    "AioDnsResolver",
+    "RetryPolicy",
+    "Backoff",
+    "RateLimiter",
+    "SingleFlight",
+    "TokenBucket",
+    "Timeouts",
+    "Deadline",
+    "Tracer",
+    "Trace",
+    "TraceEvent",
+    "LatencyStats",
+    "Percentiles",
+    "Transport",
+    "RequestOptions",
+    "RequestsTransport",
+    "StreamTransport",
+    "Http2Transport",
+    "Upload",
+    "FileUpload",
+    "IterableUpload",
+    "BytesUpload",
+    "Multipart",
+    "PageStrategy",
+    "LinkPages",
+    "CursorPages",
+    "OffsetPages",
     "Address",
     "HttpUrl",
     "HttpsUrl",
     "Url",
+    "UrlTemplate",
 )
@@ -0,0 +1,108 @@
+"""The module provides API for performing bulks of HTTP requests with bounded concurrency."""
+import asyncio
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from aiorequest.responses import Response
+from aiorequest.urls import Address
+
+Outcome = Union[Response, Exception]
+Request = Callable[[Address], Awaitable[Response]]
+
+
+async def ordered(
+    request: Request,
+    addresses: Iterable[Address],
+    concurrency: int = 10,
+    return_exceptions: bool = True,
+) -> List[Outcome]:
+    """Performs requests to given addresses and returns outcomes in the order of addresses.
+
+    Args:
+        request: a request to perform for every address
+        addresses: addresses to request
+        concurrency: maximum number of requests in flight
+        return_exceptions: whether failures are returned in place of responses or raised
+
+    Raises:
+        the first failure if `return_exceptions` is not set
+    """
+    outcomes: Dict[int, Outcome] = {}
+    pending: Iterator[Tuple[int, Address]] = enumerate(addresses)
+
+    async def worker() -> None:
+        """Requests addresses left until none remains."""
+        for index, address in pending:
+            try:
+                outcomes[index] = await request(address)
+            except Exception as error:
+                if not return_exceptions:
+                    raise
+                outcomes[index] = error
+
+    await _run([worker() for _ in range(max(concurrency, 1))])
+    return [outcomes[index] for index in range(len(outcomes))]
+
+
+async def completed(
+    request: Request, addresses: Iterable[Address], concurrency: int = 10
+) -> AsyncIterator[Tuple[Address, Outcome]]:
+    """Performs requests to given addresses and yields outcomes as soon as they are ready.
+
+    Args:
+        request: a request to perform for every address
+        addresses: addresses to request
+        concurrency: maximum number of requests in flight
+    """
+    pending: Iterator[Address] = iter(addresses)
+    ready: "asyncio.Queue[Optional[Tuple[Address, Outcome]]]" = asyncio.Queue(concurrency)
+
+    async def worker() -> None:
+        """Requests addresses left and queues their outcomes, `None` marks its end."""
+        for address in pending:
+            outcome: Outcome
+            try:
+                outcome = await request(address)
+            except Exception as error:
+                outcome = error
+            await ready.put((address, outcome))
+        await ready.put(None)
+
+    workers: List["asyncio.Future[None]"] = [
+        asyncio.ensure_future(worker()) for _ in range(max(concurrency, 1))
+    ]
+    try:
+        running: int = len(workers)
+        while running:
+            item: Optional[Tuple[Address, Outcome]] = await ready.get()
+            if item is None:
+                running -= 1
+            else:
+                yield item
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+async def _run(workers: List[Awaitable[None]]) -> None:
+    """Runs workers concurrently and cancels all of them once any fails.
+
+    Args:
+        workers: workers to run
+    """
+    tasks: List["asyncio.Future[None]"] = [asyncio.ensure_future(worker) for worker in workers]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
@@ -0,0 +1,556 @@
+"""The module provides API for caching HTTP responses on a client side."""
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from email.utils import parsedate_to_datetime
+from types import TracebackType
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+)
+from punish import AbstractStyle, abstractstyle
+from aiorequest.codecs import JsonCodec, StdJsonCodec
+from aiorequest.connections import Headers
+from aiorequest.responses import HTTPStatus, Response, ResponseError, StreamResponse
+from aiorequest.sessions import Session
+from aiorequest.types import AnyDict, OptionalAnyDict, OptionalStr
+from aiorequest.uploads import Uploadable
+from aiorequest.urls import Address
+
+HeaderItems = Tuple[Tuple[str, str], ...]
+Directives = Dict[str, Optional[str]]
+
+CACHEABLE_STATUSES: FrozenSet[int] = frozenset((HTTPStatus.OK, HTTPStatus.NO_CONTENT))
+_HEURISTIC_FRACTION: float = 0.1
+_NOT_UPDATED: FrozenSet[str] = frozenset(
+    ("content-length", "content-encoding", "transfer-encoding")
+)
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """The class represents a stored HTTP response.
+
+    Args:
+        status: HTTP status code of a response
+        headers: HTTP headers of a response
+        content: body of a response
+        vary: request headers selected by ``Vary`` header of a response
+        stored: UNIX time a response was received or last revalidated
+    """
+
+    status: int
+    headers: HeaderItems
+    content: bytes
+    vary: HeaderItems
+    stored: float
+
+    def size(self) -> int:
+        """Returns approximate number of bytes an entry takes."""
+        return len(self.content) + sum(len(name) + len(value) for name, value in self.headers)
+
+    def matches(self, headers: Mapping[str, str]) -> bool:
+        """Returns `True` if request headers select the entry otherwise `False`.
+
+        Args:
+            headers: HTTP headers of a request
+        """
+        return _selected(headers, tuple(name for name, _ in self.vary)) == self.vary
+
+    def is_fresh(self, max_age: Optional[float] = None, now: Optional[float] = None) -> bool:
+        """Returns `True` if the entry may be used without revalidation otherwise `False`.
+
+        Args:
+            max_age: maximum age in seconds a request accepts
+            now: current UNIX time
+        """
+        if "no-cache" in _directives(self._header("cache-control")):
+            return False
+        age: float = self.age(now)
+        return age < self.lifetime() and (max_age is None or age <= max_age)
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Returns number of seconds passed since a response was generated by an origin.
+
+        Args:
+            now: current UNIX time
+        """
+        date: Optional[float] = _timestamp(self._header("date"))
+        apparent: float = max(0.0, self.stored - date) if date is not None else 0.0
+        return max(apparent, _seconds(self._header("age")) or 0.0) + max(
+            0.0, (time.time() if now is None else now) - self.stored
+        )
+
+    def lifetime(self) -> float:
+        """Returns number of seconds a response is fresh since it was generated."""
+        max_age: Optional[float] = _seconds(
+            _directives(self._header("cache-control")).get("max-age")
+        )
+        if max_age is not None:
+            return max_age
+        date: float = _timestamp(self._header("date")) or self.stored
+        if self._header("expires") is not None:
+            expires: Optional[float] = _timestamp(self._header("expires"))
+            return max(0.0, expires - date) if expires is not None else 0.0
+        modified: Optional[float] = _timestamp(self._header("last-modified"))
+        if modified is not None:
+            return max(0.0, (date - modified) * _HEURISTIC_FRACTION)
+        return 0.0
+
+    def validators(self) -> Dict[str, str]:
+        """Returns conditional request headers used to revalidate the entry."""
+        conditions: Dict[str, str] = {}
+        etag: OptionalStr = self._header("etag")
+        if etag is not None:
+            conditions["If-None-Match"] = etag
+        modified: OptionalStr = self._header("last-modified")
+        if modified is not None:
+            conditions["If-Modified-Since"] = modified
+        return conditions
+
+    def refreshed(self, headers: Mapping[str, str], now: Optional[float] = None) -> "CacheEntry":
+        """Returns the entry updated by a ``304 Not Modified`` response.
+
+        Args:
+            headers: HTTP headers of a ``304 Not Modified`` response
+            now: current UNIX time
+        """
+        updates: Dict[str, Tuple[str, str]] = {
+            name.lower(): (name, value)
+            for name, value in headers.items()
+            if name.lower() not in _NOT_UPDATED
+        }
+        merged: HeaderItems = tuple(
+            updates.pop(name.lower(), (name, value)) for name, value in self.headers
+        ) + tuple(updates.values())
+        return replace(self, headers=merged, stored=time.time() if now is None else now)
+
+    def _header(self, name: str) -> OptionalStr:
+        """Returns a value of a stored header if any.
+
+        Args:
+            name: a case-insensitive name of a header
+        """
+        return Headers(self.headers).get(name)
+
+
+class CacheStorage(AbstractStyle):
+    """The class represents an abstraction of storage of cached HTTP responses."""
+
+    @abstractstyle
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """Returns a stored entry if any.
+
+        Args:
+            key: a key of an entry
+        """
+        pass
+
+    @abstractstyle
+    async def put(self, key: str, entry: CacheEntry) -> None:
+        """Stores an entry.
+
+        Args:
+            key: a key of an entry
+            entry: an entry to store
+        """
+        pass
+
+    @abstractstyle
+    async def delete(self, key: str) -> None:
+        """Removes a stored entry if any.
+
+        Args:
+            key: a key of an entry
+        """
+        pass
+
+
+class MemoryCache(CacheStorage):
+    """The class represents in-memory storage of least recently used HTTP responses.
+
+    Args:
+        entries: maximum number of stored entries
+        size: maximum number of bytes of all stored entries
+    """
+
+    def __init__(self, entries: int = 1024, size: int = 64 * 1024 * 1024) -> None:
+        self._max_entries: int = entries
+        self._max_size: int = size
+        self._size: int = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    @property
+    def size(self) -> int:
+        """Returns number of bytes of all stored entries."""
+        return self._size
+
+    def __len__(self) -> int:
+        """Returns number of stored entries."""
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """See base class."""
+        entry: Optional[CacheEntry] = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def put(self, key: str, entry: CacheEntry) -> None:
+        """See base class."""
+        await self.delete(key)
+        if entry.size() > self._max_size:
+            return
+        self._entries[key] = entry
+        self._size += entry.size()
+        while len(self._entries) > self._max_entries or self._size > self._max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size()
+
+    async def delete(self, key: str) -> None:
+        """See base class."""
+        entry: Optional[CacheEntry] = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size()
+
+
+class DiskCache(CacheStorage):
+    """The class represents storage of HTTP responses in files of a directory.
+
+    Every entry is kept in a separate file named after a hash of its key, files are
+    read and written in a default executor of a running loop.
+
+    Args:
+        directory: a directory to store entries in
+    """
+
+    def __init__(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self._directory: str = directory
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """See base class."""
+        return await asyncio.get_event_loop().run_in_executor(None, self._read, self._path(key))
+
+    async def put(self, key: str, entry: CacheEntry) -> None:
+        """See base class."""
+        await asyncio.get_event_loop().run_in_executor(None, self._write, self._path(key), entry)
+
+    async def delete(self, key: str) -> None:
+        """See base class."""
+        await asyncio.get_event_loop().run_in_executor(None, self._remove, self._path(key))
+
+    def _path(self, key: str) -> str:
+        """Returns a path of a file of an entry.
+
+        Args:
+            key: a key of an entry
+        """
+        return os.path.join(self._directory, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def _read(self, path: str) -> Optional[CacheEntry]:
+        """Returns an entry stored in a file or `None` if it is missing or malformed.
+
+        Args:
+            path: a path of a file
+        """
+        try:
+            with open(path, "rb") as stream:
+                meta: AnyDict = json.loads(stream.readline())
+                content: bytes = stream.read()
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(
+            meta["status"],
+            tuple((name, value) for name, value in meta["headers"]),
+            content,
+            tuple((name, value) for name, value in meta["vary"]),
+            meta["stored"],
+        )
+
+    def _write(self, path: str, entry: CacheEntry) -> None:
+        """Replaces a file with an entry at once, a partly written file is never read.
+
+        Every write goes through its own temporary file, so concurrent writes of a key do
+        not interfere and the last one wins.
+
+        Args:
+            path: a path of a file
+            entry: an entry to store
+        """
+        meta: AnyDict = {
+            "status": entry.status,
+            "headers": entry.headers,
+            "vary": entry.vary,
+            "stored": entry.stored,
+        }
+        descriptor, temporary = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as stream:
+                stream.write(json.dumps(meta).encode("utf-8") + b"\n")
+                stream.write(entry.content)
+            os.replace(temporary, path)
+        except BaseException:
+            self._remove(temporary)
+            raise
+
+    def _remove(self, path: str) -> None:
+        """Removes a file of an entry if it exists.
+
+        Args:
+            path: a path of a file
+        """
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class CachedSession(Session):
+    """The class provides HTTP session which caches responses of another session.
+
+    ``GET`` and ``HEAD`` responses are stored in a `storage` according to their
+    ``Cache-Control``, ``Expires`` and ``Last-Modified`` headers and served while they
+    are fresh. Stale responses are revalidated with ``If-None-Match`` and
+    ``If-Modified-Since`` headers, a ``304 Not Modified`` answer refreshes a stored
+    response. A single variant of a url is stored, it is served only to requests with
+    the same values of headers listed in ``Vary`` header of a response. Other methods
+    are passed through and invalidate stored responses of a url. Only ``200`` and ``204``
+    responses are stored since a session raises other statuses as errors.
+
+    Args:
+        session: a session to perform requests with
+        storage: a storage of responses, in-memory LRU storage by default
+        codec: JSON codec of served responses
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        storage: Optional[CacheStorage] = None,
+        codec: JsonCodec = StdJsonCodec(),
+    ) -> None:
+        self._session: Session = session
+        self._storage: CacheStorage = storage or MemoryCache()
+        self._codec: JsonCodec = codec
+
+    async def __aenter__(self) -> Session:
+        """See base class."""
+        await self._session.__aenter__()
+        return self
+
+    async def get(self, url: Address, **kwargs: Any) -> Response:
+        """See base class."""
+        return await self._cached("GET", self._session.get, url, kwargs)
+
+    async def options(self, url: Address, **kwargs: Any) -> Response:
+        """See base class."""
+        return await self._session.options(url, **kwargs)
+
+    async def head(self, url: Address, **kwargs: Any) -> Response:
+        """See base class."""
+        return await self._cached("HEAD", self._session.head, url, kwargs)
+
+    async def post(
+        self,
+        url: Address,
+        plain: OptionalStr = None,
+        as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
+        **kwargs: Any,
+    ) -> Response:
+        """See base class."""
+        return await self._invalidate(
+            url, self._session.post(url, plain, as_dict, upload, **kwargs)
+        )
+
+    async def put(
+        self,
+        url: Address,
+        plain: OptionalStr = None,
+        as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
+        **kwargs: Any,
+    ) -> Response:
+        """See base class."""
+        return await self._invalidate(url, self._session.put(url, plain, as_dict, upload, **kwargs))
+
+    async def patch(
+        self,
+        url: Address,
+        plain: OptionalStr = None,
+        as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
+        **kwargs: Any,
+    ) -> Response:
+        """See base class."""
+        return await self._invalidate(
+            url, self._session.patch(url, plain, as_dict, upload, **kwargs)
+        )
+
+    async def delete(self, url: Address, **kwargs: Any) -> Response:
+        """See base class."""
+        return await self._invalidate(url, self._session.delete(url, **kwargs))
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """See base class."""
+        await self._session.__aexit__(exc_type, exc_value, traceback)
+
+    async def _cached(
+        self,
+        method: str,
+        send: Callable[..., Awaitable[Response]],
+        url: Address,
+        kwargs: AnyDict,
+    ) -> Response:
+        """Returns a fresh stored response or a response of a request revalidating it.
+
+        Args:
+            method: HTTP method name
+            send: a request of a wrapped session
+            url: an address of a request
+            kwargs: arguments of a request
+        """
+        key: str = f"{method} {url.url}"
+        headers: Mapping[str, str] = Headers((kwargs.get("headers") or {}).items())
+        request: Directives = _directives(headers.get("cache-control"))
+        if "no-store" in request:
+            return await send(url, **kwargs)
+        entry: Optional[CacheEntry] = await self._storage.get(key)
+        if entry is not None and not entry.matches(headers):
+            entry = None
+        if entry is not None:
+            if "no-cache" not in request and entry.is_fresh(_seconds(request.get("max-age"))):
+                return self._response(entry)
+            kwargs = dict(kwargs, headers={**(kwargs.get("headers") or {}), **entry.validators()})
+        response: Response
+        try:
+            response = await send(url, **kwargs)
+        except ResponseError as error:
+            if entry is None or error.response is None:
+                raise
+            response = error.response
+            if response.status_code != HTTPStatus.NOT_MODIFIED:
+                raise
+        if entry is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+            entry = entry.refreshed(await response.headers())
+            await self._storage.put(key, entry)
+            return self._response(entry)
+        return await self._store(key, headers, response)
+
+    async def _store(self, key: str, headers: Mapping[str, str], response: Response) -> Response:
+        """Stores a cacheable response and returns a response of stored data.
+
+        Args:
+            key: a key of an entry
+            headers: request headers
+            response: a received response
+        """
+        status: int = response.status_code
+        received: Mapping[str, str] = await response.headers()
+        vary: str = received.get("vary", "")
+        if (
+            status not in CACHEABLE_STATUSES
+            or "no-store" in _directives(received.get("cache-control"))
+            or vary.strip() == "*"
+        ):
+            return response
+        entry: CacheEntry = CacheEntry(
+            status,
+            tuple(received.items()),
+            b"".join([chunk async for chunk in response.iter_bytes()]),
+            _selected(headers, tuple(name.strip() for name in vary.split(",") if name.strip())),
+            time.time(),
+        )
+        if entry.lifetime() > 0 or entry.validators():
+            await self._storage.put(key, entry)
+        return self._response(entry)
+
+    async def _invalidate(self, url: Address, response: Awaitable[Response]) -> Response:
+        """Returns a response of an unsafe request and drops stored responses of its url.
+
+        Args:
+            url: an address of a request
+            response: a pending response
+        """
+        done: Response = await response
+        target: str = url.url
+        for method in ("GET", "HEAD"):
+            await self._storage.delete(f"{method} {target}")
+        return done
+
+    def _response(self, entry: CacheEntry) -> Response:
+        """Returns a response of a stored entry.
+
+        Args:
+            entry: a stored entry
+        """
+        return StreamResponse(
+            entry.status, Headers(entry.headers), entry.content, codec=self._codec
+        )
+
+
+def _directives(value: OptionalStr) -> Directives:
+    """Returns directives of ``Cache-Control`` header.
+
+    Args:
+        value: header value e.g. ``max-age=60, no-cache``
+    """
+    directives: Directives = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _seconds(value: OptionalStr) -> Optional[float]:
+    """Returns number of seconds of a delta header value or directive.
+
+    Args:
+        value: non-negative integer value
+    """
+    if value is None or not value.strip().isdigit():
+        return None
+    return float(value)
+
+
+def _timestamp(value: OptionalStr) -> Optional[float]:
+    """Returns UNIX time of an HTTP date.
+
+    Args:
+        value: HTTP date e.g. ``Wed, 21 Oct 2015 07:28:00 GMT``
+    """
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _selected(headers: Mapping[str, str], names: Tuple[str, ...]) -> HeaderItems:
+    """Returns values of selected request headers.
+
+    Args:
+        headers: case-insensitive HTTP headers of a request
+        names: names of headers to select
+    """
+    return tuple((name.lower(), headers.get(name, "")) for name in names)
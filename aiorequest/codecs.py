@@ -0,0 +1,99 @@
+"""The module provides API for JSON codecs used to encode and decode HTTP data."""
+import json
+from typing import Any, Union, cast
+from punish import AbstractStyle, abstractstyle
+from aiorequest.types import AnyUnionDict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = cast(Any, None)
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = cast(Any, None)
+
+RawJson = Union[bytes, bytearray, memoryview, str]
+
+
+class JsonCodec(AbstractStyle):
+    """The class represents an abstraction of JSON codec."""
+
+    @abstractstyle
+    def encode(self, data: AnyUnionDict) -> bytes:
+        """Returns JSON document as UTF-8 encoded bytes.
+
+        Args:
+            data: JSON serializable data
+        """
+        pass
+
+    @abstractstyle
+    def decode(self, document: RawJson) -> AnyUnionDict:
+        """Returns data of a JSON document.
+
+        Args:
+            document: JSON document
+        """
+        pass
+
+
+class StdJsonCodec(JsonCodec):
+    """The class represents JSON codec of python standard library."""
+
+    def encode(self, data: AnyUnionDict) -> bytes:
+        """See base class."""
+        return json.dumps(data).encode("utf-8")
+
+    def decode(self, document: RawJson) -> AnyUnionDict:
+        """See base class."""
+        if isinstance(document, memoryview):
+            document = bytes(document)
+        return json.loads(document)
+
+
+class OrJsonCodec(JsonCodec):
+    """The class represents JSON codec backed by `orjson` library.
+
+    Data is encoded straight to bytes and decoded from bytes.
+    """
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("'orjson' package is required to use OrJsonCodec")
+
+    def encode(self, data: AnyUnionDict) -> bytes:
+        """See base class."""
+        return orjson.dumps(data)
+
+    def decode(self, document: RawJson) -> AnyUnionDict:
+        """See base class."""
+        return orjson.loads(document)
+
+
+class UJsonCodec(JsonCodec):
+    """The class represents JSON codec backed by `ujson` library."""
+
+    def __init__(self) -> None:
+        if ujson is None:
+            raise ImportError("'ujson' package is required to use UJsonCodec")
+
+    def encode(self, data: AnyUnionDict) -> bytes:
+        """See base class."""
+        return ujson.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    def decode(self, document: RawJson) -> AnyUnionDict:
+        """See base class."""
+        if isinstance(document, memoryview):
+            document = bytes(document)
+        return ujson.loads(document)
+
+
+def fastest_codec() -> JsonCodec:
+    """Returns the fastest JSON codec available in the current environment."""
+    if orjson is not None:
+        return OrJsonCodec()
+    if ujson is not None:
+        return UJsonCodec()
+    return StdJsonCodec()
@@ -0,0 +1,441 @@
+"""The module provides API for HTTP/1.1 connections over asyncio streams."""
+import asyncio
+import socket
+import ssl
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+from aiorequest.resolvers import Resolver, SocketAddress, SystemResolver
+from aiorequest.timeouts import Timeouts
+from aiorequest.traces import DNS_RESOLVED, TLS_DONE, emit
+from aiorequest.uploads import Upload
+
+_CRLF: bytes = b"\r\n"
+_HEAD_END: bytes = b"\r\n\r\n"
+_READ_SIZE: int = 65536
+_ATTEMPT_DELAY: float = 0.25
+
+HeaderItems = List[Tuple[str, str]]
+
+
+class ProtocolError(Exception):
+    """The class represents malformed HTTP/1.1 wire data error."""
+
+    pass
+
+
+class Headers(Mapping[str, str]):
+    """The class represents case-insensitive HTTP headers."""
+
+    def __init__(self, items: Iterable[Tuple[str, str]] = ()) -> None:
+        self._items: Dict[str, Tuple[str, str]] = {}
+        for name, value in items:
+            key: str = name.lower()
+            if key in self._items:
+                value = f"{self._items[key][1]}, {value}"
+            self._items[key] = (name, value)
+
+    def __getitem__(self, name: str) -> str:
+        """Returns a value of a header regardless of a case of its name."""
+        return self._items[name.lower()][1]
+
+    def __contains__(self, name: object) -> bool:
+        """Returns `True` if a header is present regardless of a case of its name."""
+        return isinstance(name, str) and name.lower() in self._items
+
+    def __iter__(self) -> Iterator[str]:
+        """Returns names of headers as they are first received."""
+        return (name for name, _ in self._items.values())
+
+    def __len__(self) -> int:
+        """Returns number of distinct headers."""
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        """Returns headers representation."""
+        return f"{self.__class__.__name__}({dict(self.items())})"
+
+
+class BodyReader:
+    """The class represents incremental reader of an HTTP/1.1 response body.
+
+    It understands fixed ``Content-Length``, ``chunked`` transfer encoding and
+    bodies delimited by connection close.
+    """
+
+    def __init__(
+        self, reader: asyncio.StreamReader, length: Optional[int], chunked: bool = False
+    ) -> None:
+        self._reader: asyncio.StreamReader = reader
+        self._remaining: Optional[int] = length
+        self._chunked: bool = chunked
+        self._chunk_left: int = 0
+        self._done: bool = length == 0
+
+    @property
+    def done(self) -> bool:
+        """Returns `True` if the body is read to its end otherwise `False`."""
+        return self._done
+
+    async def read(self, size: int = _READ_SIZE) -> bytes:
+        """Returns next piece of a body up to given size or empty bytes at the end.
+
+        Args:
+            size: maximum number of bytes to read
+        """
+        if self._done:
+            return b""
+        if self._chunked:
+            return await self._read_chunk(size)
+        if self._remaining is None:
+            data: bytes = await self._reader.read(size)
+            self._done = not data
+            return data
+        data = await self._reader.read(min(size, self._remaining))
+        if not data:
+            raise ProtocolError(f"Connection closed with {self._remaining} body bytes left")
+        self._remaining -= len(data)
+        self._done = self._remaining == 0
+        return data
+
+    async def read_all(self) -> bytes:
+        """Returns the rest of a body."""
+        if not self._chunked and self._remaining:
+            data: bytes = await self._reader.readexactly(self._remaining)
+            self._remaining, self._done = 0, True
+            return data
+        pieces: List[bytes] = []
+        piece: bytes = await self.read()
+        while piece:
+            pieces.append(piece)
+            piece = await self.read()
+        return b"".join(pieces)
+
+    async def _read_chunk(self, size: int) -> bytes:
+        """Returns next piece of a ``chunked`` body up to given size or empty bytes at the end.
+
+        Args:
+            size: maximum number of bytes to read
+        """
+        if not self._chunk_left:
+            line: bytes = await self._reader.readuntil(_CRLF)
+            try:
+                self._chunk_left = int(line.split(b";", 1)[0], 16)
+            except ValueError:
+                raise ProtocolError(f"Invalid chunk size line {line!r}") from None
+            if not self._chunk_left:
+                await self._read_trailers()
+                self._done = True
+                return b""
+        data: bytes = await self._reader.read(min(size, self._chunk_left))
+        if not data:
+            raise ProtocolError("Connection closed in the middle of a chunk")
+        self._chunk_left -= len(data)
+        if not self._chunk_left:
+            await self._reader.readexactly(len(_CRLF))
+        return data
+
+    async def _read_trailers(self) -> None:
+        """Skips trailer fields following the last chunk."""
+        while await self._reader.readuntil(_CRLF) != _CRLF:
+            pass
+
+
+class HttpConnection:
+    """The class represents keep-alive HTTP/1.1 connection to a single origin."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader: asyncio.StreamReader = reader
+        self._writer: asyncio.StreamWriter = writer
+        self._reusable: bool = True
+        self._head: bytes = b""
+
+    @classmethod
+    async def opened(
+        cls,
+        host: str,
+        port: int,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        timeouts: Timeouts = Timeouts(),
+        resolver: Optional[Resolver] = None,
+    ) -> "HttpConnection":
+        """Returns new connection to a given origin.
+
+        Args:
+            host: a domain name or an IP address
+            port: a port number
+            ssl_context: TLS context, plain TCP connection is used if it is not given
+            timeouts: connect and TLS timeouts, connect one includes TLS handshake unless
+                TLS one is given
+            resolver: a resolver of a host, the system one is used if it is not given
+
+        Raises:
+            `asyncio.TimeoutError` if a connection is not established in time
+        """
+        reader, writer = await open_streams(
+            host, port, ssl_context, timeouts.connect, timeouts.tls, resolver
+        )
+        return cls(reader, writer)
+
+    @property
+    def peer(self) -> str:
+        """Returns an IP address the connection is established to."""
+        peername: Optional[Tuple[str, int]] = self._writer.get_extra_info("peername")
+        return str(peername[0]) if peername else ""
+
+    @property
+    def head(self) -> bytes:
+        """Returns raw header lines of a last received response head."""
+        return self._head
+
+    @property
+    def reusable(self) -> bool:
+        """Returns `True` if connection may serve one more request otherwise `False`."""
+        return self._reusable and not self._reader.at_eof() and not self._writer.is_closing()
+
+    async def send(
+        self,
+        method: str,
+        target: str,
+        headers: Mapping[str, str],
+        body: Union[bytes, Upload] = b"",
+    ) -> None:
+        """Writes a request into the connection.
+
+        Streamed body of unknown size is written with ``chunked`` transfer encoding which
+        `headers` are expected to declare.
+
+        Args:
+            method: HTTP method name
+            target: request target (path with a query)
+            headers: request headers
+            body: request body
+        """
+        head: str = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        self._writer.write(f"{method} {target} HTTP/1.1\r\n{head}\r\n".encode("latin-1"))
+        if isinstance(body, Upload):
+            await self._send_upload(body)
+        elif body:
+            self._writer.write(body)
+        await self._writer.drain()
+
+    async def receive(self, method: str) -> Tuple[int, Headers, BodyReader]:
+        """Reads a response head and returns its status, headers and body reader.
+
+        Args:
+            method: HTTP method name of a sent request
+        """
+        status, headers = await self._receive_head()
+        while 100 <= status < 200 and status != 101:
+            status, headers = await self._receive_head()
+        if headers.get("connection", "").lower() == "close":
+            self._reusable = False
+        return status, headers, self._body(method, status, headers)
+
+    def close(self) -> None:
+        """Closes the connection."""
+        self._reusable = False
+        self._writer.close()
+
+    async def _send_upload(self, body: Upload) -> None:
+        """Writes streamed body, ``chunked`` if its size is unknown.
+
+        The connection is closed if writing fails.
+
+        Args:
+            body: request body
+        """
+        try:
+            if body.size() is not None:
+                await body.write(self._writer)
+                return
+            async for chunk in body.chunks():
+                self._writer.write(f"{len(chunk):x}\r\n".encode("ascii"))
+                self._writer.write(chunk)
+                self._writer.write(_CRLF)
+                await self._writer.drain()
+            self._writer.write(b"0" + _HEAD_END)
+        except BaseException:
+            self.close()
+            raise
+
+    async def _receive_head(self) -> Tuple[int, Headers]:
+        """Reads a response head and returns its status and headers."""
+        try:
+            raw: bytes = await self._reader.readuntil(_HEAD_END)
+        except asyncio.LimitOverrunError:
+            raise ProtocolError("Response head is too large") from None
+        status_line, _, self._head = raw[: -len(_HEAD_END)].partition(_CRLF)
+        version, _, rest = status_line.decode("latin-1").partition(" ")
+        if not version.startswith("HTTP/") or not rest[:3].isdigit():
+            raise ProtocolError(f"Invalid status line '{status_line.decode('latin-1')}'")
+        if version == "HTTP/1.0":
+            self._reusable = False
+        headers: Headers = parse_headers(self._head)
+        if version == "HTTP/1.0" and headers.get("connection", "").lower() == "keep-alive":
+            self._reusable = True
+        return int(rest[:3]), headers
+
+    def _body(self, method: str, status: int, headers: Headers) -> BodyReader:
+        """Returns a reader of a response body framed as its head declares.
+
+        Args:
+            method: HTTP method name of a sent request
+            status: response status
+            headers: response headers
+        """
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return BodyReader(self._reader, length=0)
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            return BodyReader(self._reader, length=None, chunked=True)
+        if "content-length" in headers:
+            try:
+                return BodyReader(self._reader, length=int(headers["content-length"]))
+            except ValueError:
+                raise ProtocolError(
+                    f"Invalid content length '{headers['content-length']}'"
+                ) from None
+        self._reusable = False
+        return BodyReader(self._reader, length=None)
+
+
+def parse_headers(raw: Union[bytes, memoryview]) -> Headers:
+    """Returns headers of raw CRLF separated header lines.
+
+    Args:
+        raw: header lines of a response head without a status line
+    """
+    items: HeaderItems = []
+    for line in bytes(raw).decode("latin-1").split("\r\n"):
+        if line:
+            name, _, value = line.partition(":")
+            items.append((name.strip(), value.strip()))
+    return Headers(items)
+
+
+async def open_streams(
+    host: str,
+    port: int,
+    ssl_context: Optional[ssl.SSLContext] = None,
+    connect_timeout: Optional[float] = None,
+    tls_timeout: Optional[float] = None,
+    resolver: Optional[Resolver] = None,
+) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Returns reader and writer of a new connection to a given origin.
+
+    A host is resolved first, then resolved addresses are connected to with happy
+    eyeballs (RFC 8305) and TLS handshake is performed over the first established connection.
+
+    Args:
+        host: a domain name or an IP address
+        port: a port number
+        ssl_context: TLS context, plain TCP connection is used if it is not given
+        connect_timeout: number of seconds to resolve a host and establish a connection,
+            it includes TLS handshake unless `tls_timeout` is given
+        tls_timeout: number of seconds of TLS handshake
+        resolver: a resolver of a host, the system one is used if it is not given
+
+    Raises:
+        `asyncio.TimeoutError` if a connection is not established in time
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+    started: float = loop.time()
+    connection: socket.socket = await asyncio.wait_for(
+        _connect(host, port, resolver or SystemResolver()), connect_timeout
+    )
+    if ssl_context is None:
+        return await asyncio.open_connection(sock=connection)
+    if tls_timeout is None and connect_timeout is not None:
+        tls_timeout = max(0.0, connect_timeout - (loop.time() - started))
+    try:
+        streams: Tuple[asyncio.StreamReader, asyncio.StreamWriter] = await asyncio.wait_for(
+            asyncio.open_connection(sock=connection, ssl=ssl_context, server_hostname=host),
+            tls_timeout,
+        )
+    except BaseException:
+        connection.close()
+        raise
+    emit(TLS_DONE)
+    return streams
+
+
+async def _connect(host: str, port: int, resolver: Resolver) -> socket.socket:
+    """Returns TCP connection to the first reachable address of a host.
+
+    Connection attempts alternate address families and start one after another every
+    ``_ATTEMPT_DELAY`` seconds or as soon as a previous attempt fails, the first
+    established connection wins and other attempts are cancelled.
+
+    Args:
+        host: a domain name or an IP address
+        port: a port number
+        resolver: a resolver of a host
+    """
+    addresses: List[SocketAddress] = _interleaved((await resolver.resolve(host, port)).addresses)
+    emit(DNS_RESOLVED)
+    attempts: List["asyncio.Future[socket.socket]"] = []
+    errors: List[BaseException] = []
+    try:
+        while addresses or attempts:
+            if addresses:
+                attempts.append(asyncio.ensure_future(_attempt(*addresses.pop(0))))
+            done, _ = await asyncio.wait(
+                attempts,
+                timeout=_ATTEMPT_DELAY if addresses else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for attempt in done:
+                attempts.remove(attempt)
+                error: Optional[BaseException] = attempt.exception()
+                if error is None:
+                    return attempt.result()
+                errors.append(error)
+    finally:
+        for attempt in attempts:
+            attempt.cancel()
+            attempt.add_done_callback(_close_late)
+    raise ConnectionError(f"Unable to connect to '{host}:{port}': {errors}")
+
+
+async def _attempt(family: int, address: Tuple[Any, ...]) -> socket.socket:
+    """Returns TCP connection to a given address.
+
+    Args:
+        family: a socket family
+        address: a socket address
+    """
+    connection: socket.socket = socket.socket(family, socket.SOCK_STREAM)
+    connection.setblocking(False)
+    try:
+        await asyncio.get_event_loop().sock_connect(connection, address)
+    except BaseException:
+        connection.close()
+        raise
+    return connection
+
+
+def _close_late(attempt: "asyncio.Future[socket.socket]") -> None:
+    """Closes a connection of an attempt which is established after another one has won.
+
+    Args:
+        attempt: a connection attempt
+    """
+    if not attempt.cancelled() and attempt.exception() is None:
+        attempt.result().close()
+
+
+def _interleaved(addresses: Iterable[SocketAddress]) -> List[SocketAddress]:
+    """Returns addresses ordered to alternate socket families.
+
+    The family of the first address goes first as it is preferred by a resolver.
+
+    Args:
+        addresses: socket family and address pairs
+    """
+    families: Dict[int, List[SocketAddress]] = {}
+    for address in addresses:
+        families.setdefault(address[0], []).append(address)
+    ordered: List[SocketAddress] = []
+    queues: List[List[SocketAddress]] = list(families.values())
+    while queues:
+        ordered.extend(queue.pop(0) for queue in queues)
+        queues = [queue for queue in queues if queue]
+    return ordered
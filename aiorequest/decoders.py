@@ -0,0 +1,237 @@
+"""The module provides API for incremental decoding of HTTP response data."""
+import codecs
+import json
+import re
+from typing import AsyncIterator, List, Optional, Pattern
+from aiorequest.codecs import JsonCodec, StdJsonCodec
+from aiorequest.types import AnyUnionDict
+
+_WHITESPACE: Pattern[str] = re.compile(r"[ \t\n\r]*")
+_KEY: Pattern[str] = re.compile(r'("(?:[^"\\]|\\.)*")[ \t\n\r]*:', re.DOTALL)
+_STRUCTURE: Pattern[str] = re.compile(r'[\[\]{}"]')
+_STRING_END: Pattern[str] = re.compile(r'["\\]')
+_SCALAR_END: Pattern[str] = re.compile(r"[,\]}\s]")
+_ITEM: str = "item"
+
+_VALUE, _VALUE_OR_END, _KEY_NEXT, _KEY_OR_END, _SKIP, _AFTER_VALUE, _DONE = range(7)
+
+
+class JsonItems:
+    """The class represents incremental decoder of JSON array items.
+
+    Items are selected with a dotted `path` where object keys are named as they are
+    and array items are named ``item``, e.g. ``items.item`` selects items of an array
+    stored under ``items`` key of a top level object. Only text of a currently decoded
+    item is kept in memory, complete items are decoded with a given `codec`.
+    """
+
+    def __init__(self, path: str = _ITEM, codec: JsonCodec = StdJsonCodec()) -> None:
+        self._codec: JsonCodec = codec
+        self._target: List[str] = path.split(".") if path else []
+        self._buffer: str = ""
+        self._pos: int = 0
+        self._path: List[str] = []
+        self._containers: List[str] = []
+        self._state: int = _VALUE
+        self._start: Optional[int] = None
+        self._scalar: bool = False
+        self._depth: int = 0
+        self._in_string: bool = False
+
+    def feed(self, text: str) -> List[AnyUnionDict]:
+        """Returns items completed by a given piece of JSON document.
+
+        Args:
+            text: next piece of JSON document
+        """
+        return self._decode(text, final=False)
+
+    def close(self) -> List[AnyUnionDict]:
+        """Returns items left at the end of JSON document.
+
+        Raises:
+            `ValueError` if JSON document is incomplete
+        """
+        items: List[AnyUnionDict] = self._decode("", final=True)
+        if self._state != _DONE:
+            raise ValueError("JSON document is incomplete")
+        return items
+
+    def _decode(self, text: str, final: bool) -> List[AnyUnionDict]:
+        """Returns items completed by a piece of JSON document and drops consumed text.
+
+        Args:
+            text: next piece of JSON document
+            final: whether the document ends with this piece
+        """
+        self._buffer += text
+        items: List[AnyUnionDict] = []
+        while self._step(items, final):
+            pass
+        cut: int = self._pos if self._start is None else self._start
+        self._buffer, self._pos = self._buffer[cut:], self._pos - cut
+        if self._start is not None:
+            self._start -= cut
+        return items
+
+    def _step(self, items: List[AnyUnionDict], final: bool) -> bool:
+        """Advances over the next token and returns `False` if more text is needed.
+
+        Args:
+            items: completed items to append to
+            final: whether no more text follows
+        """
+        if self._state == _SKIP:
+            return self._skip(items, final)
+        if self._state == _AFTER_VALUE and not self._containers:
+            self._state = _DONE
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore
+        if self._pos >= len(self._buffer):
+            return False
+        char: str = self._buffer[self._pos]
+        if self._state == _DONE:
+            raise ValueError(f"Extra data at the end of JSON document: '{char}'")
+        if self._state == _VALUE_OR_END and char == "]":
+            self._path.pop()
+            return self._close_container()
+        if self._state in (_VALUE, _VALUE_OR_END):
+            return self._value(char)
+        if self._state in (_KEY_NEXT, _KEY_OR_END):
+            return self._key(char, final)
+        return self._after_value(char)
+
+    def _value(self, char: str) -> bool:
+        """Enters a container leading to items or starts skipping a value.
+
+        Args:
+            char: the first character of a value
+        """
+        if char in "{[" and self._path != self._target and self._descends():
+            self._containers.append(char)
+            self._pos += 1
+            if char == "{":
+                self._state = _KEY_OR_END
+            else:
+                self._path.append(_ITEM)
+                self._state = _VALUE_OR_END
+            return True
+        self._start = self._pos if self._path == self._target else None
+        self._scalar, self._depth, self._in_string = char not in '{["', 0, False
+        self._state = _SKIP
+        return True
+
+    def _key(self, char: str, final: bool) -> bool:
+        """Reads an object key or the end of an object.
+
+        Args:
+            char: the first character of a key
+            final: whether no more text follows
+        """
+        if char == "}" and self._state == _KEY_OR_END:
+            return self._close_container()
+        match = _KEY.match(self._buffer, self._pos)
+        if match is None:
+            if char != '"' or final:
+                raise ValueError(f"Invalid JSON object key at '{char}'")
+            return False
+        self._path.append(json.loads(match.group(1)))
+        self._pos, self._state = match.end(), _VALUE
+        return True
+
+    def _after_value(self, char: str) -> bool:
+        """Reads a separator or the end of a container following a value.
+
+        Args:
+            char: a character following a value
+        """
+        if char == ",":
+            self._pos += 1
+            if self._containers[-1] == "{":
+                self._path.pop()
+                self._state = _KEY_NEXT
+            else:
+                self._state = _VALUE
+            return True
+        if char != {"{": "}", "[": "]"}[self._containers[-1]]:
+            raise ValueError(f"Unexpected '{char}' in JSON document")
+        self._path.pop()
+        return self._close_container()
+
+    def _close_container(self) -> bool:
+        """Leaves a current container."""
+        self._pos += 1
+        self._containers.pop()
+        self._state = _AFTER_VALUE
+        return True
+
+    def _skip(self, items: List[AnyUnionDict], final: bool) -> bool:
+        """Scans to the end of a value and returns `False` if more text is needed.
+
+        Args:
+            items: completed items to append to
+            final: whether no more text follows
+        """
+        if self._scalar:
+            match = _SCALAR_END.search(self._buffer, self._pos)
+            if match is None and not final:
+                return False
+            self._pos = len(self._buffer) if match is None else match.start()
+            return self._complete(items)
+        while True:
+            match = (_STRING_END if self._in_string else _STRUCTURE).search(self._buffer, self._pos)
+            if match is None:
+                self._pos = len(self._buffer)
+                return False
+            char: str = match.group()
+            if char == "\\":
+                if match.end() >= len(self._buffer):
+                    self._pos = match.start()
+                    return False
+                self._pos = match.end() + 1
+                continue
+            self._pos = match.end()
+            if char == '"':
+                self._in_string = not self._in_string
+            else:
+                self._depth += 1 if char in "{[" else -1
+            if not self._depth and not self._in_string:
+                return self._complete(items)
+
+    def _complete(self, items: List[AnyUnionDict]) -> bool:
+        """Decodes a scanned value if it is a selected item.
+
+        Args:
+            items: completed items to append to
+        """
+        if self._start is not None:
+            items.append(self._codec.decode(self._buffer[self._start : self._pos]))
+            self._start = None
+        self._state = _AFTER_VALUE
+        return True
+
+    def _descends(self) -> bool:
+        """Returns `True` if a current path leads to selected items otherwise `False`."""
+        return self._target[: len(self._path)] == self._path
+
+
+async def json_items(
+    chunks: AsyncIterator[bytes],
+    path: str = _ITEM,
+    encoding: str = "utf-8",
+    codec: JsonCodec = StdJsonCodec(),
+) -> AsyncIterator[AnyUnionDict]:
+    """Returns asynchronous iterator over JSON array items decoded from data pieces.
+
+    Args:
+        chunks: pieces of JSON document
+        path: dotted path to items, see `JsonItems`
+        encoding: text encoding of a document
+        codec: JSON codec used to decode items
+    """
+    decoder: codecs.IncrementalDecoder = codecs.getincrementaldecoder(encoding)("strict")
+    items: JsonItems = JsonItems(path, codec)
+    async for chunk in chunks:
+        for item in items.feed(decoder.decode(chunk)):
+            yield item
+    for item in items.feed(decoder.decode(b"", True)) + items.close():
+        yield item
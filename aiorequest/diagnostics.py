@@ -0,0 +1,417 @@
+"""The module provides API for detection of event loop blocking by sessions and responses."""
+import logging
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field, replace
+from types import FrameType, TracebackType
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    Mapping,
+    Optional,
+    Type,
+    TypeVar,
+)
+from aiorequest.responses import HTTPStatus, JsonType, Response
+from aiorequest.sessions import Session
+from aiorequest.types import OptionalAnyDict, OptionalStr
+from aiorequest.uploads import Uploadable
+from aiorequest.urls import Address
+
+_T = TypeVar("_T")
+_LOGGER: logging.Logger = logging.getLogger("aiorequest")
+
+
+@dataclass(frozen=True)
+class SlowCall:
+    """The class represents a call of a session or a response which blocked the event loop.
+
+    Args:
+        call: a name of a call e.g. ``session.get`` or ``response.as_json``
+        method: HTTP method name of a request
+        address: url of a request
+        url: url of a request as a string
+        stall: the longest number of seconds the call ran without yielding to the event loop
+        blocked: total number of seconds the call ran without yielding to the event loop
+        stack: a stack of a caller, it is empty until the call is reported
+    """
+
+    call: str
+    method: str
+    address: Address
+    url: str
+    stall: float
+    blocked: float
+    stack: traceback.StackSummary = field(default_factory=traceback.StackSummary)
+
+
+@dataclass(frozen=True)
+class CallStats:
+    """The class represents counters of calls of a kind.
+
+    Args:
+        calls: number of finished calls
+        slow: number of calls stalled the event loop over a threshold
+        blocked: total number of seconds calls ran without yielding to the event loop
+        stall: the longest number of seconds a call ran without yielding to the event loop
+    """
+
+    calls: int = 0
+    slow: int = 0
+    blocked: float = 0.0
+    stall: float = 0.0
+
+
+class BlockingDetector:
+    """The class represents a detector of calls blocking the event loop.
+
+    Time a call runs synchronously is measured between its suspensions, a call stalling
+    the event loop longer than `threshold` seconds at once is passed to `report` which
+    logs a warning with a stack of a caller by default.
+
+    Args:
+        threshold: number of seconds a call may run without yielding to the event loop
+        report: a receiver of slow calls
+    """
+
+    def __init__(
+        self, threshold: float = 0.05, report: Optional[Callable[[SlowCall], None]] = None
+    ) -> None:
+        self._threshold: float = threshold
+        self._report: Callable[[SlowCall], None] = report or _log
+        self._counters: Dict[str, CallStats] = {}
+
+    async def counters(self) -> Dict[str, CallStats]:
+        """Returns counters of calls per name of a call."""
+        return dict(self._counters)
+
+    def reset(self) -> None:
+        """Drops counters of calls."""
+        self._counters.clear()
+
+    def record(self, call: SlowCall, caller: Optional[FrameType] = None) -> None:
+        """Accounts a finished call and reports it if it stalled the event loop for too long.
+
+        Args:
+            call: a finished call
+            caller: a frame awaiting the call, a stack of a reported call is taken from it
+        """
+        slow: bool = call.stall > self._threshold
+        stats: CallStats = self._counters.get(call.call, CallStats())
+        self._counters[call.call] = CallStats(
+            stats.calls + 1,
+            stats.slow + slow,
+            stats.blocked + call.blocked,
+            max(stats.stall, call.stall),
+        )
+        if slow:
+            self._report(
+                replace(call, stack=traceback.StackSummary.extract(traceback.walk_stack(caller)))
+            )
+
+
+class _Measured(Awaitable[_T]):
+    """The class represents an awaitable measuring time it runs without suspension."""
+
+    def __init__(self, awaitable: Awaitable[_T]) -> None:
+        self._awaitable: Awaitable[_T] = awaitable
+        self.stall: float = 0.0
+        self.blocked: float = 0.0
+
+    def __await__(self) -> Generator[Any, Any, _T]:
+        """Runs an awaitable step by step measuring every step."""
+        steps: Generator[Any, Any, _T] = self._awaitable.__await__()
+        sent: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            started: float = time.perf_counter()
+            try:
+                yielded: Any = steps.send(sent) if error is None else steps.throw(error)
+            except StopIteration as stop:
+                self._account(started)
+                return stop.value
+            except BaseException:
+                self._account(started)
+                raise
+            self._account(started)
+            try:
+                sent, error = (yield yielded), None
+            except BaseException as thrown:
+                sent, error = None, thrown
+
+    def _account(self, started: float) -> None:
+        """Accounts a step of an awaitable.
+
+        Args:
+            started: a moment a step started at
+        """
+        step: float = time.perf_counter() - started
+        self.blocked += step
+        self.stall = max(self.stall, step)
+
+
+class DiagnosedSession(Session):
+    """The class provides HTTP session detecting calls which block the event loop.
+
+    Calls of another session and of responses it returns are measured by a `detector`.
+
+    Args:
+        session: a session to perform requests with
+        detector: a detector of blocking calls
+    """
+
+    def __init__(self, session: Session, detector: BlockingDetector) -> None:
+        self._session: Session = session
+        self._detector: BlockingDetector = detector
+
+    async def __aenter__(self) -> Session:
+        """See base class."""
+        await self._session.__aenter__()
+        return self
+
+    async def get(self, url: Address, **kwargs: Any) -> Response:
+        """See base class."""
+        return await self._measured("GET", url, self._session.get(url, **kwargs), _caller())
+
+    async def options(self, url: Address, **kwargs: Any) -> Response:
+        """See base class."""
+        return await self._measured("OPTIONS", url, self._session.options(url, **kwargs), _caller())
+
+    async def head(self, url: Address, **kwargs: Any) -> Response:
+        """See base class."""
+        return await self._measured("HEAD", url, self._session.head(url, **kwargs), _caller())
+
+    async def post(
+        self,
+        url: Address,
+        plain: OptionalStr = None,
+        as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
+        **kwargs: Any,
+    ) -> Response:
+        """See base class."""
+        return await self._measured(
+            "POST", url, self._session.post(url, plain, as_dict, upload, **kwargs), _caller()
+        )
+
+    async def put(
+        self,
+        url: Address,
+        plain: OptionalStr = None,
+        as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
+        **kwargs: Any,
+    ) -> Response:
+        """See base class."""
+        return await self._measured(
+            "PUT", url, self._session.put(url, plain, as_dict, upload, **kwargs), _caller()
+        )
+
+    async def patch(
+        self,
+        url: Address,
+        plain: OptionalStr = None,
+        as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
+        **kwargs: Any,
+    ) -> Response:
+        """See base class."""
+        return await self._measured(
+            "PATCH", url, self._session.patch(url, plain, as_dict, upload, **kwargs), _caller()
+        )
+
+    async def delete(self, url: Address, **kwargs: Any) -> Response:
+        """See base class."""
+        return await self._measured("DELETE", url, self._session.delete(url, **kwargs), _caller())
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """See base class."""
+        await self._session.__aexit__(exc_type, exc_value, traceback)
+
+    async def _measured(
+        self,
+        method: str,
+        address: Address,
+        request: Awaitable[Response],
+        caller: Optional[FrameType],
+    ) -> Response:
+        """Returns a response of a request measured by a detector along with its calls.
+
+        Args:
+            method: HTTP method name of a request
+            address: url of a request
+            request: a request to measure
+            caller: a frame awaiting the request
+        """
+        url: str = address.url
+        measured: _Measured[Response] = _Measured(request)
+        try:
+            response: Response = await measured
+        finally:
+            self._detector.record(
+                SlowCall(
+                    f"session.{method.lower()}",
+                    method,
+                    address,
+                    url,
+                    measured.stall,
+                    measured.blocked,
+                ),
+                caller,
+            )
+        return _DiagnosedResponse(response, self._detector, method, address, url)
+
+
+class _DiagnosedResponse(Response):
+    """The class represents a response which calls are measured by a detector."""
+
+    def __init__(
+        self,
+        response: Response,
+        detector: BlockingDetector,
+        method: str,
+        address: Address,
+        url: str,
+    ) -> None:
+        self._response: Response = response
+        self._detector: BlockingDetector = detector
+        self._method: str = method
+        self._address: Address = address
+        self._url: str = url
+
+    @property
+    def status_code(self) -> int:
+        """See base class."""
+        return self._response.status_code
+
+    async def is_ok(self) -> bool:
+        """See base class."""
+        return await self._measured("is_ok", self._response.is_ok(), _caller())
+
+    async def status(self) -> HTTPStatus:
+        """See base class."""
+        return await self._measured("status", self._response.status(), _caller())
+
+    async def headers(self) -> Mapping[str, str]:
+        """See base class."""
+        return await self._measured("headers", self._response.headers(), _caller())
+
+    async def as_json(self) -> JsonType:
+        """See base class."""
+        return await self._measured("as_json", self._response.as_json(), _caller())
+
+    async def as_str(self) -> str:
+        """See base class."""
+        return await self._measured("as_str", self._response.as_str(), _caller())
+
+    async def iter_bytes(self, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        """See base class."""
+        async for piece in self._iterated(
+            "iter_bytes", self._response.iter_bytes(chunk_size), _caller()
+        ):
+            yield piece
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """See base class."""
+        async for piece in self._iterated("iter_chunks", self._response.iter_chunks(), _caller()):
+            yield piece
+
+    async def iter_lines(self) -> AsyncIterator[str]:
+        """See base class."""
+        async for line in self._iterated("iter_lines", self._response.iter_lines(), _caller()):
+            yield line
+
+    async def iter_json_items(self, path: str = "item") -> AsyncIterator[JsonType]:
+        """See base class."""
+        async for item in self._iterated(
+            "iter_json_items", self._response.iter_json_items(path), _caller()
+        ):
+            yield item
+
+    async def _measured(
+        self, call: str, awaitable: Awaitable[_T], caller: Optional[FrameType]
+    ) -> _T:
+        """Returns a result of an awaitable and records time it blocked the event loop.
+
+        Args:
+            call: a name of a call
+            awaitable: an awaitable to measure
+            caller: a frame awaiting the call
+        """
+        measured: _Measured[_T] = _Measured(awaitable)
+        try:
+            return await measured
+        finally:
+            self._record(call, measured.stall, measured.blocked, caller)
+
+    async def _iterated(
+        self, call: str, iterator: AsyncIterator[_T], caller: Optional[FrameType]
+    ) -> AsyncIterator[_T]:
+        """Yields items of an iterator and records time it blocked the event loop in total.
+
+        Args:
+            call: a name of a call
+            iterator: an iterator to measure
+            caller: a frame iterating the call
+        """
+        stall: float = 0.0
+        blocked: float = 0.0
+        try:
+            while True:
+                measured: _Measured[_T] = _Measured(iterator.__anext__())
+                try:
+                    item: _T = await measured
+                except StopAsyncIteration:
+                    break
+                finally:
+                    stall = max(stall, measured.stall)
+                    blocked += measured.blocked
+                yield item
+        finally:
+            self._record(call, stall, blocked, caller)
+
+    def _record(self, call: str, stall: float, blocked: float, caller: Optional[FrameType]) -> None:
+        """Passes a finished call to a detector.
+
+        Args:
+            call: a name of a call
+            stall: the longest number of seconds the call ran without yielding
+            blocked: total number of seconds the call ran without yielding
+            caller: a frame awaiting the call
+        """
+        self._detector.record(
+            SlowCall(f"response.{call}", self._method, self._address, self._url, stall, blocked),
+            caller,
+        )
+
+
+def _caller() -> Optional[FrameType]:
+    """Returns a frame awaiting a coroutine this function is called from."""
+    return sys._getframe(2)
+
+
+def _log(call: SlowCall) -> None:
+    """Logs a warning about a slow call.
+
+    Args:
+        call: a slow call
+    """
+    _LOGGER.warning(
+        "%s of %s %s blocked the event loop for %.3f seconds (%.3f seconds in total)\n%s",
+        call.call,
+        call.method,
+        call.url,
+        call.stall,
+        call.blocked,
+        "".join(call.stack.format()),
+    )
@@ -0,0 +1,313 @@
+"""The module provides API for compression of HTTP data."""
+import functools
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, cast
+from punish import AbstractStyle, abstractstyle
+from aiorequest.connections import ProtocolError
+from aiorequest.responses import Body
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = cast(Any, None)
+if brotli is not None and not hasattr(brotli.Decompressor, "can_accept_more_data"):
+    brotli = cast(Any, None)  # pragma: no cover
+
+try:
+    from compression import zstd
+except ImportError:  # pragma: no cover
+    try:
+        from backports import zstd
+    except ImportError:
+        zstd = cast(Any, None)
+
+_CHUNK_SIZE: int = 65536
+_PACKAGES: Dict[str, str] = {"br": "brotli>=1.2", "zstd": "backports.zstd"}
+
+
+class Decompressor(AbstractStyle):
+    """The class represents an abstraction of incremental decompression of data.
+
+    Output of a decompressor is bounded, compressed data is given to it only once all
+    data given before is decompressed and returned.
+    """
+
+    @property
+    @abstractstyle
+    def needs_input(self) -> bool:
+        """Returns whether all given compressed data is decompressed and returned."""
+        pass
+
+    @abstractstyle
+    def decompress(self, data: bytes, size: int) -> bytes:
+        """Returns up to `size` bytes of decompressed data.
+
+        Args:
+            data: a next piece of compressed data or empty bytes to continue a given one
+            size: maximum number of bytes to return
+        """
+        pass
+
+    @abstractstyle
+    def flush(self) -> bytes:
+        """Returns the rest of decompressed data once compressed data is over."""
+        pass
+
+
+class ZlibDecompressor(Decompressor):
+    """The class represents incremental ``gzip`` or ``deflate`` decompression.
+
+    ``deflate`` data is expected in zlib format, raw deflate data some servers send is
+    recognized as well.
+
+    Args:
+        encoding: ``gzip`` or ``deflate``
+    """
+
+    def __init__(self, encoding: str = "gzip") -> None:
+        self._gzip: bool = encoding == "gzip"
+        self._inflater: Any = zlib.decompressobj(zlib.MAX_WBITS | 16 if self._gzip else 0)
+        self._started: bool = False
+        self._drained: bool = True
+
+    @property
+    def needs_input(self) -> bool:
+        """See base class."""
+        return self._drained and not self._inflater.unconsumed_tail
+
+    def decompress(self, data: bytes, size: int) -> bytes:
+        """See base class."""
+        pending: bytes = self._inflater.unconsumed_tail + data
+        try:
+            output: bytes = self._inflater.decompress(pending, size)
+        except zlib.error:
+            if self._gzip or self._started:
+                raise
+            self._inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+            output = self._inflater.decompress(pending, size)
+        self._started = self._started or bool(pending)
+        self._drained = len(output) < size
+        return output
+
+    def flush(self) -> bytes:
+        """See base class."""
+        return self._inflater.flush()
+
+
+class BrotliDecompressor(Decompressor):
+    """The class represents incremental ``br`` decompression backed by `brotli` library.
+
+    Bounded output requires `brotli` or `brotlicffi` 1.2 or newer.
+    """
+
+    def __init__(self) -> None:
+        if brotli is None:
+            raise ImportError("'brotli>=1.2' package is required to use BrotliDecompressor")
+        self._decompressor: Any = brotli.Decompressor()
+
+    @property
+    def needs_input(self) -> bool:
+        """See base class."""
+        return self._decompressor.can_accept_more_data()
+
+    def decompress(self, data: bytes, size: int) -> bytes:
+        """See base class."""
+        return self._decompressor.process(data, output_buffer_limit=size)
+
+    def flush(self) -> bytes:
+        """See base class."""
+        return b""
+
+
+class ZstdDecompressor(Decompressor):
+    """The class represents incremental ``zstd`` decompression.
+
+    It is backed by standard `compression.zstd` module or its `backports.zstd` package.
+    """
+
+    def __init__(self) -> None:
+        if zstd is None:
+            raise ImportError("'backports.zstd' package is required to use ZstdDecompressor")
+        self._decompressor: Any = zstd.ZstdDecompressor()
+
+    @property
+    def needs_input(self) -> bool:
+        """See base class."""
+        return self._decompressor.needs_input or self._decompressor.eof
+
+    def decompress(self, data: bytes, size: int) -> bytes:
+        """See base class."""
+        return self._decompressor.decompress(data, size)
+
+    def flush(self) -> bytes:
+        """See base class."""
+        return b""
+
+
+_DECOMPRESSORS: Dict[str, Callable[[], Decompressor]] = {
+    "gzip": ZlibDecompressor,
+    "x-gzip": ZlibDecompressor,
+    "deflate": lambda: ZlibDecompressor("deflate"),
+}
+if brotli is not None:
+    _DECOMPRESSORS["br"] = BrotliDecompressor
+if zstd is not None:
+    _DECOMPRESSORS["zstd"] = ZstdDecompressor
+
+ACCEPT_ENCODING: str = ", ".join(
+    encoding for encoding in ("zstd", "br", "gzip", "deflate") if encoding in _DECOMPRESSORS
+)
+
+
+class DecompressedBody(Body):
+    """The class represents response data decompressed while it is being read.
+
+    Content codings are undone in reverse order of their application. Compressed data is
+    received only when decompressed one is over, so a piece held in memory is bounded by
+    a size of a read however much data expands.
+
+    Args:
+        body: compressed data
+        encodings: content codings applied to data in order
+    """
+
+    def __init__(self, body: Body, encodings: List[str]) -> None:
+        self._body: Body = body
+        self._decompressors: List[Decompressor] = [
+            _DECOMPRESSORS[encoding]() for encoding in reversed(encodings)
+        ]
+        self._ended: List[bool] = [False] * len(self._decompressors)
+        self._buffer: bytes = b""
+        self._done: bool = False
+
+    async def read(self, size: int = _CHUNK_SIZE) -> bytes:
+        """See base class."""
+        while not self._buffer and not self._done:
+            try:
+                self._buffer = await self._pulled(len(self._decompressors) - 1, max(size, 1))
+            except ProtocolError:
+                await self._body.close()
+                raise
+            self._done = not self._buffer
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    async def close(self) -> None:
+        """See base class."""
+        await self._body.close()
+
+    async def _pulled(self, index: int, size: int) -> bytes:
+        """Returns next piece of data undone by a decompressor or empty bytes at the end.
+
+        Args:
+            index: a position of a decompressor, the first one reads compressed data
+            size: maximum number of bytes to decompress
+        """
+        decompressor: Decompressor = self._decompressors[index]
+        while not self._ended[index]:
+            data: bytes = b""
+            if decompressor.needs_input:
+                data = await (self._pulled(index - 1, _CHUNK_SIZE) if index else self._body.read())
+                if not data:
+                    self._ended[index] = True
+                    return _decompressed(decompressor.flush)
+            output: bytes = _decompressed(functools.partial(decompressor.decompress, data, size))
+            if output:
+                return output
+        return b""
+
+
+@dataclass(frozen=True)
+class Compression:
+    """The class represents compression of request data.
+
+    Data shorter than `min_size` bytes is sent as it is.
+
+    Args:
+        encoding: ``gzip``, ``deflate``, ``br`` or ``zstd``
+        min_size: minimum number of bytes of compressed data
+        level: compression level, a library default is used if it is not set
+    """
+
+    encoding: str = "gzip"
+    min_size: int = 1024
+    level: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        """Checks that an encoding is supported and its package is installed."""
+        if self.encoding not in ("gzip", "deflate", "br", "zstd"):
+            raise ValueError(f"Unsupported compression encoding '{self.encoding}'")
+        if self.encoding in _PACKAGES and self.encoding not in _DECOMPRESSORS:
+            raise ImportError(
+                f"'{_PACKAGES[self.encoding]}' package is required to use "
+                f"'{self.encoding}' compression"
+            )
+
+    def compressed(self, data: bytes, headers: Dict[str, str]) -> Tuple[bytes, Dict[str, str]]:
+        """Returns data and headers of a request compressed if data is large enough.
+
+        Args:
+            data: request data
+            headers: request headers
+        """
+        if len(data) < self.min_size or any(name.lower() == "content-encoding" for name in headers):
+            return data, headers
+        return self._compress(data), {**headers, "Content-Encoding": self.encoding}
+
+    def _compress(self, data: bytes) -> bytes:
+        """Returns data compressed with an encoding at a level if it is given.
+
+        Args:
+            data: request data
+        """
+        level: int = -1 if self.level is None else self.level
+        if self.encoding == "gzip":
+            compressor: Any = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+            return compressor.compress(data) + compressor.flush()
+        if self.encoding == "deflate":
+            return zlib.compress(data, level)
+        if self.encoding == "br":
+            return (
+                brotli.compress(data)
+                if self.level is None
+                else brotli.compress(data, quality=level)
+            )
+        return zstd.compress(data) if self.level is None else zstd.compress(data, level)
+
+
+def decompressed(body: Body, headers: Mapping[str, str]) -> Body:
+    """Returns response data decompressed according to its ``Content-Encoding`` header.
+
+    Data is returned as it is if it is not compressed or a coding is not supported.
+
+    Args:
+        body: response data
+        headers: response headers
+    """
+    encodings: List[str] = [
+        encoding.strip().lower()
+        for encoding in headers.get("content-encoding", "").split(",")
+        if encoding.strip() and encoding.strip().lower() != "identity"
+    ]
+    if not encodings or any(encoding not in _DECOMPRESSORS for encoding in encodings):
+        return body
+    return DecompressedBody(body, encodings)
+
+
+def _decompressed(step: Callable[[], bytes]) -> bytes:
+    """Returns output of a decompression step.
+
+    Args:
+        step: a call of a decompressor
+
+    Raises:
+        `ProtocolError` if data is not decompressed
+    """
+    try:
+        return step()
+    except Exception as error:
+        raise ProtocolError(f"Unable to decompress response data: {error}") from error
@@ -0,0 +1,80 @@
+"""The module provides API for coalescing identical HTTP requests in flight."""
+import asyncio
+from typing import Awaitable, Callable, Collection, Dict, FrozenSet, Hashable, Optional, Tuple
+from aiorequest.connections import Headers
+from aiorequest.responses import Response
+from aiorequest.types import AnyDict
+
+SAFE_METHODS: FrozenSet[str] = frozenset(("GET", "HEAD", "OPTIONS"))
+MATCHED_HEADERS: Tuple[str, ...] = (
+    "accept",
+    "accept-encoding",
+    "accept-language",
+    "authorization",
+    "cookie",
+)
+
+
+class SingleFlight:
+    """The class represents coalescing of identical concurrent HTTP requests.
+
+    Requests are identical if they have the same method, url and values of selected
+    `headers` while no other request options are given. An identical request started
+    while another one is in flight does not reach the network and receives the same
+    response or failure, so responses must be treated as immutable. A caller cancelled
+    while waiting does not cancel a shared request.
+
+    Args:
+        headers: names of request headers which values distinguish requests
+        methods: HTTP methods allowed to be coalesced
+    """
+
+    def __init__(
+        self,
+        headers: Collection[str] = MATCHED_HEADERS,
+        methods: Collection[str] = SAFE_METHODS,
+    ) -> None:
+        self._headers: Tuple[str, ...] = tuple(sorted(name.lower() for name in headers))
+        self._methods: FrozenSet[str] = frozenset(method.upper() for method in methods)
+        self._flights: Dict[Hashable, "asyncio.Future[Response]"] = {}
+
+    def __len__(self) -> int:
+        """Returns number of requests in flight."""
+        return len(self._flights)
+
+    async def call(
+        self,
+        method: str,
+        url: str,
+        options: AnyDict,
+        request: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        """Performs a request or joins an identical request in flight.
+
+        Args:
+            method: HTTP method name of a request
+            url: url of a request
+            options: keyword arguments of a request
+            request: a request to perform
+        """
+        key: Optional[Hashable] = self._key(method, url, options)
+        if key is None:
+            return await request()
+        if key not in self._flights:
+            flight: "asyncio.Future[Response]" = asyncio.ensure_future(request())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        return await asyncio.shield(self._flights[key])
+
+    def _key(self, method: str, url: str, options: AnyDict) -> Optional[Hashable]:
+        """Returns a key identical requests share or `None` if a request is not coalesced.
+
+        Args:
+            method: HTTP method name
+            url: a url of a request
+            options: arguments of a request
+        """
+        if method.upper() not in self._methods or set(options) - {"headers"}:
+            return None
+        headers: Headers = Headers((options.get("headers") or {}).items())
+        return method.upper(), url, tuple(headers.get(name) for name in self._headers)
@@ -0,0 +1,426 @@
+"""The module provides API for multiplexed HTTP/2 connections over asyncio streams."""
+import asyncio
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple, Union, cast
+from aiorequest.connections import Headers, ProtocolError
+from aiorequest.responses import Body
+from aiorequest.uploads import Upload
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.errors
+    import h2.events
+    import h2.exceptions
+except ImportError:  # pragma: no cover
+    h2 = cast(Any, None)
+
+_READ_SIZE: int = 65536
+_CONNECTION_HEADERS: FrozenSet[str] = frozenset(
+    ("connection", "host", "keep-alive", "proxy-connection", "te", "transfer-encoding", "upgrade")
+)
+
+_Chunk = Union[Tuple[bytes, int], BaseException, None]
+
+
+class RefusedStream(ConnectionError):
+    """The class represents a stream a connection cannot start, none of its frames are sent."""
+
+    pass
+
+
+class Http2Stream(Body):
+    """The class represents a single request and response exchange of HTTP/2 connection.
+
+    Response data is acknowledged to a server only once it is read, so a slow reader
+    holds back a server with HTTP/2 flow control. Every piece of data is awaited for at
+    most `idle` seconds if it is given.
+    """
+
+    def __init__(
+        self, connection: "Http2Connection", stream_id: int, idle: Optional[float] = None
+    ) -> None:
+        self._connection: Http2Connection = connection
+        self._id: int = stream_id
+        self._idle: Optional[float] = idle
+        self._head: "asyncio.Future[Tuple[int, Headers]]" = asyncio.get_event_loop().create_future()
+        self._chunks: "asyncio.Queue[_Chunk]" = asyncio.Queue()
+        self._buffer: bytes = b""
+        self._done: bool = False
+
+    @property
+    def stream_id(self) -> int:
+        """Returns an identifier of the stream within its connection."""
+        return self._id
+
+    @property
+    def done(self) -> bool:
+        """Returns `True` if the body is read to its end otherwise `False`."""
+        return self._done and not self._buffer
+
+    async def receive(self) -> Tuple[int, Headers]:
+        """Returns status and headers of a response."""
+        return await asyncio.shield(self._head)
+
+    async def read(self, size: int = _READ_SIZE) -> bytes:
+        """See base class."""
+        if not self._buffer and not self._done:
+            chunk: _Chunk = await asyncio.wait_for(self._chunks.get(), self._idle)
+            if isinstance(chunk, BaseException):
+                self._done = True
+                raise chunk
+            if chunk is None:
+                self._done = True
+            else:
+                self._buffer = chunk[0]
+                self._connection.acknowledge(self._id, chunk[1])
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    async def close(self) -> None:
+        """See base class."""
+        if not self._done:
+            self._done, self._buffer = True, b""
+            self._connection.cancel(self._id)
+        while not self._chunks.empty():
+            chunk: _Chunk = self._chunks.get_nowait()
+            if isinstance(chunk, tuple):
+                self._connection.acknowledge(self._id, chunk[1])
+
+    def headers_received(self, headers: List[Tuple[str, str]]) -> None:
+        """Completes a response head.
+
+        Args:
+            headers: response headers including ``:status`` pseudo header
+        """
+        if not self._head.done():
+            status: str = dict(headers).get(":status", "0")
+            self._head.set_result(
+                (int(status), Headers((name, value) for name, value in headers if name[0] != ":"))
+            )
+
+    def data_received(self, data: bytes, length: int) -> None:
+        """Adds a piece of response data.
+
+        Args:
+            data: a piece of data
+            length: flow controlled length of the piece
+        """
+        self._chunks.put_nowait((data, length))
+
+    def ended(self) -> None:
+        """Marks the end of response data."""
+        self._abort_head(ProtocolError(f"HTTP/2 stream {self._id} ended without response head"))
+        self._chunks.put_nowait(None)
+
+    def failed(self, error: BaseException) -> None:
+        """Aborts a response with an error.
+
+        Args:
+            error: a reason of an abort
+        """
+        self._abort_head(error)
+        self._chunks.put_nowait(error)
+
+    def _abort_head(self, error: BaseException) -> None:
+        """Fails a response head unless it is received already.
+
+        Args:
+            error: a reason of a failure
+        """
+        if not self._head.done():
+            self._head.set_exception(error)
+            self._head.exception()
+
+
+class Http2Connection:
+    """The class represents HTTP/2 connection multiplexing concurrent requests to one origin.
+
+    Frames are received by a background task and dispatched to streams. New streams wait
+    while a server limit of concurrent streams is reached, request data is sent as fast
+    as flow control windows allow.
+
+    Args:
+        reader: a reader of an established connection
+        writer: a writer of an established connection
+        authority: host and port of an origin
+        scheme: ``http`` or ``https``
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        authority: str,
+        scheme: str,
+    ) -> None:
+        if h2 is None:
+            raise ImportError("'h2' package is required to use HTTP/2 connections")
+        self._reader: asyncio.StreamReader = reader
+        self._writer: asyncio.StreamWriter = writer
+        self._authority: str = authority
+        self._scheme: str = scheme
+        self._h2: Any = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=True, header_encoding="utf-8")
+        )
+        self._streams: Dict[int, Http2Stream] = {}
+        self._changed: Optional[asyncio.Event] = None
+        self._drain: Optional[asyncio.Lock] = None
+        self._usable: bool = True
+        self._h2.initiate_connection()
+        self._flush()
+        self._receiver: "asyncio.Future[None]" = asyncio.ensure_future(self._receive())
+
+    @property
+    def usable(self) -> bool:
+        """Returns `True` if the connection may start one more stream otherwise `False`."""
+        return self._usable and not self._writer.is_closing()
+
+    @property
+    def streams(self) -> int:
+        """Returns number of streams in progress."""
+        return len(self._streams)
+
+    async def open_stream(
+        self,
+        method: str,
+        target: str,
+        headers: Mapping[str, str],
+        body: Union[bytes, Upload] = b"",
+        idle: Optional[float] = None,
+    ) -> Http2Stream:
+        """Sends a request on a new stream and returns the stream.
+
+        Args:
+            method: HTTP method name
+            target: request target (path with a query)
+            headers: request headers, connection specific ones are skipped
+            body: request body
+            idle: number of seconds every piece of response data is awaited for
+
+        Raises:
+            `RefusedStream` if the connection cannot start new streams
+        """
+        stream: Http2Stream = await self._start(idle)
+        try:
+            await self._send_request(stream.stream_id, method, target, headers, body)
+        except BaseException:
+            await stream.close()
+            raise
+        return stream
+
+    async def finished(self) -> None:
+        """Waits until no stream is in progress."""
+        while self._streams:
+            await self._wait()
+
+    def acknowledge(self, stream_id: int, size: int) -> None:
+        """Lets a server send more data once a piece of data is consumed.
+
+        Data still received after the connection is closed is not acknowledged.
+
+        Args:
+            stream_id: an identifier of a stream
+            size: flow controlled length of consumed data
+        """
+        if self._writer.is_closing():
+            return
+        self._h2.acknowledge_received_data(size, stream_id)
+        self._flush()
+
+    def cancel(self, stream_id: int) -> None:
+        """Resets a stream which response is no longer needed.
+
+        Args:
+            stream_id: an identifier of a stream
+        """
+        self._streams.pop(stream_id, None)
+        try:
+            self._h2.reset_stream(stream_id, h2.errors.ErrorCodes.CANCEL)
+        except h2.exceptions.ProtocolError:
+            pass
+        self._flush()
+        self._notify()
+
+    async def close(self) -> None:
+        """Closes the connection."""
+        self._usable = False
+        if not self._writer.is_closing():
+            self._h2.close_connection()
+            self._flush()
+            self._writer.close()
+        self._receiver.cancel()
+        try:
+            await self._receiver
+        except asyncio.CancelledError:
+            pass
+
+    async def _start(self, idle: Optional[float]) -> Http2Stream:
+        """Returns a new stream once a server limit of concurrent streams allows it.
+
+        Args:
+            idle: number of seconds every piece of response data is awaited for
+
+        Raises:
+            `RefusedStream` if the connection cannot start new streams
+        """
+        while self._usable and self._h2.open_outbound_streams >= (
+            self._h2.remote_settings.max_concurrent_streams
+        ):
+            await self._wait()
+        if not self.usable:
+            raise RefusedStream(f"HTTP/2 connection to '{self._authority}' is closed")
+        try:
+            stream_id: int = self._h2.get_next_available_stream_id()
+        except h2.exceptions.NoAvailableStreamIDError:
+            self._usable = False
+            raise RefusedStream(f"HTTP/2 connection to '{self._authority}' is exhausted")
+        stream: Http2Stream = Http2Stream(self, stream_id, idle)
+        self._streams[stream_id] = stream
+        return stream
+
+    async def _send_request(
+        self,
+        stream_id: int,
+        method: str,
+        target: str,
+        headers: Mapping[str, str],
+        body: Union[bytes, Upload],
+    ) -> None:
+        """Sends a request head and body on a stream.
+
+        Args:
+            stream_id: an identifier of a stream
+            method: HTTP method name
+            target: request target (path with a query)
+            headers: request headers, connection specific ones are skipped
+            body: request body
+        """
+        self._h2.send_headers(
+            stream_id,
+            [
+                (":method", method),
+                (":authority", self._authority),
+                (":scheme", self._scheme),
+                (":path", target),
+            ]
+            + [
+                (name.lower(), value)
+                for name, value in headers.items()
+                if name.lower() not in _CONNECTION_HEADERS
+            ],
+            end_stream=not body,
+        )
+        self._flush()
+        if isinstance(body, Upload):
+            async for chunk in body.chunks():
+                await self._send_body(stream_id, memoryview(chunk), end=False)
+            self._h2.end_stream(stream_id)
+            self._flush()
+        elif body:
+            await self._send_body(stream_id, memoryview(body))
+        await self._drained()
+
+    async def _send_body(self, stream_id: int, body: memoryview, end: bool = True) -> None:
+        """Sends request data as fast as flow control windows allow.
+
+        Args:
+            stream_id: an identifier of a stream
+            body: request data
+            end: whether the data ends a stream
+        """
+        offset: int = 0
+        while offset < len(body):
+            window: int = min(
+                self._h2.local_flow_control_window(stream_id), self._h2.max_outbound_frame_size
+            )
+            if window <= 0:
+                if not self._usable:
+                    raise ConnectionError(f"HTTP/2 connection to '{self._authority}' is closed")
+                await self._wait()
+                continue
+            chunk: memoryview = body[offset : offset + window]
+            offset += len(chunk)
+            self._h2.send_data(stream_id, bytes(chunk), end_stream=end and offset >= len(body))
+            self._flush()
+            await self._drained()
+
+    async def _receive(self) -> None:
+        """Receives frames until the connection is closed and then fails open streams."""
+        error: BaseException = ConnectionError(
+            f"HTTP/2 connection to '{self._authority}' is closed"
+        )
+        try:
+            while True:
+                data: bytes = await self._reader.read(_READ_SIZE)
+                if not data:
+                    break
+                for event in self._h2.receive_data(data):
+                    self._dispatch(event)
+                self._flush()
+                self._notify()
+        except h2.exceptions.ProtocolError as exc:
+            error = ProtocolError(f"HTTP/2 protocol violation: {exc}")
+        except (ConnectionError, OSError) as exc:
+            error = exc
+        finally:
+            self._usable = False
+            for stream in self._streams.values():
+                stream.failed(error)
+            self._streams.clear()
+            self._notify()
+            self._writer.close()
+
+    def _dispatch(self, event: Any) -> None:
+        """Passes a received event to its stream.
+
+        Args:
+            event: an event of `h2` connection
+        """
+        stream: Optional[Http2Stream] = self._streams.get(getattr(event, "stream_id", 0))
+        if isinstance(event, h2.events.ConnectionTerminated):
+            self._usable = False
+            last: int = event.last_stream_id or 0
+            for stream_id in [key for key in self._streams if key > last]:
+                self._streams.pop(stream_id).failed(
+                    ConnectionError(f"HTTP/2 stream {stream_id} is refused by a server")
+                )
+        elif stream is None:
+            if isinstance(event, h2.events.DataReceived):
+                self.acknowledge(event.stream_id, event.flow_controlled_length)
+        elif isinstance(event, h2.events.ResponseReceived):
+            stream.headers_received(cast(List[Tuple[str, str]], event.headers))
+        elif isinstance(event, h2.events.DataReceived):
+            stream.data_received(event.data, event.flow_controlled_length)
+        elif isinstance(event, h2.events.StreamEnded):
+            self._streams.pop(event.stream_id)
+            stream.ended()
+        elif isinstance(event, h2.events.StreamReset):
+            self._streams.pop(event.stream_id)
+            stream.failed(
+                ProtocolError(f"HTTP/2 stream {event.stream_id} is reset: {event.error_code!r}")
+            )
+
+    def _flush(self) -> None:
+        """Writes pending frames into the connection."""
+        data: bytes = self._h2.data_to_send()
+        if data and not self._writer.is_closing():
+            self._writer.write(data)
+
+    async def _drained(self) -> None:
+        """Waits until written frames are flushed, concurrent streams drain one by one."""
+        if self._drain is None:
+            self._drain = asyncio.Lock()
+        async with self._drain:
+            await self._writer.drain()
+
+    async def _wait(self) -> None:
+        """Waits until received frames or finished streams change the connection state."""
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        await self._changed.wait()
+
+    def _notify(self) -> None:
+        """Wakes streams waiting for a change of the connection state."""
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
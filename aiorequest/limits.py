@@ -0,0 +1,88 @@
+"""The module provides API for client side rate limiting of HTTP requests."""
+import asyncio
+import time
+from typing import Dict, Mapping, Optional
+
+
+class TokenBucket:
+    """The class represents token bucket rate limiter.
+
+    Tokens are refilled with `rate` per second up to `capacity`, a request takes one
+    token. Waiters are served in the order they arrive and sleep until a token is refilled.
+
+    Args:
+        rate: number of tokens refilled per second
+        capacity: maximum number of tokens, defaults to one second worth of tokens
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError(f"Rate should be positive, got {rate}")
+        self._rate: float = rate
+        self._capacity: float = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens: float = self._capacity
+        self._updated: float = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        """Takes one token, waits until it is available."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self) -> None:
+        """Adds tokens accumulated since the last refill up to capacity of the bucket."""
+        now: float = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+class RateLimiter:
+    """The class represents rate limiter of requests globally and per host.
+
+    Args:
+        rate: maximum number of requests per second to all hosts
+        per_host: maximum number of requests per second to specific hosts
+        host_rate: maximum number of requests per second to any other host
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        per_host: Mapping[str, float] = {},
+        host_rate: Optional[float] = None,
+    ) -> None:
+        self._global: Optional[TokenBucket] = TokenBucket(rate) if rate else None
+        self._rates: Mapping[str, float] = per_host
+        self._host_rate: Optional[float] = host_rate
+        self._hosts: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, host: str) -> None:
+        """Waits until a request to a given host is allowed.
+
+        Args:
+            host: a domain name (host) of a request
+        """
+        bucket: Optional[TokenBucket] = self._host(host)
+        if bucket is not None:
+            await bucket.acquire()
+        if self._global is not None:
+            await self._global.acquire()
+
+    def _host(self, host: str) -> Optional[TokenBucket]:
+        """Returns a bucket of a host or `None` if requests to it are not limited.
+
+        Args:
+            host: a domain name (host) of a request
+        """
+        if host not in self._hosts:
+            rate: Optional[float] = self._rates.get(host, self._host_rate)
+            if not rate:
+                return None
+            self._hosts[host] = TokenBucket(rate)
+        return self._hosts[host]
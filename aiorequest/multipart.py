@@ -0,0 +1,144 @@
+"""The module provides API for streamed ``multipart/form-data`` request data."""
+import asyncio
+import mimetypes
+import os
+import uuid
+from typing import AsyncIterator, List, Optional, Tuple, Union
+from aiorequest.uploads import BytesUpload, IterableUpload, Upload, Uploadable, uploaded
+
+_CRLF: bytes = b"\r\n"
+
+FieldValue = Union[str, Uploadable]
+
+
+class Multipart(Upload):
+    """The class represents ``multipart/form-data`` request data streamed part by part.
+
+    Part headers and boundaries are built as parts are added, so the size of a form is
+    known before any data is read unless a part of unknown size is added. File parts
+    are sent with ``sendfile`` where a connection allows it.
+
+    Args:
+        boundary: a delimiter of parts, a random one is used if it is not given
+    """
+
+    def __init__(self, boundary: Optional[str] = None) -> None:
+        self._boundary: str = boundary or uuid.uuid4().hex
+        self._parts: List[Tuple[bytes, Upload]] = []
+
+    def __len__(self) -> int:
+        """Returns number of parts of a form."""
+        return len(self._parts)
+
+    def add(
+        self,
+        name: str,
+        value: FieldValue,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+        size: Optional[int] = None,
+    ) -> None:
+        """Adds a part of a form.
+
+        A string is sent as a plain field unless a `filename` is given, a file path is
+        expected as `os.PathLike`. Other values are sent as files named after a given
+        `filename` or a name of a file.
+
+        Args:
+            name: a name of a field
+            value: a string, bytes, a path of a file, a binary file object, an asynchronous
+                iterable of bytes or an upload
+            filename: a file name reported to a server
+            content_type: media type of a part, guessed from a file name if it is not given
+            size: number of bytes of an asynchronous iterable if it is known
+        """
+        if isinstance(value, str) and filename is None:
+            self._parts.append((self._head(name, None, content_type), BytesUpload(value.encode())))
+            return
+        if isinstance(value, str):
+            upload: Upload = BytesUpload(value.encode())
+        elif size is not None and not isinstance(value, Upload) and hasattr(value, "__aiter__"):
+            upload = IterableUpload(value, size)  # type: ignore
+        else:
+            upload = uploaded(value)
+        if filename is None and isinstance(value, os.PathLike):
+            filename = os.path.basename(os.fspath(value))
+        elif filename is None and isinstance(getattr(value, "name", None), str):
+            filename = os.path.basename(getattr(value, "name"))
+        self._parts.append(
+            (
+                self._head(
+                    name,
+                    filename or name,
+                    content_type
+                    or mimetypes.guess_type(filename or "")[0]
+                    or "application/octet-stream",
+                ),
+                upload,
+            )
+        )
+
+    def content_type(self) -> Optional[str]:
+        """See base class."""
+        return f"multipart/form-data; boundary={self._boundary}"
+
+    def replayable(self) -> bool:
+        """See base class."""
+        return all(upload.replayable() for _, upload in self._parts)
+
+    def size(self) -> Optional[int]:
+        """See base class."""
+        total: int = len(self._tail())
+        for head, upload in self._parts:
+            part: Optional[int] = upload.size()
+            if part is None:
+                return None
+            total += len(head) + part + len(_CRLF)
+        return total
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """See base class."""
+        for head, upload in self._parts:
+            yield head
+            async for chunk in upload.chunks():
+                yield chunk
+            yield _CRLF
+        yield self._tail()
+
+    async def write(self, writer: asyncio.StreamWriter) -> None:
+        """See base class."""
+        for head, upload in self._parts:
+            writer.write(head)
+            await upload.write(writer)
+            writer.write(_CRLF)
+        writer.write(self._tail())
+        await writer.drain()
+
+    def _head(self, name: str, filename: Optional[str], content_type: Optional[str]) -> bytes:
+        """Returns a boundary and headers of a part.
+
+        Args:
+            name: a name of a field
+            filename: a file name reported to a server if a part is a file
+            content_type: media type of a part
+        """
+        disposition: str = f'form-data; name="{_quoted(name)}"'
+        if filename is not None:
+            disposition += f'; filename="{_quoted(filename)}"'
+        head: str = f"--{self._boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if content_type is not None:
+            head += f"Content-Type: {content_type}\r\n"
+        return f"{head}\r\n".encode("utf-8")
+
+    def _tail(self) -> bytes:
+        """Returns a closing boundary of a form."""
+        return f"--{self._boundary}--\r\n".encode("utf-8")
+
+
+def _quoted(value: str) -> str:
+    """Returns a value escaped to be put into a quoted header parameter.
+
+    Args:
+        value: a field name or a file name
+    """
+    return value.replace("\r", "%0D").replace("\n", "%0A").replace('"', "%22")
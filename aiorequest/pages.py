@@ -0,0 +1,289 @@
+"""The module provides API for iterating over pages of paginated HTTP APIs."""
+import asyncio
+import re
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from urllib.parse import SplitResult, parse_qsl, quote, urlencode, urljoin, urlsplit, urlunsplit
+from punish import AbstractStyle, abstractstyle
+from aiorequest.responses import JsonType, Response, StreamResponse
+from aiorequest.urls import Address, Url
+
+Request = Callable[[Address], Awaitable[Response]]
+_Item = Union[Response, BaseException, None]
+
+_LINK: "re.Pattern[str]" = re.compile(r"<([^>]*)>((?:\s*;\s*[^;,]+)*)")
+_PARAMETER: "re.Pattern[str]" = re.compile(r";\s*([^=;\s]+)\s*=\s*(\"[^\"]*\"|[^;,\s]+)")
+
+
+class PageStrategy(AbstractStyle):
+    """The class represents an abstraction of a way an API links its pages."""
+
+    def first(self, address: Address) -> Address:
+        """Returns an address of the first page.
+
+        Args:
+            address: an address pagination starts from
+        """
+        return address
+
+    @abstractstyle
+    async def following(self, address: Address, response: Response) -> Optional[Address]:
+        """Returns an address of a page following a given one or `None` after the last page.
+
+        Args:
+            address: an address of a page
+            response: a response of a page
+        """
+        pass
+
+
+class LinkPages(PageStrategy):
+    """The class represents pages linked with RFC 8288 ``Link`` header.
+
+    A target of a link with ``next`` relation is followed, relative targets are resolved
+    against an address of a page.
+    """
+
+    async def following(self, address: Address, response: Response) -> Optional[Address]:
+        """See base class."""
+        target: Optional[str] = next_link((await response.headers()).get("link", ""))
+        if target is None:
+            return None
+        return _address(urljoin(address.url, target))
+
+
+class CursorPages(PageStrategy):
+    """The class represents pages linked with a cursor field of a JSON document.
+
+    A cursor of a next page is read at a dotted `field` path of a page and sent as a
+    `parameter` of a query, an empty or missing cursor ends pagination.
+
+    Args:
+        field: dotted path to a cursor e.g. ``meta.next_cursor``
+        parameter: a name of a query parameter of a cursor
+    """
+
+    def __init__(self, field: str = "next_cursor", parameter: str = "cursor") -> None:
+        self._field: List[str] = field.split(".")
+        self._parameter: str = parameter
+
+    async def following(self, address: Address, response: Response) -> Optional[Address]:
+        """See base class."""
+        cursor: JsonType = _selected(await response.as_json(), self._field)
+        if cursor is None or cursor == "":
+            return None
+        return _queried(address, {self._parameter: str(cursor)})
+
+
+class OffsetPages(PageStrategy):
+    """The class represents pages selected with offset and limit query parameters.
+
+    A page with less than `limit` items is the last one. Items are a JSON array of a
+    page or an array at a dotted `items` path of it.
+
+    Args:
+        limit: number of items of a page
+        start: an offset of the first page
+        items: dotted path to an array of items e.g. ``data.results``
+        offset_parameter: a name of a query parameter of an offset
+        limit_parameter: a name of a query parameter of a limit
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        start: int = 0,
+        items: Optional[str] = None,
+        offset_parameter: str = "offset",
+        limit_parameter: str = "limit",
+    ) -> None:
+        self._limit: int = limit
+        self._start: int = start
+        self._items: List[str] = items.split(".") if items else []
+        self._offset_parameter: str = offset_parameter
+        self._limit_parameter: str = limit_parameter
+
+    def first(self, address: Address) -> Address:
+        """See base class."""
+        return self._page(address, self._start)
+
+    async def following(self, address: Address, response: Response) -> Optional[Address]:
+        """See base class."""
+        items: JsonType = _selected(await response.as_json(), self._items)
+        if not isinstance(items, list) or len(items) < self._limit:
+            return None
+        offset: str = dict(parse_qsl(urlsplit(address.url).query)).get(
+            self._offset_parameter, str(self._start)
+        )
+        return self._page(address, int(offset) + self._limit)
+
+    def _page(self, address: Address, offset: int) -> Address:
+        """Returns an address of a page starting at a given offset.
+
+        Args:
+            address: an address of a page
+            offset: an offset of a page
+        """
+        return _queried(
+            address, {self._offset_parameter: str(offset), self._limit_parameter: str(self._limit)}
+        )
+
+
+async def paginated(
+    request: Request,
+    address: Address,
+    strategy: PageStrategy,
+    prefetch: int = 1,
+    pages: Optional[int] = None,
+) -> AsyncIterator[Response]:
+    """Yields responses of pages while next pages are requested in the background.
+
+    Up to `prefetch` pages following the one a caller processes are requested ahead of
+    time. Pagination stops at a page linking an already requested address.
+
+    Args:
+        request: a request to perform for every page
+        address: an address pagination starts from
+        strategy: a way pages are linked
+        prefetch: maximum number of pages requested ahead, ``0`` requests them on demand
+        pages: maximum number of pages
+
+    Raises:
+        a failure of a request once pages preceding it are yielded
+    """
+    ready: "asyncio.Queue[_Item]" = asyncio.Queue()
+    slots: asyncio.Semaphore = asyncio.Semaphore(max(prefetch, 0) + 1)
+    fetcher: "asyncio.Future[None]" = asyncio.ensure_future(
+        _fetch(request, strategy.first(address), strategy, pages, ready, slots)
+    )
+    try:
+        item: _Item = await ready.get()
+        while item is not None:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+            slots.release()
+            item = await ready.get()
+    finally:
+        fetcher.cancel()
+        await asyncio.gather(fetcher, return_exceptions=True)
+        await _discarded(ready)
+
+
+def next_link(header: str) -> Optional[str]:
+    """Returns a target of a link with ``next`` relation of a ``Link`` header if any.
+
+    Args:
+        header: a value of a ``Link`` header
+    """
+    for match in _LINK.finditer(header):
+        for name, value in _PARAMETER.findall(match.group(2)):
+            if name.lower() == "rel" and "next" in value.strip('"').lower().split():
+                return match.group(1).strip()
+    return None
+
+
+async def _fetch(
+    request: Request,
+    address: Address,
+    strategy: PageStrategy,
+    pages: Optional[int],
+    ready: "asyncio.Queue[_Item]",
+    slots: asyncio.Semaphore,
+) -> None:
+    """Requests pages one after another and puts their responses into a queue.
+
+    A response is put into a queue only once an address of a following page is worked
+    out, so a strategy reading its data never races a caller. A failure of a request is
+    put into a queue as well, `None` marks the end of pages.
+
+    Args:
+        request: a request to perform for every page
+        address: an address of the first page
+        strategy: a way pages are linked
+        pages: maximum number of pages
+        ready: a queue of responses
+        slots: a semaphore bounding number of responses requested ahead
+    """
+    current: Optional[Address] = address
+    requested: Set[str] = set()
+    try:
+        while current is not None and current.url not in requested:
+            if pages is not None and len(requested) >= pages:
+                break
+            await slots.acquire()
+            requested.add(current.url)
+            response: Response = await request(current)
+            try:
+                following: Optional[Address] = await strategy.following(current, response)
+            finally:
+                await ready.put(response)
+            current = following
+    except Exception as error:
+        await ready.put(error)
+    await ready.put(None)
+
+
+async def _discarded(ready: "asyncio.Queue[_Item]") -> None:
+    """Drops responses left in a queue releasing their not yet received data.
+
+    Args:
+        ready: a queue of responses
+    """
+    while not ready.empty():
+        item: _Item = ready.get_nowait()
+        if isinstance(item, StreamResponse) and item.stream is not None:
+            await item.stream.close()
+
+
+def _selected(document: JsonType, path: List[str]) -> Any:
+    """Returns a value at a path of a JSON document or `None` if it is missing.
+
+    Args:
+        document: a JSON document
+        path: keys leading to a value
+    """
+    for key in path:
+        if not isinstance(document, dict):
+            return None
+        document = document.get(key)
+    return document
+
+
+def _queried(address: Address, parameters: Dict[str, str]) -> Address:
+    """Returns an address with given query parameters set.
+
+    Args:
+        address: an address
+        parameters: names and values of query parameters
+    """
+    parts: SplitResult = urlsplit(address.url)
+    query: List[Tuple[str, str]] = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name not in parameters
+    ]
+    encoded: str = urlencode(query + list(parameters.items()), quote_via=quote)
+    return Url.built(
+        parts.netloc, parts.scheme, parts.path, urlunsplit(parts._replace(query=encoded))
+    )
+
+
+def _address(url: str) -> Address:
+    """Returns an address of an absolute url.
+
+    Args:
+        url: an absolute url
+    """
+    parts: SplitResult = urlsplit(url)
+    return Url.built(parts.netloc, parts.scheme, parts.path, url)
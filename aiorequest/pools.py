@@ -0,0 +1,221 @@
+"""The module provides API for pools of keep-alive HTTP connections."""
+import asyncio
+import ssl
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from aiorequest.connections import HttpConnection
+from aiorequest.resolvers import CachingResolver, Resolution, Resolver, is_ip
+from aiorequest.timeouts import Timeouts
+
+Origin = Tuple[str, str, int]
+_IdleConnection = Tuple[HttpConnection, float]
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """The class represents connections statistics of a single origin."""
+
+    opened: int
+    idle: int
+    in_use: int
+
+
+@dataclass(frozen=True)
+class PoolLimits:
+    """The class represents limits of open connections and lifetimes of a connection pool.
+
+    Args:
+        per_host: maximum number of open connections to a single origin
+        total: maximum number of open connections to all origins
+        idle_ttl: number of seconds an idle connection is kept open
+        dns_ttl: number of seconds a host resolution is trusted by a default resolver,
+            idle connections to addresses a host no longer resolves to are not reused
+    """
+
+    per_host: int = 10
+    total: int = 100
+    idle_ttl: float = 30.0
+    dns_ttl: float = 60.0
+
+
+class ConnectionPool:
+    """The class represents a manager of keep-alive connections grouped by origin.
+
+    Args:
+        limits: limits of open connections and lifetimes of idle connections
+        ssl_context: TLS context used for ``https`` origins
+        resolver: a resolver of hosts, resolutions are cached for DNS TTL of `limits` if it
+            is not given
+    """
+
+    def __init__(
+        self,
+        limits: PoolLimits = PoolLimits(),
+        ssl_context: Optional[ssl.SSLContext] = None,
+        resolver: Optional[Resolver] = None,
+    ) -> None:
+        self._per_host: int = limits.per_host
+        self._total: int = limits.total
+        self._idle_ttl: float = limits.idle_ttl
+        self._ssl_context: ssl.SSLContext = ssl_context or ssl.create_default_context()
+        self._idle: Dict[Origin, List[_IdleConnection]] = {}
+        self._in_use: Dict[Origin, int] = {}
+        self._resolver: Resolver = resolver or CachingResolver(ttl=limits.dns_ttl)
+        self._condition: Optional[asyncio.Condition] = None
+        self._evictor: Optional["asyncio.Task[None]"] = None
+
+    async def acquire(
+        self, origin: Origin, reuse: bool = True, timeouts: Timeouts = Timeouts()
+    ) -> Tuple[HttpConnection, bool]:
+        """Returns a connection to a given origin and whether it is freshly opened.
+
+        Waits until per host and total limits allow to open one more connection.
+
+        Args:
+            origin: scheme, host and port of a connection
+            reuse: whether an idle connection may be returned
+            timeouts: connect and TLS timeouts of a new connection
+        """
+        addresses: Optional[FrozenSet[str]] = await self._addresses(origin) if reuse else None
+        async with self._lock():
+            self._evict_later()
+            while True:
+                connection: Optional[HttpConnection] = self._pop_idle(origin, addresses)
+                if connection is not None:
+                    self._in_use[origin] = self._in_use.get(origin, 0) + 1
+                    return connection, False
+                if self._opened(origin) < self._per_host and self._free_slot():
+                    self._in_use[origin] = self._in_use.get(origin, 0) + 1
+                    break
+                await self._lock().wait()
+        try:
+            scheme, host, port = origin
+            return (
+                await HttpConnection.opened(
+                    host,
+                    port,
+                    self._ssl_context if scheme == "https" else None,
+                    timeouts,
+                    self._resolver,
+                ),
+                True,
+            )
+        except BaseException:
+            await self.release(origin, None)
+            raise
+
+    async def release(self, origin: Origin, connection: Optional[HttpConnection]) -> None:
+        """Returns a connection back into the pool.
+
+        Connection which cannot serve more requests is closed.
+
+        Args:
+            origin: scheme, host and port of a connection
+            connection: a connection taken from the pool
+        """
+        async with self._lock():
+            self._in_use[origin] -= 1
+            if connection is not None and connection.reusable:
+                self._idle.setdefault(origin, []).append((connection, time.monotonic()))
+            elif connection is not None:
+                connection.close()
+            self._lock().notify_all()
+
+    async def stats(self) -> Dict[str, PoolStats]:
+        """Returns connections statistics per origin."""
+        return {
+            f"{scheme}://{host}:{port}": PoolStats(
+                opened=self._opened((scheme, host, port)),
+                idle=len(self._idle.get((scheme, host, port), ())),
+                in_use=self._in_use.get((scheme, host, port), 0),
+            )
+            for scheme, host, port in set(self._idle) | set(self._in_use)
+        }
+
+    async def close(self) -> None:
+        """Closes all idle connections and stops background eviction."""
+        if self._evictor is not None:
+            self._evictor.cancel()
+            self._evictor = None
+        for idle in self._idle.values():
+            for connection, _ in idle:
+                connection.close()
+        self._idle.clear()
+
+    def _lock(self) -> asyncio.Condition:
+        """Returns a condition guarding the pool, it is created in a running event loop."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _opened(self, origin: Origin) -> int:
+        """Returns number of idle and in use connections to an origin."""
+        return len(self._idle.get(origin, ())) + self._in_use.get(origin, 0)
+
+    def _free_slot(self) -> bool:
+        """Returns `True` if one more connection fits into the total limit otherwise `False`.
+
+        The oldest idle connection of any origin is closed to make room if the limit is hit.
+        """
+        if sum(map(len, self._idle.values())) + sum(self._in_use.values()) < self._total:
+            return True
+        oldest: Optional[Origin] = min(
+            (origin for origin, idle in self._idle.items() if idle),
+            key=lambda origin: self._idle[origin][0][1],
+            default=None,
+        )
+        if oldest is None:
+            return False
+        self._idle[oldest].pop(0)[0].close()
+        return True
+
+    def _pop_idle(
+        self, origin: Origin, addresses: Optional[FrozenSet[str]]
+    ) -> Optional[HttpConnection]:
+        """Returns the most recently used reusable idle connection to an origin if any.
+
+        Connections which are not reusable or which peer is not among `addresses` are closed.
+
+        Args:
+            origin: an origin of a connection
+            addresses: current addresses of an origin host, `None` skips idle connections
+        """
+        idle: List[_IdleConnection] = self._idle.get(origin, []) if addresses is not None else []
+        while idle:
+            connection: HttpConnection = idle.pop()[0]
+            if connection.reusable and (not addresses or connection.peer in addresses):
+                return connection
+            connection.close()
+        return None
+
+    async def _addresses(self, origin: Origin) -> FrozenSet[str]:
+        """Returns current addresses of an origin host or nothing if they are not checked.
+
+        Args:
+            origin: an origin of a connection
+        """
+        _, host, port = origin
+        if not self._idle.get(origin) or is_ip(host):
+            return frozenset()
+        try:
+            resolution: Resolution = await self._resolver.resolve(host, port)
+        except OSError:
+            return frozenset()
+        return frozenset(str(address[0]) for _, address in resolution.addresses)
+
+    def _evict_later(self) -> None:
+        """Starts eviction of expired idle connections unless it runs already."""
+        if self._evictor is None or self._evictor.done():
+            self._evictor = asyncio.get_running_loop().create_task(self._evict())
+
+    async def _evict(self) -> None:
+        """Closes idle connections which are unused longer than idle TTL."""
+        while True:
+            await asyncio.sleep(min(self._idle_ttl, 1.0))
+            expired: float = time.monotonic() - self._idle_ttl
+            async with self._lock():
+                for idle in self._idle.values():
+                    while idle and idle[0][1] < expired:
+                        idle.pop(0)[0].close()
+                self._lock().notify_all()
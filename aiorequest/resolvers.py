@@ -0,0 +1,211 @@
+"""The module provides API for asynchronous resolution of host names."""
+import asyncio
+import ipaddress
+import socket
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
+from punish import AbstractStyle, abstractstyle
+
+try:
+    import aiodns
+except ImportError:  # pragma: no cover
+    aiodns = cast(Any, None)
+
+SocketAddress = Tuple[int, Tuple[Any, ...]]
+_Entry = Tuple[float, Union["Resolution", OSError]]
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """The class represents addresses a host is resolved to.
+
+    Args:
+        addresses: socket family and address pairs in preferred order
+        ttl: number of seconds the addresses are valid for if it is known
+    """
+
+    addresses: Tuple[SocketAddress, ...]
+    ttl: Optional[float] = None
+
+
+class Resolver(AbstractStyle):
+    """The class represents an abstraction of a host name resolver."""
+
+    @abstractstyle
+    async def resolve(self, host: str, port: int) -> Resolution:
+        """Returns addresses of a given host.
+
+        Args:
+            host: a domain name or an IP address
+            port: a port number
+
+        Raises:
+            `OSError` if a host cannot be resolved
+        """
+        pass
+
+
+class SystemResolver(Resolver):
+    """The class represents a resolver backed by ``getaddrinfo`` of an event loop.
+
+    The system resolver does not report lifetime of addresses.
+    """
+
+    async def resolve(self, host: str, port: int) -> Resolution:
+        """See base class."""
+        infos: List[Tuple[Any, ...]] = await asyncio.get_event_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+        return Resolution(tuple((info[0], info[4]) for info in infos))
+
+
+class AioDnsResolver(Resolver):
+    """The class represents a non-blocking DNS resolver reporting lifetime of records.
+
+    IPv6 and IPv4 records are queried concurrently, IP address literals are not queried.
+
+    Args:
+        nameservers: addresses of DNS servers, system ones are used if they are not given
+    """
+
+    def __init__(self, nameservers: Optional[List[str]] = None) -> None:
+        if aiodns is None:
+            raise ImportError("'aiodns' package is required to use AioDnsResolver")
+        self._nameservers: Optional[List[str]] = nameservers
+        self._resolver: Any = None
+
+    async def resolve(self, host: str, port: int) -> Resolution:
+        """See base class."""
+        if is_ip(host):
+            return await SystemResolver().resolve(host, port)
+        if self._resolver is None:
+            self._resolver = aiodns.DNSResolver(nameservers=self._nameservers)
+        answers: List[Any] = await asyncio.gather(
+            self._query(host, "AAAA"), self._query(host, "A"), return_exceptions=True
+        )
+        records: List[Tuple[int, Any]] = [
+            (family, record)
+            for family, answer in zip((socket.AF_INET6, socket.AF_INET), answers)
+            if not isinstance(answer, BaseException)
+            for record in answer
+        ]
+        if not records:
+            error: BaseException = answers[1]
+            raise socket.gaierror(socket.EAI_NONAME, f"Unable to resolve '{host}': {error}")
+        return Resolution(
+            tuple((family, (record.host, port)) for family, record in records),
+            min(float(record.ttl) for _, record in records),
+        )
+
+    async def _query(self, host: str, kind: str) -> List[Any]:
+        """Returns DNS records of a host.
+
+        Args:
+            host: a domain name
+            kind: a type of records e.g. ``A`` or ``AAAA``
+        """
+        return await self._resolver.query(host, kind)
+
+
+class CachingResolver(Resolver):
+    """The class represents a resolver remembering resolutions of another resolver.
+
+    Addresses are kept for `ttl` seconds or less if a resolution reports a shorter
+    lifetime, failures are kept for `negative_ttl` seconds. Concurrent resolutions of
+    the same host share one lookup, least recently used hosts are forgotten once there
+    are more than `entries` of them.
+
+    Args:
+        resolver: a resolver performing lookups
+        ttl: maximum number of seconds addresses are kept
+        negative_ttl: number of seconds a failed lookup is kept
+        entries: maximum number of kept hosts
+    """
+
+    def __init__(
+        self,
+        resolver: Resolver = SystemResolver(),
+        ttl: float = 60.0,
+        negative_ttl: float = 5.0,
+        entries: int = 1024,
+    ) -> None:
+        self._resolver: Resolver = resolver
+        self._ttl: float = ttl
+        self._negative_ttl: float = negative_ttl
+        self._entries: int = entries
+        self._cache: "OrderedDict[Tuple[str, int], _Entry]" = OrderedDict()
+        self._lookups: Dict[Tuple[str, int], "asyncio.Future[Resolution]"] = {}
+
+    def __len__(self) -> int:
+        """Returns number of kept hosts."""
+        return len(self._cache)
+
+    async def resolve(self, host: str, port: int) -> Resolution:
+        """See base class."""
+        key: Tuple[str, int] = (host.lower(), port)
+        entry: Optional[_Entry] = self._cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            if isinstance(entry[1], OSError):
+                raise type(entry[1])(*entry[1].args)
+            return entry[1]
+        if key not in self._lookups:
+            lookup: "asyncio.Future[Resolution]" = asyncio.ensure_future(self._lookup(key))
+            self._lookups[key] = lookup
+            lookup.add_done_callback(lambda _: self._lookups.pop(key, None))
+        return await asyncio.shield(self._lookups[key])
+
+    def forget(self, host: str, port: int) -> None:
+        """Drops kept addresses of a given host.
+
+        Args:
+            host: a domain name or an IP address
+            port: a port number
+        """
+        self._cache.pop((host.lower(), port), None)
+
+    async def _lookup(self, key: Tuple[str, int]) -> Resolution:
+        """Resolves a host with a wrapped resolver and keeps its outcome.
+
+        Args:
+            key: a lowercase host and a port
+        """
+        try:
+            resolution: Resolution = await self._resolver.resolve(*key)
+        except OSError as error:
+            self._store(key, self._negative_ttl, error)
+            raise
+        self._store(
+            key, self._ttl if resolution.ttl is None else min(self._ttl, resolution.ttl), resolution
+        )
+        return resolution
+
+    def _store(self, key: Tuple[str, int], ttl: float, value: Union[Resolution, OSError]) -> None:
+        """Keeps an outcome of a lookup for given number of seconds.
+
+        Args:
+            key: a lowercase host and a port
+            ttl: number of seconds an outcome is kept
+            value: addresses or a failure of a lookup
+        """
+        if ttl <= 0:
+            return
+        self._cache[key] = (time.monotonic() + ttl, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._entries:
+            self._cache.popitem(last=False)
+
+
+def is_ip(host: str) -> bool:
+    """Returns `True` if a host is an IP address literal otherwise `False`.
+
+    Args:
+        host: a domain name or an IP address
+    """
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
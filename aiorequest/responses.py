@@ -1,23 +1,51 @@
 """The module contains a set of API for HTTP responses types."""
-from typing import Iterable
+from asyncio import get_running_loop
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, List, Mapping, Optional, Union
+import codecs
+import functools
 import http
 import requests
 from punish import AbstractStyle, abstractstyle
+from aiorequest.codecs import JsonCodec, StdJsonCodec
+from aiorequest.connections import parse_headers
+from aiorequest.decoders import json_items
 from aiorequest.types import AnyUnionDict
 
 JsonType = AnyUnionDict
 HTTPStatus = http.HTTPStatus
+_CHUNK_SIZE: int = 65536
+_REASON_SIZE: int = 512
+_MISSING: Any = object()
 
 
 class ResponseError(Exception):
-    """The class represents HTTP api request response error."""
+    """The class represents HTTP api request response error.
 
-    pass
+    An erroneous `response` is kept if it is known.
+    """
+
+    def __init__(self, message: str, response: Optional["Response"] = None) -> None:
+        super().__init__(message)
+        self.response: Optional[Response] = response
 
 
 class Response(AbstractStyle):
     """The class represents an abstraction of a response from an API request."""
 
+    __slots__ = ()
+
+    @property
+    @abstractstyle
+    def status_code(self) -> int:
+        """Returns HTTP response status code without awaiting."""
+        pass
+
+    @property
+    def ok(self) -> bool:
+        """Returns `True` if response status code is below ``400`` otherwise `False`."""
+        return self.status_code < HTTPStatus.BAD_REQUEST
+
     @abstractstyle
     async def is_ok(self) -> bool:
         """Returns `True` if response is `OK` otherwise `False`."""
@@ -28,6 +56,11 @@ class Response(AbstractStyle):
         """Returns HTTP response status."""
         pass
 
+    @abstractstyle
+    async def headers(self) -> Mapping[str, str]:
+        """Returns HTTP response headers with case-insensitive names."""
+        pass
+
     @abstractstyle
     async def as_json(self) -> JsonType:
         """Returns HTTP response data as dictionary type."""
@@ -38,12 +71,88 @@ class Response(AbstractStyle):
         """Returns HTTP response data as plain data type."""
         pass
 
+    @abstractstyle
+    def iter_bytes(self, chunk_size: int = _CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Returns asynchronous iterator over HTTP response data pieces of given size.
+
+        Args:
+            chunk_size: number of bytes in each piece, the last one may be shorter
+        """
+        pass
+
+    @abstractstyle
+    def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Returns asynchronous iterator over HTTP response data pieces as they arrive."""
+        pass
+
+    @abstractstyle
+    def iter_lines(self) -> AsyncIterator[str]:
+        """Returns asynchronous iterator over HTTP response data lines."""
+        pass
+
+    @abstractstyle
+    def iter_json_items(self, path: str = "item") -> AsyncIterator[JsonType]:
+        """Returns asynchronous iterator over items of JSON array as data arrives.
+
+        Args:
+            path: dotted path to an array where ``item`` stands for an array item,
+                e.g. ``items.item`` selects items of ``{"items": [...]}`` document
+        """
+        pass
+
+
+class Body(AbstractStyle):
+    """The class represents an abstraction of not yet received HTTP response data."""
+
+    @abstractstyle
+    async def read(self, size: int = _CHUNK_SIZE) -> bytes:
+        """Returns next piece of data up to given size or empty bytes at the end.
+
+        Args:
+            size: maximum number of bytes to read
+        """
+        pass
+
+    @abstractstyle
+    async def close(self) -> None:
+        """Stops receiving data and releases its source."""
+        pass
+
+    async def read_all(self) -> bytes:
+        """Returns the rest of data."""
+        pieces: List[bytes] = []
+        piece: bytes = await self.read()
+        while piece:
+            pieces.append(piece)
+            piece = await self.read()
+        return b"".join(pieces)
+
 
 class HttpResponse(Response):
-    """The class represents an HTTP response from HTTP API request."""
+    """The class represents an HTTP response from HTTP API request.
+
+    Status, text and JSON data are computed once and cached, JSON data is decoded with
+    a given `codec`. If an `executor` is given, streamed data is read from `requests`
+    within it.
+    """
 
-    def __init__(self, response: requests.Response) -> None:
+    def __init__(
+        self,
+        response: requests.Response,
+        executor: Optional[Executor] = None,
+        codec: JsonCodec = StdJsonCodec(),
+    ) -> None:
         self._response: requests.Response = response
+        self._executor: Optional[Executor] = executor
+        self._codec: JsonCodec = codec
+        self._status: Optional[HTTPStatus] = None
+        self._text: Optional[str] = None
+        self._json: JsonType = _MISSING
+
+    @property
+    def status_code(self) -> int:
+        """See base class."""
+        return self._response.status_code
 
     async def is_ok(self) -> bool:
         """See base class."""
@@ -51,15 +160,283 @@ class HttpResponse(Response):
 
     async def status(self) -> HTTPStatus:
         """See base class."""
-        return HTTPStatus(self._response.status_code)
+        if self._status is None:
+            self._status = HTTPStatus(self._response.status_code)
+        return self._status
+
+    async def headers(self) -> Mapping[str, str]:
+        """See base class."""
+        return self._response.headers
 
     async def as_json(self) -> JsonType:
         """See base class."""
-        return self._response.json()
+        if self._json is _MISSING:
+            self._json = self._codec.decode(self._response.content)
+        return self._json
 
     async def as_str(self) -> str:
         """See base class."""
-        return self._response.text
+        if self._text is None:
+            self._text = self._response.text
+        return self._text
+
+    async def iter_bytes(self, chunk_size: int = _CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """See base class."""
+        async for chunk in self._iterate(self._response.iter_content(chunk_size)):
+            yield chunk
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """See base class."""
+        async for chunk in self._iterate(self._response.iter_content(chunk_size=None)):
+            yield chunk
+
+    async def iter_lines(self) -> AsyncIterator[str]:
+        """See base class."""
+        async for line in _lines(self.iter_chunks(), self._response.encoding or "utf-8"):
+            yield line
+
+    async def iter_json_items(self, path: str = "item") -> AsyncIterator[JsonType]:
+        """See base class."""
+        async for item in json_items(self.iter_chunks(), path, codec=self._codec):
+            yield item
+
+    async def _iterate(self, chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+        """Yields chunks of `requests` response data, each one is read by an executor if any.
+
+        Args:
+            chunks: an iterator over response data
+        """
+        if self._executor is None:
+            for chunk in chunks:
+                yield chunk
+            return
+        following: Callable[[], bytes] = functools.partial(next, chunks, b"")
+        piece: bytes = await get_running_loop().run_in_executor(self._executor, following)
+        while piece:
+            yield piece
+            piece = await get_running_loop().run_in_executor(self._executor, following)
+
+
+class StreamResponse(Response):
+    """The class represents an HTTP response received through asyncio streams.
+
+    Response data is either already received `content` or a `stream` which is read
+    on demand. A stream may be consumed only once. Status, text and JSON data are
+    computed once and cached, JSON data is decoded with a given `codec`.
+    """
+
+    def __init__(
+        self,
+        code: int,
+        headers: Mapping[str, str],
+        content: bytes = b"",
+        stream: Optional[Body] = None,
+        codec: JsonCodec = StdJsonCodec(),
+    ) -> None:
+        self._codec: JsonCodec = codec
+        self._code: int = code
+        self._headers: Mapping[str, str] = headers
+        self._body: bytes = content
+        self._stream: Optional[Body] = stream
+        self._consumed: bool = False
+        self._status: Optional[HTTPStatus] = None
+        self._text: Optional[str] = None
+        self._json: JsonType = _MISSING
+
+    @property
+    def status_code(self) -> int:
+        """See base class."""
+        return self._code
+
+    @property
+    def stream(self) -> Optional[Body]:
+        """Returns not yet received response data or `None` once it is received or consumed."""
+        return self._stream
+
+    async def is_ok(self) -> bool:
+        """See base class."""
+        return self._code < HTTPStatus.BAD_REQUEST
+
+    async def status(self) -> HTTPStatus:
+        """See base class."""
+        if self._status is None:
+            self._status = HTTPStatus(self._code)
+        return self._status
+
+    async def headers(self) -> Mapping[str, str]:
+        """See base class."""
+        return self._headers
+
+    async def as_json(self) -> JsonType:
+        """See base class."""
+        if self._json is _MISSING:
+            self._json = self._codec.decode(await self.as_bytes())
+        return self._json
+
+    async def as_str(self) -> str:
+        """See base class."""
+        if self._text is None:
+            self._text = (await self.as_bytes()).decode(_charset(self._headers), errors="replace")
+        return self._text
+
+    async def as_bytes(self) -> bytes:
+        """Returns HTTP response data, a stream is received to its end and kept once."""
+        if self._stream is not None or self._consumed:
+            self._body = b"".join([chunk async for chunk in self.iter_chunks()])
+            self._consumed = False
+        return self._body
+
+    async def iter_bytes(self, chunk_size: int = _CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """See base class."""
+        if self._stream is None and not self._consumed:
+            for start in range(0, len(self._body), chunk_size):
+                yield self._body[start : start + chunk_size]
+            return
+        buffer: bytearray = bytearray()
+        async for chunk in self.iter_chunks():
+            buffer += chunk
+            while len(buffer) >= chunk_size:
+                yield bytes(buffer[:chunk_size])
+                del buffer[:chunk_size]
+        if buffer:
+            yield bytes(buffer)
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """See base class."""
+        if self._stream is None:
+            if self._consumed:
+                raise RuntimeError("Response data stream is already consumed")
+            if self._body:
+                yield self._body
+            return
+        stream: Body = self._stream
+        self._stream, self._consumed = None, True
+        try:
+            chunk: bytes = await stream.read()
+            while chunk:
+                yield chunk
+                chunk = await stream.read()
+        finally:
+            await stream.close()
+
+    async def iter_lines(self) -> AsyncIterator[str]:
+        """See base class."""
+        async for line in _lines(self.iter_chunks(), _charset(self._headers)):
+            yield line
+
+    async def iter_json_items(self, path: str = "item") -> AsyncIterator[JsonType]:
+        """See base class."""
+        async for item in json_items(
+            self.iter_chunks(), path, _charset(self._headers), self._codec
+        ):
+            yield item
+
+
+class SlimResponse(Response):
+    """The class represents a compact HTTP response which data is already received.
+
+    Only a status code, raw header lines and a view over a single data buffer are kept,
+    so many responses may be held in memory at once. Headers are parsed and data is
+    decoded on every call and nothing is cached, `as_bytes` returns data without copying.
+    """
+
+    __slots__ = ("_code", "_head", "_body", "_codec")
+
+    def __init__(
+        self,
+        code: int,
+        head: bytes,
+        content: Union[bytes, bytearray, memoryview] = b"",
+        codec: JsonCodec = StdJsonCodec(),
+    ) -> None:
+        self._code: int = code
+        self._head: bytes = head
+        self._body: memoryview = memoryview(content)
+        self._codec: JsonCodec = codec
+
+    @property
+    def status_code(self) -> int:
+        """See base class."""
+        return self._code
+
+    async def is_ok(self) -> bool:
+        """See base class."""
+        return self._code < HTTPStatus.BAD_REQUEST
+
+    async def status(self) -> HTTPStatus:
+        """See base class."""
+        return HTTPStatus(self._code)
+
+    async def headers(self) -> Mapping[str, str]:
+        """See base class."""
+        return parse_headers(self._head)
+
+    async def as_bytes(self) -> memoryview:
+        """Returns a view of HTTP response data."""
+        return self._body
+
+    async def as_json(self) -> JsonType:
+        """See base class."""
+        return self._codec.decode(self._body)
+
+    async def as_str(self) -> str:
+        """See base class."""
+        return str(self._body, _charset(await self.headers()), "replace")
+
+    async def iter_bytes(self, chunk_size: int = _CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """See base class."""
+        for start in range(0, len(self._body), chunk_size):
+            yield self._body[start : start + chunk_size].tobytes()
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """See base class."""
+        async for chunk in self.iter_bytes():
+            yield chunk
+
+    async def iter_lines(self) -> AsyncIterator[str]:
+        """See base class."""
+        async for line in _lines(self.iter_chunks(), _charset(await self.headers())):
+            yield line
+
+    async def iter_json_items(self, path: str = "item") -> AsyncIterator[JsonType]:
+        """See base class."""
+        async for item in json_items(
+            self.iter_chunks(), path, _charset(await self.headers()), self._codec
+        ):
+            yield item
+
+
+def _charset(headers: Mapping[str, str], default: str = "utf-8") -> str:
+    """Returns text encoding declared in ``Content-Type`` header.
+
+    Args:
+        headers: HTTP response headers
+        default: encoding used when a charset is not declared
+    """
+    for parameter in headers.get("content-type", "").split(";")[1:]:
+        name, _, value = parameter.strip().partition("=")
+        if name.lower() == "charset" and value:
+            return value.strip("\"'")
+    return default
+
+
+async def _lines(chunks: AsyncIterator[bytes], encoding: str) -> AsyncIterator[str]:
+    """Returns asynchronous iterator over decoded lines of data pieces.
+
+    Args:
+        chunks: data pieces
+        encoding: text encoding of data
+    """
+    decoder: codecs.IncrementalDecoder = codecs.getincrementaldecoder(encoding)("replace")
+    pending: str = ""
+    async for chunk in chunks:
+        lines = (pending + decoder.decode(chunk)).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", True)
+    if pending:
+        yield pending.rstrip("\r")
 
 
 async def safe_response(
@@ -76,9 +453,32 @@ async def safe_response(
         `ResponseError` if HTTP response contains a set of errors
     Returns: a response
     """
-    if await response.status() not in success_codes:
+    if response.status_code not in success_codes:
         raise ResponseError(
             f"HTTP response contains some errors with '{await response.status()}' status! "
-            f"Reason: {await response.as_str()}"
+            f"Reason: {await _reason(response)}",
+            response,
         )
     return response
+
+
+async def _reason(response: Response, size: int = _REASON_SIZE) -> str:
+    """Returns text of a bounded prefix of HTTP response data.
+
+    Streamed data is received to its end and kept by a response, so its connection is
+    released and the data stays available to a caller handling an error. Only a prefix
+    of data is decoded.
+
+    Args:
+        response: a specific HTTP response
+        size: maximum number of bytes to decode
+    """
+    prefix: bytes = b""
+    if isinstance(response, StreamResponse):
+        prefix = (await response.as_bytes())[: size + 1]
+    else:
+        async for piece in response.iter_bytes(size + 1):
+            prefix = piece
+            break
+    text: str = prefix[:size].decode(_charset(await response.headers()), errors="replace")
+    return f"{text}..." if len(prefix) > size else text
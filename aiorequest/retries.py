@@ -0,0 +1,167 @@
+"""The module provides API for retrying failed HTTP requests."""
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Collection, FrozenSet, Optional, Tuple, Type
+import requests
+from aiorequest.connections import ProtocolError
+from aiorequest.responses import HTTPStatus, Response, ResponseError
+from aiorequest.timeouts import remaining
+from aiorequest.traces import RETRY, emit
+from aiorequest.uploads import Upload
+
+Exceptions = Tuple[Type[BaseException], ...]
+
+IDEMPOTENT_METHODS: FrozenSet[str] = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"))
+RETRYABLE_STATUSES: FrozenSet[int] = frozenset(
+    (
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    )
+)
+RETRYABLE_EXCEPTIONS: Exceptions = (
+    ConnectionError,
+    asyncio.TimeoutError,
+    asyncio.IncompleteReadError,
+    ProtocolError,
+    requests.ConnectionError,
+    requests.Timeout,
+)
+
+
+@dataclass(frozen=True)
+class Backoff:
+    """The class represents waits between attempts of a failed HTTP request.
+
+    Args:
+        base: base wait in seconds
+        maximum: maximum wait in seconds, it limits ``Retry-After`` header as well
+        retry_after: whether ``Retry-After`` header is respected
+        deadline: total number of seconds of all attempts
+    """
+
+    base: float = 0.1
+    maximum: float = 10.0
+    retry_after: bool = True
+    deadline: Optional[float] = None
+
+
+class RetryPolicy:
+    """The class represents a policy of retrying failed HTTP requests.
+
+    Waits between attempts grow exponentially from a base wait of `backoff` up to its
+    maximum with full jitter, ``Retry-After`` header of a response overrides a wait if
+    it is respected but never exceeds the maximum. Requests are not retried once
+    `backoff` deadline passes since the first attempt or a wait does not fit into a
+    deadline of a surrounding context, only requests of given `methods` are retried.
+
+    Args:
+        attempts: maximum number of attempts including the first one
+        statuses: HTTP response statuses worth retrying
+        exceptions: exceptions worth retrying
+        backoff: waits between attempts
+        methods: HTTP methods allowed to be retried
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        statuses: Collection[int] = RETRYABLE_STATUSES,
+        exceptions: Exceptions = RETRYABLE_EXCEPTIONS,
+        backoff: Backoff = Backoff(),
+        methods: Collection[str] = IDEMPOTENT_METHODS,
+    ) -> None:
+        self._attempts: int = attempts
+        self._statuses: Collection[int] = statuses
+        self._exceptions: Exceptions = exceptions
+        self._backoff: float = backoff.base
+        self._max_backoff: float = backoff.maximum
+        self._retry_after: bool = backoff.retry_after
+        self._deadline: Optional[float] = backoff.deadline
+        self._methods: FrozenSet[str] = frozenset(method.upper() for method in methods)
+
+    async def call(
+        self,
+        method: str,
+        request: Callable[[], Awaitable[Response]],
+        upload: Optional[Upload] = None,
+    ) -> Response:
+        """Performs a request until it succeeds or the policy gives up.
+
+        A request is not retried once its `upload` data cannot be sent again.
+
+        Args:
+            method: HTTP method name of a request
+            request: a request to perform
+            upload: streamed data of a request
+
+        Raises:
+            the last failure of a request
+        """
+        started: float = time.monotonic()
+        attempt: int = 1
+        while True:
+            try:
+                return await request()
+            except Exception as error:
+                wait: Optional[float] = await self._wait(method, attempt, error)
+                replayable: bool = upload is None or upload.replayable()
+                if wait is None or not replayable or not self._in_time(started, wait):
+                    raise
+                emit(RETRY, error=error)
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    async def _wait(self, method: str, attempt: int, error: Exception) -> Optional[float]:
+        """Returns number of seconds to wait before the next attempt or `None` to give up.
+
+        Args:
+            method: HTTP method name
+            attempt: number of a failed attempt
+            error: a failure of an attempt
+        """
+        if attempt >= self._attempts or method.upper() not in self._methods:
+            return None
+        wait: float = random.uniform(0, min(self._max_backoff, self._backoff * 2 ** (attempt - 1)))
+        if isinstance(error, ResponseError) and error.response is not None:
+            if error.response.status_code not in self._statuses:
+                return None
+            after: Optional[float] = _retry_after(
+                (await error.response.headers()).get("retry-after")
+            )
+            if self._retry_after and after is not None:
+                return min(after, self._max_backoff)
+            return wait
+        return wait if isinstance(error, self._exceptions) else None
+
+    def _in_time(self, started: float, wait: float) -> bool:
+        """Returns `True` if the next attempt after a wait fits into deadlines otherwise `False`.
+
+        Args:
+            started: monotonic time of the first attempt
+            wait: number of seconds to wait
+        """
+        left: Optional[float] = remaining()
+        if left is not None and wait >= left:
+            return False
+        return self._deadline is None or time.monotonic() + wait - started < self._deadline
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Returns number of seconds to wait according to ``Retry-After`` header.
+
+    Args:
+        value: header value either in seconds or as HTTP date
+    """
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
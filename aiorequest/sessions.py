@@ -1,12 +1,40 @@
 """The module contains a set of API for HTTP sessions."""
 from abc import abstractmethod
+import functools
+from dataclasses import dataclass
 from types import TracebackType
-from typing import Any, AsyncContextManager, Optional, Type
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+from urllib.parse import urlsplit
 import requests
 from punish import AbstractStyle
 from requests.auth import HTTPBasicAuth
-from aiorequest.types import OptionalAnyDict, OptionalStr
-from aiorequest.responses import HttpResponse, Response, safe_response
+from aiorequest.bulks import Outcome, completed, ordered
+from aiorequest.codecs import JsonCodec, StdJsonCodec
+from aiorequest.encodings import Compression
+from aiorequest.flights import SingleFlight
+from aiorequest.limits import RateLimiter
+from aiorequest.pages import LinkPages, PageStrategy, paginated
+from aiorequest.pools import PoolStats
+from aiorequest.retries import RetryPolicy
+from aiorequest.timeouts import Deadline, Timeouts, remaining
+from aiorequest.traces import EXCEPTION, REQUEST_START, Trace, Tracer
+from aiorequest.types import AnyDict, OptionalAnyDict, OptionalStr
+from aiorequest.responses import Response, safe_response
+from aiorequest.transports import RequestOptions, RequestsTransport, Transport
+from aiorequest.uploads import Upload, Uploadable, uploaded
 from aiorequest.urls import Address
 
 
@@ -55,6 +83,7 @@ class Session(AbstractStyle, AsyncContextManager["Session"]):
         url: Address,
         plain: OptionalStr = None,
         as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
         **kwargs: Any,
     ) -> Response:
         """Performs ``POST`` HTTP request of a session.
@@ -63,6 +92,8 @@ class Session(AbstractStyle, AsyncContextManager["Session"]):
             url: url path used to perform a request
             plain: requested data as a plain text
             as_dict: requested data as dictionary (json)
+            upload: requested data streamed from a file path, a binary file object or
+                an asynchronous iterable of bytes
             kwargs: other keyword arguments
 
         Returns: response element
@@ -75,6 +106,7 @@ class Session(AbstractStyle, AsyncContextManager["Session"]):
         url: Address,
         plain: OptionalStr = None,
         as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
         **kwargs: Any,
     ) -> Response:
         """Performs ``PUT`` HTTP request of a session.
@@ -83,6 +115,8 @@ class Session(AbstractStyle, AsyncContextManager["Session"]):
             url: url path used to perform a request
             plain: requested data as a plain text
             as_dict: requested data as dictionary (json)
+            upload: requested data streamed from a file path, a binary file object or
+                an asynchronous iterable of bytes
             kwargs: other keyword arguments
 
         Returns: response element
@@ -95,6 +129,7 @@ class Session(AbstractStyle, AsyncContextManager["Session"]):
         url: Address,
         plain: OptionalStr = None,
         as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
         **kwargs: Any,
     ) -> Response:
         """Performs ``PATCH`` HTTP request of a session.
@@ -103,6 +138,8 @@ class Session(AbstractStyle, AsyncContextManager["Session"]):
             url: url path used to perform a request
             plain: requested data as a plain text
             as_dict: requested data as dictionary (json)
+            upload: requested data streamed from a file path, a binary file object or
+                an asynchronous iterable of bytes
             kwargs: other keyword arguments
 
         Returns: response element
@@ -121,12 +158,150 @@ class Session(AbstractStyle, AsyncContextManager["Session"]):
         """
         pass
 
+    async def mapped(
+        self,
+        method: str,
+        urls: Iterable[Address],
+        concurrency: int = 10,
+        return_exceptions: bool = True,
+        **kwargs: Any,
+    ) -> List[Outcome]:
+        """Performs HTTP requests of a session to a bulk of urls.
+
+        Args:
+            method: HTTP method name e.g. ``get``
+            urls: url paths used to perform requests
+            concurrency: maximum number of requests in flight
+            return_exceptions: whether failures are returned in place of responses or raised
+            kwargs: keyword arguments of every request
+
+        Returns: responses or failures in the order of urls
+        """
+        return await ordered(self._verb(method, kwargs), urls, concurrency, return_exceptions)
+
+    async def as_completed(
+        self, method: str, urls: Iterable[Address], concurrency: int = 10, **kwargs: Any
+    ) -> AsyncIterator[Tuple[Address, Outcome]]:
+        """Performs HTTP requests of a session to a bulk of urls.
+
+        Args:
+            method: HTTP method name e.g. ``get``
+            urls: url paths used to perform requests
+            concurrency: maximum number of requests in flight
+            kwargs: keyword arguments of every request
+
+        Returns: pairs of url and its response or failure as soon as they are ready
+        """
+        async for outcome in completed(self._verb(method, kwargs), urls, concurrency):
+            yield outcome
+
+    async def paginate(
+        self,
+        url: Address,
+        strategy: Optional[PageStrategy] = None,
+        prefetch: int = 1,
+        pages: Optional[int] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Response]:
+        """Performs ``GET`` HTTP requests of a session to pages of a paginated API.
+
+        Next pages are requested while a caller processes a current one.
+
+        Args:
+            url: url path of the first page
+            strategy: a way pages are linked, ``Link`` header by default
+            prefetch: maximum number of pages requested ahead, ``0`` requests them on demand
+            pages: maximum number of pages
+            kwargs: keyword arguments of every request
+
+        Returns: responses of pages in order
+        """
+        async for page in paginated(
+            functools.partial(self.get, **kwargs), url, strategy or LinkPages(), prefetch, pages
+        ):
+            yield page
+
+    def deadline(self, seconds: float) -> Deadline:
+        """Returns a deadline of requests of a session made within its context.
+
+        Requests, retries and bulks of requests inside the context are limited by the time
+        left and cancelled once it is over.
+
+        Args:
+            seconds: number of seconds given to the context
+
+        Returns: asynchronous context manager raising `asyncio.TimeoutError` on expiry
+        """
+        return Deadline(seconds)
+
+    def _verb(self, method: str, kwargs: AnyDict) -> Callable[[Address], Awaitable[Response]]:
+        """Returns a request of an HTTP method of the session bound to given arguments.
+
+        Args:
+            method: HTTP method name
+            kwargs: arguments of every request
+        """
+        verb: Callable[..., Awaitable[Response]] = {
+            "get": self.get,
+            "options": self.options,
+            "head": self.head,
+            "post": self.post,
+            "put": self.put,
+            "patch": self.patch,
+            "delete": self.delete,
+        }[method.lower()]
+        return functools.partial(verb, **kwargs)
+
+
+@dataclass(frozen=True)
+class SessionOptions:
+    """The class represents the way requests of an HTTP session are performed.
+
+    Args:
+        retry: a policy failed requests are retried according to
+        limiter: a rate limiter every attempt of a request waits for
+        flight: identical concurrent requests share a single request if it is given
+        timeouts: limits of request phases overridden by `timeouts` keyword argument
+            of a request
+        tracer: a tracer phases of requests are reported to
+        compression: large enough ``post``, ``put`` and ``patch`` data is compressed
+            with it if it is given
+    """
+
+    retry: RetryPolicy = RetryPolicy(attempts=1)
+    limiter: Optional[RateLimiter] = None
+    flight: Optional[SingleFlight] = None
+    timeouts: Timeouts = Timeouts()
+    tracer: Optional[Tracer] = None
+    compression: Optional[Compression] = None
+
 
 class HttpSession(Session):
-    """The class provides interfaces for current API HTTP session."""
+    """The class provides interfaces for current API HTTP session.
 
-    def __init__(self, session: requests.Session = requests.Session()) -> None:
-        self._session: requests.Session = session
+    By default requests are delivered with `requests` library session, positive number
+    of `workers` offloads them to a thread pool of that size. Pass `StreamTransport`
+    instance as a `transport` to perform non-blocking requests. JSON data is encoded
+    and decoded with a given `codec`. Retries, rate limits, timeouts, tracing and
+    compression of requests are set with `options`.
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        transport: Optional[Transport] = None,
+        workers: int = 0,
+        codec: JsonCodec = StdJsonCodec(),
+        options: SessionOptions = SessionOptions(),
+    ) -> None:
+        self._transport: Transport = transport or RequestsTransport(session, workers)
+        self._codec: JsonCodec = codec
+        self._retry: RetryPolicy = options.retry
+        self._limiter: Optional[RateLimiter] = options.limiter
+        self._flight: Optional[SingleFlight] = options.flight
+        self._timeouts: Timeouts = options.timeouts
+        self._tracer: Optional[Tracer] = options.tracer
+        self._compression: Optional[Compression] = options.compression
 
     async def __aenter__(self) -> Session:
         """See base class."""
@@ -134,57 +309,56 @@ class HttpSession(Session):
 
     async def get(self, url: Address, **kwargs: Any) -> Response:
         """See base class."""
-        return await safe_response(HttpResponse(self._session.get(await url.as_str(), **kwargs)))
+        return await self._request("GET", url, **kwargs)
 
     async def options(self, url: Address, **kwargs: Any) -> Response:
         """See base class."""
-        return await safe_response(
-            HttpResponse(self._session.options(await url.as_str(), **kwargs))
-        )
+        return await self._request("OPTIONS", url, **kwargs)
 
     async def head(self, url: Address, **kwargs: Any) -> Response:
         """See base class."""
-        return await safe_response(HttpResponse(self._session.head(await url.as_str(), **kwargs)))
+        return await self._request("HEAD", url, **kwargs)
 
     async def post(
         self,
         url: Address,
         plain: OptionalStr = None,
         as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
         **kwargs: Any,
     ) -> Response:
         """See base class."""
-        return await safe_response(
-            HttpResponse(self._session.post(str(url), data=plain, json=as_dict, **kwargs))
-        )
+        return await self._request("POST", url, **self._payload(plain, as_dict, upload, kwargs))
 
     async def put(
         self,
         url: Address,
         plain: OptionalStr = None,
         as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
         **kwargs: Any,
     ) -> Response:
         """See base class."""
-        return await safe_response(
-            HttpResponse(self._session.put(str(url), data=plain, json=as_dict, **kwargs))
-        )
+        return await self._request("PUT", url, **self._payload(plain, as_dict, upload, kwargs))
 
     async def patch(
         self,
         url: Address,
         plain: OptionalStr = None,
         as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
         **kwargs: Any,
     ) -> Response:
         """See base class."""
-        return await safe_response(
-            HttpResponse(self._session.patch(str(url), data=plain, json=as_dict, **kwargs))
-        )
+        return await self._request("PATCH", url, **self._payload(plain, as_dict, upload, kwargs))
 
     async def delete(self, url: Address, **kwargs: Any) -> Response:
         """See base class."""
-        return await safe_response(HttpResponse(self._session.delete(str(url), **kwargs)))
+        return await self._request("DELETE", url, **kwargs)
+
+    async def pool_stats(self) -> Dict[str, PoolStats]:
+        """Returns open, idle and in use connections per origin."""
+        return await self._transport.pool_stats()
 
     async def __aexit__(
         self,
@@ -193,7 +367,127 @@ class HttpSession(Session):
         traceback: Optional[TracebackType],
     ) -> None:
         """See base class."""
-        self._session.close()
+        await self._transport.close()
+
+    async def _request(
+        self, method: str, url: Address, timeouts: Optional[Timeouts] = None, **kwargs: Any
+    ) -> Response:
+        """Performs an HTTP request with a transport of the session.
+
+        Args:
+            method: HTTP method name
+            url: an address of a request
+            timeouts: phases limits overriding ones of the session
+            kwargs: arguments of a transport request
+        """
+        target: str = url.url
+        host: str = urlsplit(target).netloc
+        phases: Timeouts = self._timeouts.merged(timeouts)
+        data: Any = kwargs.get("data")
+        request: Callable[[], Awaitable[Response]] = functools.partial(
+            self._retry.call,
+            method,
+            functools.partial(self._send, method, target, host, phases, kwargs),
+            data if isinstance(data, Upload) else None,
+        )
+        if self._tracer is None:
+            return await self._perform(method, target, phases, kwargs, request)
+        with Trace(self._tracer, method, target, host) as trace:
+            trace.emit(REQUEST_START)
+            try:
+                return await self._perform(method, target, phases, kwargs, request)
+            except Exception as error:
+                trace.emit(EXCEPTION, error=error)
+                raise
+
+    async def _perform(
+        self,
+        method: str,
+        url: str,
+        timeouts: Timeouts,
+        kwargs: AnyDict,
+        request: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        """Performs a request within a total deadline, sharing it with identical requests.
+
+        Args:
+            method: HTTP method name
+            url: a url of a request
+            timeouts: phases limits of a request
+            kwargs: arguments of a request
+            request: a request with retries
+        """
+        async with Deadline(timeouts.total):
+            if self._flight is not None:
+                return await self._flight.call(method, url, kwargs, request)
+            return await request()
+
+    async def _send(
+        self, method: str, url: str, host: str, timeouts: Timeouts, kwargs: AnyDict
+    ) -> Response:
+        """Performs a single attempt of a request and returns its safe response.
+
+        Args:
+            method: HTTP method name
+            url: a url of a request
+            host: a host of a request
+            timeouts: phases limits of a request
+            kwargs: arguments of a transport request
+        """
+        if self._limiter is not None:
+            await self._limiter.acquire(host)
+        other: AnyDict = dict(kwargs)
+        options: RequestOptions = RequestOptions(
+            self._codec,
+            timeouts.within(remaining()),
+            other.pop("headers", None),
+            other.pop("data", None),
+            other.pop("stream", False),
+        )
+        return await safe_response(await self._transport.request(method, url, options, **other))
+
+    def _payload(
+        self,
+        plain: OptionalStr,
+        as_dict: OptionalAnyDict,
+        upload: Optional[Uploadable],
+        kwargs: AnyDict,
+    ) -> AnyDict:
+        """Returns transport request arguments carrying given data.
+
+        A dictionary is encoded with a codec of the session.
+
+        Args:
+            plain: plain text data
+            as_dict: JSON data
+            upload: streamed data
+            kwargs: other request arguments
+        """
+        if upload is not None:
+            return dict(kwargs, data=uploaded(upload))
+        if plain is not None or as_dict is None:
+            return self._compressed(dict(kwargs, data=plain))
+        return self._compressed(
+            dict(
+                kwargs,
+                data=self._codec.encode(as_dict),
+                headers={"Content-Type": "application/json", **(kwargs.get("headers") or {})},
+            )
+        )
+
+    def _compressed(self, payload: AnyDict) -> AnyDict:
+        """Returns request arguments with data compressed if the session compresses it.
+
+        Args:
+            payload: request arguments carrying data
+        """
+        if self._compression is None or payload["data"] is None:
+            return payload
+        data: Union[str, bytes] = payload["data"]
+        payload["data"], payload["headers"] = self._compression.compressed(
+            data.encode("utf-8") if isinstance(data, str) else data, payload.get("headers") or {}
+        )
+        return payload
 
 
 class LoggedHttpSession(Session):
@@ -226,30 +520,33 @@ class LoggedHttpSession(Session):
         url: Address,
         plain: OptionalStr = None,
         as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
         **kwargs: Any,
     ) -> Response:
         """See base class."""
-        return await self._session.post(url, plain, as_dict, **kwargs)
+        return await self._session.post(url, plain, as_dict, upload, **kwargs)
 
     async def put(
         self,
         url: Address,
         plain: OptionalStr = None,
         as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
         **kwargs: Any,
     ) -> Response:
         """See base class."""
-        return await self._session.post(url, plain, as_dict, **kwargs)
+        return await self._session.post(url, plain, as_dict, upload, **kwargs)
 
     async def patch(
         self,
         url: Address,
         plain: OptionalStr = None,
         as_dict: OptionalAnyDict = None,
+        upload: Optional[Uploadable] = None,
         **kwargs: Any,
     ) -> Response:
         """See base class."""
-        return await self._session.patch(url, plain, as_dict, **kwargs)
+        return await self._session.patch(url, plain, as_dict, upload, **kwargs)
 
     async def delete(self, url: Address, **kwargs: Any) -> Response:
         """See base class."""
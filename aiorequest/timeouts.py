@@ -0,0 +1,129 @@
+"""The module provides API for timeouts and deadlines of HTTP requests."""
+import asyncio
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, fields, replace
+from types import TracebackType
+from typing import Optional, Type
+
+_DEADLINE: ContextVar[Optional[float]] = ContextVar("aiorequest_deadline", default=None)
+
+
+@dataclass(frozen=True)
+class Timeouts:
+    """The class represents timeouts of phases of an HTTP request in seconds.
+
+    A phase is not limited if its timeout is not set.
+
+    Args:
+        connect: opening a TCP connection, including TLS handshake unless `tls` is set
+        tls: TLS handshake
+        first_byte: waiting for a response head once a request is sent
+        read: waiting for every next piece of a response body
+        total: a whole request including retries
+    """
+
+    connect: Optional[float] = None
+    tls: Optional[float] = None
+    first_byte: Optional[float] = None
+    read: Optional[float] = None
+    total: Optional[float] = None
+
+    def merged(self, other: Optional["Timeouts"]) -> "Timeouts":
+        """Returns timeouts overridden by timeouts set in other ones.
+
+        Args:
+            other: overriding timeouts
+        """
+        if other is None:
+            return self
+        return replace(
+            self,
+            **{
+                field.name: getattr(other, field.name)
+                for field in fields(other)
+                if getattr(other, field.name) is not None
+            },
+        )
+
+    def within(self, seconds: Optional[float]) -> "Timeouts":
+        """Returns timeouts none of which exceeds given number of seconds.
+
+        Args:
+            seconds: maximum timeout, timeouts are kept as they are if it is not set
+        """
+        if seconds is None:
+            return self
+        return replace(
+            self,
+            **{
+                field.name: (
+                    seconds
+                    if getattr(self, field.name) is None
+                    else min(seconds, getattr(self, field.name))
+                )
+                for field in fields(self)
+            },
+        )
+
+
+class Deadline:
+    """The class represents a deadline of HTTP requests made within its context.
+
+    A task running into the context is cancelled once given number of `seconds` pass
+    and `asyncio.TimeoutError` is raised from the context. Nested deadlines may only
+    shorten the time left, `remaining` returns it to requests and retries made inside.
+
+    Args:
+        seconds: number of seconds given to the context, no deadline if it is not set
+    """
+
+    def __init__(self, seconds: Optional[float]) -> None:
+        self._seconds: Optional[float] = seconds
+        self._token: Optional[Token[Optional[float]]] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._expired: bool = False
+
+    async def __aenter__(self) -> "Deadline":
+        """Starts counting time of the context down."""
+        if self._seconds is None:
+            return self
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        when: float = loop.time() + self._seconds
+        current: Optional[float] = _DEADLINE.get()
+        self._token = _DEADLINE.set(when if current is None else min(current, when))
+        self._handle = loop.call_at(when, self._expire, asyncio.current_task())
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stops counting time down and turns cancellation by the deadline into a timeout."""
+        if self._handle is not None:
+            self._handle.cancel()
+        if self._token is not None:
+            _DEADLINE.reset(self._token)
+        if self._expired and exc_type is not None and issubclass(exc_type, asyncio.CancelledError):
+            raise asyncio.TimeoutError(
+                f"Deadline of {self._seconds} seconds is exceeded"
+            ) from exc_value
+
+    def _expire(self, task: Optional["asyncio.Task[None]"]) -> None:
+        """Cancels a task running into the context.
+
+        Args:
+            task: a task which entered the context
+        """
+        if task is not None:
+            self._expired = True
+            task.cancel()
+
+
+def remaining() -> Optional[float]:
+    """Returns number of seconds left till the closest deadline if any."""
+    deadline: Optional[float] = _DEADLINE.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - asyncio.get_event_loop().time())
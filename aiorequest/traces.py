@@ -0,0 +1,220 @@
+"""The module provides API for tracing phases of HTTP requests."""
+import math
+import time
+from collections import deque
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Deque, Dict, List, Optional, Tuple, Type
+from punish import AbstractStyle, abstractstyle
+
+REQUEST_START: str = "request_start"
+DNS_RESOLVED: str = "dns_resolved"
+CONNECTION_ACQUIRED: str = "connection_acquired"
+TLS_DONE: str = "tls_done"
+HEADERS_SENT: str = "headers_sent"
+FIRST_BYTE: str = "first_byte"
+BODY_COMPLETE: str = "body_complete"
+RETRY: str = "retry"
+EXCEPTION: str = "exception"
+
+_TRACE: ContextVar[Optional["Trace"]] = ContextVar("aiorequest_trace", default=None)
+
+
+@dataclass(frozen=True)
+class TraceEvent:
+    """The class represents a phase of an HTTP request reached at a moment.
+
+    Times are taken from a monotonic clock in seconds.
+
+    Args:
+        phase: a name of a phase e.g. ``first_byte``
+        method: HTTP method name of a request
+        url: url of a request
+        host: host of a request
+        started: a time a request started
+        previous: a time of a previous event of a request
+        at: a time of the event
+        attempt: number of an attempt of a request
+        reused: whether an acquired connection is reused
+        error: a failure of a request
+    """
+
+    phase: str
+    method: str
+    url: str
+    host: str
+    started: float
+    previous: float
+    at: float
+    attempt: int = 1
+    reused: Optional[bool] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def elapsed(self) -> float:
+        """Returns number of seconds passed since a request started."""
+        return self.at - self.started
+
+    @property
+    def duration(self) -> float:
+        """Returns number of seconds passed since a previous event of a request."""
+        return self.at - self.previous
+
+
+class Tracer(AbstractStyle):
+    """The class represents an abstraction of a receiver of request trace events.
+
+    Events are passed synchronously from a request, so a tracer should be cheap.
+    """
+
+    @abstractstyle
+    def record(self, event: TraceEvent) -> None:
+        """Receives a trace event.
+
+        Args:
+            event: a trace event
+        """
+        pass
+
+
+class Trace:
+    """The class represents a trace of a single HTTP request.
+
+    Within its context the trace is the current one and receives events emitted
+    by transports, connections and retries.
+
+    Args:
+        tracer: a receiver of events
+        method: HTTP method name of a request
+        url: url of a request
+        host: host of a request
+    """
+
+    def __init__(self, tracer: Tracer, method: str, url: str, host: str) -> None:
+        self._tracer: Tracer = tracer
+        self._method: str = method
+        self._url: str = url
+        self._host: str = host
+        self._started: float = time.monotonic()
+        self._previous: float = self._started
+        self._attempt: int = 1
+        self._token: Optional[Token[Optional["Trace"]]] = None
+
+    def __enter__(self) -> "Trace":
+        """Makes the trace current for phases emitted within the context."""
+        self._token = _TRACE.set(self)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Restores a trace which was current before the context."""
+        if self._token is not None:
+            _TRACE.reset(self._token)
+
+    def emit(
+        self, phase: str, reused: Optional[bool] = None, error: Optional[BaseException] = None
+    ) -> None:
+        """Passes an event of a given phase to a tracer.
+
+        Args:
+            phase: a name of a phase
+            reused: whether an acquired connection is reused
+            error: a failure of a request
+        """
+        now: float = time.monotonic()
+        self._tracer.record(
+            TraceEvent(
+                phase,
+                self._method,
+                self._url,
+                self._host,
+                self._started,
+                self._previous,
+                now,
+                self._attempt,
+                reused,
+                error,
+            )
+        )
+        self._previous = now
+        if phase == RETRY:
+            self._attempt += 1
+
+
+@dataclass(frozen=True)
+class Percentiles:
+    """The class represents latency percentiles of a phase in seconds."""
+
+    count: int
+    p50: float
+    p95: float
+    p99: float
+
+
+class LatencyStats(Tracer):
+    """The class represents an aggregator of phase durations per host.
+
+    Durations are measured from a previous event of a request, e.g. ``first_byte``
+    duration is time to first byte once headers are sent. Only the most recent
+    `samples` durations of every host and phase are kept.
+
+    Args:
+        samples: number of durations kept per host and phase
+    """
+
+    def __init__(self, samples: int = 1000) -> None:
+        self._samples: int = samples
+        self._durations: Dict[Tuple[str, str], Deque[float]] = {}
+
+    def record(self, event: TraceEvent) -> None:
+        """See base class."""
+        key: Tuple[str, str] = (event.host, event.phase)
+        if key not in self._durations:
+            self._durations[key] = deque(maxlen=self._samples)
+        self._durations[key].append(event.duration)
+
+    async def percentiles(self) -> Dict[Tuple[str, str], Percentiles]:
+        """Returns latency percentiles per host and phase."""
+        stats: Dict[Tuple[str, str], Percentiles] = {}
+        for key, durations in self._durations.items():
+            ordered: List[float] = sorted(durations)
+            stats[key] = Percentiles(
+                len(ordered),
+                _percentile(ordered, 0.5),
+                _percentile(ordered, 0.95),
+                _percentile(ordered, 0.99),
+            )
+        return stats
+
+
+def current() -> Optional[Trace]:
+    """Returns a trace of a request in progress if it is traced."""
+    return _TRACE.get()
+
+
+def emit(phase: str, reused: Optional[bool] = None, error: Optional[BaseException] = None) -> None:
+    """Passes an event of a given phase to a trace of a request in progress if any.
+
+    Args:
+        phase: a name of a phase
+        reused: whether an acquired connection is reused
+        error: a failure of a request
+    """
+    trace: Optional[Trace] = _TRACE.get()
+    if trace is not None:
+        trace.emit(phase, reused, error)
+
+
+def _percentile(ordered: List[float], rank: float) -> float:
+    """Returns a nearest rank percentile.
+
+    Args:
+        ordered: sorted values
+        rank: a percentile rank from 0 to 1
+    """
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(rank * len(ordered)) - 1))]
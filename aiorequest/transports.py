@@ -0,0 +1,658 @@
+"""The module contains a set of API for HTTP transports used by sessions."""
+import asyncio
+import functools
+import ssl
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import SplitResult, urlsplit
+import requests
+from punish import AbstractStyle, abstractstyle
+from requests.adapters import HTTPAdapter
+from aiorequest.codecs import JsonCodec, StdJsonCodec
+from aiorequest.connections import BodyReader, Headers, HttpConnection, open_streams
+from aiorequest.encodings import ACCEPT_ENCODING, decompressed
+from aiorequest.http2 import Http2Connection, Http2Stream, RefusedStream, h2
+from aiorequest.pools import ConnectionPool, Origin, PoolStats
+from aiorequest.resolvers import CachingResolver, Resolver
+from aiorequest.responses import Body, HttpResponse, Response, SlimResponse, StreamResponse
+from aiorequest.retries import IDEMPOTENT_METHODS
+from aiorequest.timeouts import Timeouts
+from aiorequest.traces import (
+    BODY_COMPLETE,
+    CONNECTION_ACQUIRED,
+    FIRST_BYTE,
+    HEADERS_SENT,
+    Trace,
+    current,
+    emit,
+)
+from aiorequest.uploads import Upload
+
+_DEFAULT_PORTS: Dict[str, int] = {"http": 80, "https": 443}
+_BODY_METHODS: Tuple[str, ...] = ("POST", "PUT", "PATCH")
+_CHUNK_SIZE: int = 65536
+
+
+@dataclass(frozen=True)
+class RequestOptions:
+    """The class represents options of a single request delivered by a transport.
+
+    Args:
+        codec: JSON codec of a response
+        timeouts: timeouts of request phases, `total` one is left to a caller
+        headers: HTTP headers of a request
+        data: data of a request
+        stream: whether response data is received only while it is being iterated
+    """
+
+    codec: JsonCodec = StdJsonCodec()
+    timeouts: Timeouts = Timeouts()
+    headers: Optional[Dict[str, str]] = None
+    data: Union[str, bytes, Upload, None] = None
+    stream: bool = False
+
+
+@dataclass(frozen=True)
+class _Request:
+    """The class represents a request ready to be sent to an origin.
+
+    Args:
+        origin: scheme, host and port of a request
+        method: HTTP method name
+        target: request target (path with a query)
+        head: request headers
+        body: request body
+    """
+
+    origin: Origin
+    method: str
+    target: str
+    head: Dict[str, str]
+    body: Union[bytes, Upload]
+
+
+class Transport(AbstractStyle):
+    """The class represents an abstraction of a way HTTP requests are delivered."""
+
+    @abstractstyle
+    async def request(
+        self, method: str, url: str, options: RequestOptions = RequestOptions(), **kwargs: Any
+    ) -> Response:
+        """Performs HTTP request and returns its response.
+
+        Args:
+            method: HTTP method name
+            url: full URL of a request
+            options: options of a request
+            kwargs: other keyword arguments supported by a transport
+        """
+        pass
+
+    @abstractstyle
+    async def pool_stats(self) -> Dict[str, PoolStats]:
+        """Returns connections statistics per origin."""
+        pass
+
+    @abstractstyle
+    async def close(self) -> None:
+        """Releases all resources held by a transport."""
+        pass
+
+
+class RequestsTransport(Transport):
+    """The class represents a transport backed by `requests` library session.
+
+    With no `workers` every request blocks the event loop for its whole round trip.
+    Otherwise requests are offloaded to a thread pool of `workers` size, the same number
+    of connections is kept per host by `requests` adapters and at most `workers`
+    requests are in flight at once. A new `requests` session is used unless a `session`
+    is given.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, workers: int = 0) -> None:
+        self._session: requests.Session = requests.Session() if session is None else session
+        self._workers: int = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        if workers > 0:
+            adapter: HTTPAdapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+            self._executor = ThreadPoolExecutor(workers, thread_name_prefix="aiorequest")
+
+    async def request(
+        self, method: str, url: str, options: RequestOptions = RequestOptions(), **kwargs: Any
+    ) -> Response:
+        """See base class.
+
+        Other keyword arguments are passed to `requests`. Connect and read timeouts are passed
+        to `requests` unless `timeout` argument is given, TLS handshake falls into connect
+        timeout and first byte into read one. Streamed uploads are not supported.
+        """
+        if isinstance(options.data, Upload):
+            raise TypeError("Streamed uploads are sent with StreamTransport or Http2Transport")
+        kwargs.update(headers=options.headers, data=options.data, stream=options.stream)
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = _requests_timeout(options.timeouts)
+        if self._executor is None:
+            response: requests.Response = self._session.request(method, url, **kwargs)
+            emit(BODY_COMPLETE)
+            return HttpResponse(response, codec=options.codec)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._workers)
+        async with self._semaphore:
+            response = await asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(self._session.request, method, url, **kwargs)
+            )
+        emit(BODY_COMPLETE)
+        return HttpResponse(response, self._executor, options.codec)
+
+    async def pool_stats(self) -> Dict[str, PoolStats]:
+        """See base class.
+
+        `requests` does not expose state of its connection pools, so nothing is reported.
+        """
+        return {}
+
+    async def close(self) -> None:
+        """See base class."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._session.close()
+
+
+class StreamTransport(Transport):
+    """The class represents non-blocking HTTP/1.1 transport built on asyncio streams.
+
+    Connections are kept alive in a pool and reused for subsequent requests to the same origin.
+    Fully received responses are compact `SlimResponse` objects if `slim` is set. Compressed
+    responses are negotiated and decompressed as they are read unless `decompress` is unset.
+
+    Args:
+        pool: a pool of connections
+        slim: whether fully received responses keep only raw head and data
+        decompress: whether responses are asked to be compressed and decompressed on receipt
+    """
+
+    def __init__(
+        self, pool: Optional[ConnectionPool] = None, slim: bool = False, decompress: bool = True
+    ) -> None:
+        self._pool: ConnectionPool = pool or ConnectionPool()
+        self._slim: bool = slim
+        self._decompress: bool = decompress
+
+    async def request(
+        self, method: str, url: str, options: RequestOptions = RequestOptions(), **kwargs: Any
+    ) -> Response:
+        """See base class.
+
+        No other keyword arguments are supported.
+        """
+        if kwargs:
+            raise TypeError(f"Unsupported request arguments: {', '.join(kwargs)}")
+        request: _Request = _prepared(method, urlsplit(url), options, self._decompress)
+        connection, code, headers, reader = await self._exchange(request, options.timeouts)
+        return await _respond(
+            code,
+            headers,
+            _PooledBody(reader, self._pool, request.origin, connection, options.timeouts.read),
+            options,
+            self._decompress,
+            connection.head if self._slim else None,
+        )
+
+    async def pool_stats(self) -> Dict[str, PoolStats]:
+        """See base class."""
+        return await self._pool.stats()
+
+    async def close(self) -> None:
+        """See base class."""
+        await self._pool.close()
+
+    async def _exchange(
+        self, request: _Request, timeouts: Timeouts
+    ) -> Tuple[HttpConnection, int, Headers, BodyReader]:
+        """Sends a request over a pooled connection and returns its connection and response head.
+
+        A request failed over a reused connection is sent over a new one if it is safe to
+        replay.
+
+        Args:
+            request: a request to send
+            timeouts: phases limits of a request
+        """
+        for reuse in (True, False):
+            connection, fresh = await self._pool.acquire(request.origin, reuse, timeouts)
+            emit(CONNECTION_ACQUIRED, reused=not fresh)
+            written: bool = False
+            try:
+                await connection.send(request.method, request.target, request.head, request.body)
+                written = True
+                emit(HEADERS_SENT)
+                code, headers, reader = await asyncio.wait_for(
+                    connection.receive(request.method), timeouts.first_byte
+                )
+                emit(FIRST_BYTE)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection.close()
+                await self._pool.release(request.origin, connection)
+                if fresh or not _replayable(request, written):
+                    raise
+                continue
+            except BaseException:
+                connection.close()
+                await self._pool.release(request.origin, connection)
+                raise
+            return connection, code, headers, reader
+        raise ConnectionError(f"Unable to deliver request to '{_authority(request.origin)}'")
+
+
+class Http2Transport(Transport):
+    """The class represents non-blocking HTTP/2 transport built on asyncio streams.
+
+    Concurrent requests to the same origin are multiplexed over a single connection.
+    HTTP/2 is negotiated with ALPN for ``https`` origins, origins which do not select it
+    are served with a `fallback` HTTP/1.1 transport. ``http`` origins are spoken to with
+    HTTP/2 prior knowledge (h2c) unless `h2c` is unset.
+
+    Args:
+        ssl_context: TLS context of ``https`` origins, it is used as it is, so HTTP/2 is
+            negotiated only if its ALPN protocols are set to ``h2`` and ``http/1.1``
+        fallback: transport of origins which do not speak HTTP/2
+        h2c: whether HTTP/2 is used for ``http`` origins
+        resolver: a resolver of hosts shared with a default fallback, resolutions are
+            cached if it is not given
+        decompress: whether responses are asked to be compressed and decompressed on receipt
+    """
+
+    def __init__(
+        self,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        fallback: Optional[Transport] = None,
+        h2c: bool = True,
+        resolver: Optional[Resolver] = None,
+        decompress: bool = True,
+    ) -> None:
+        if h2 is None:
+            raise ImportError("'h2' package is required to use Http2Transport")
+        self._ssl_context: ssl.SSLContext = ssl_context or _alpn_context()
+        self._resolver: Resolver = resolver or CachingResolver()
+        self._decompress: bool = decompress
+        self._fallback: Transport = fallback or StreamTransport(
+            ConnectionPool(resolver=self._resolver), decompress=decompress
+        )
+        self._h2c: bool = h2c
+        self._connections: Dict[Origin, Http2Connection] = {}
+        self._opening: Dict[Origin, "asyncio.Future[Optional[Http2Connection]]"] = {}
+        self._http1: Set[Origin] = set()
+        self._retired: Dict[Http2Connection, "asyncio.Future[None]"] = {}
+
+    async def request(
+        self, method: str, url: str, options: RequestOptions = RequestOptions(), **kwargs: Any
+    ) -> Response:
+        """See base class.
+
+        Other keyword arguments are supported only by requests served with a fallback.
+        """
+        parts: SplitResult = urlsplit(url)
+        origin: Origin = _origin(parts)
+        if origin in self._http1 or (origin[0] == "http" and not self._h2c):
+            return await self._fallback.request(method, url, options, **kwargs)
+        if kwargs:
+            raise TypeError(f"Unsupported request arguments: {', '.join(kwargs)}")
+        content: Optional[Http2Stream] = await self._stream(
+            _prepared(method, parts, options, self._decompress), options.timeouts
+        )
+        if content is None:
+            return await self.request(method, url, options)
+        emit(HEADERS_SENT)
+        try:
+            code, headers = await asyncio.wait_for(content.receive(), options.timeouts.first_byte)
+        except BaseException:
+            await content.close()
+            raise
+        emit(FIRST_BYTE)
+        return await _respond(code, headers, content, options, self._decompress)
+
+    async def pool_stats(self) -> Dict[str, PoolStats]:
+        """See base class."""
+        stats: Dict[str, PoolStats] = await self._fallback.pool_stats()
+        for (scheme, host, port), connection in self._connections.items():
+            stats[f"{scheme}://{host}:{port}"] = PoolStats(
+                opened=1, idle=0 if connection.streams else 1, in_use=connection.streams
+            )
+        return stats
+
+    async def close(self) -> None:
+        """See base class."""
+        for opening in list(self._opening.values()):
+            opening.cancel()
+        for retiring in list(self._retired.values()):
+            retiring.cancel()
+        for connection in list(self._retired) + list(self._connections.values()):
+            await connection.close()
+        self._connections.clear()
+        self._retired.clear()
+        await self._fallback.close()
+
+    async def _stream(self, request: _Request, timeouts: Timeouts) -> Optional[Http2Stream]:
+        """Sends a request on a new stream of a connection to an origin and returns the stream.
+
+        A request failed over a reused connection is sent over a new one if it is safe to
+        replay. `None` is returned if an origin turns out not to speak HTTP/2.
+
+        Args:
+            request: a request to send
+            timeouts: phases limits of a request
+        """
+        for reuse in (True, False):
+            existing: Optional[Http2Connection] = self._connections.get(request.origin)
+            connection: Optional[Http2Connection] = await self._connection(
+                request.origin, timeouts, reuse
+            )
+            if connection is None:
+                return None
+            emit(CONNECTION_ACQUIRED, reused=connection is existing)
+            try:
+                return await connection.open_stream(
+                    request.method, request.target, request.head, request.body, timeouts.read
+                )
+            except ConnectionError as error:
+                if not reuse or not _replayable(request, not isinstance(error, RefusedStream)):
+                    raise
+        raise ConnectionError(f"Unable to deliver request to '{_authority(request.origin)}'")
+
+    async def _connection(
+        self, origin: Origin, timeouts: Timeouts, reuse: bool
+    ) -> Optional[Http2Connection]:
+        """Returns a connection to an origin or `None` if it does not speak HTTP/2.
+
+        Concurrent requests share a single connection being opened.
+
+        Args:
+            origin: scheme, host and port of a connection
+            timeouts: phases limits of opening a connection
+            reuse: whether an existing usable connection is returned
+        """
+        connection: Optional[Http2Connection] = self._connections.get(origin)
+        if connection is not None and connection.usable and reuse:
+            return connection
+        if origin not in self._opening:
+            opening: "asyncio.Future[Optional[Http2Connection]]" = asyncio.ensure_future(
+                self._open(origin, timeouts)
+            )
+            self._opening[origin] = opening
+            opening.add_done_callback(lambda _: self._opening.pop(origin, None))
+        return await asyncio.shield(self._opening[origin])
+
+    async def _open(self, origin: Origin, timeouts: Timeouts) -> Optional[Http2Connection]:
+        """Opens a connection to an origin or returns `None` if ALPN does not select HTTP/2.
+
+        Args:
+            origin: scheme, host and port of a connection
+            timeouts: phases limits of opening a connection
+        """
+        scheme, host, port = origin
+        reader, writer = await open_streams(
+            host,
+            port,
+            self._ssl_context if scheme == "https" else None,
+            timeouts.connect,
+            timeouts.tls,
+            self._resolver,
+        )
+        tls: Optional[ssl.SSLObject] = writer.get_extra_info("ssl_object")
+        if tls is not None and tls.selected_alpn_protocol() != "h2":
+            writer.close()
+            self._http1.add(origin)
+            return None
+        if origin in self._connections:
+            retired: Http2Connection = self._connections[origin]
+            self._retired[retired] = asyncio.ensure_future(self._retire(retired))
+        self._connections[origin] = Http2Connection(reader, writer, _authority(origin), scheme)
+        return self._connections[origin]
+
+    async def _retire(self, connection: Http2Connection) -> None:
+        """Closes a replaced connection once its last stream ends and forgets it.
+
+        Args:
+            connection: a replaced connection
+        """
+        try:
+            await connection.finished()
+            await connection.close()
+        finally:
+            self._retired.pop(connection, None)
+
+
+class _PooledBody(Body):
+    """The class represents response data received over a pooled connection.
+
+    The connection is returned into the pool as soon as data is read to the end. Every
+    piece of data is awaited for at most `idle` seconds if it is given.
+    """
+
+    def __init__(
+        self,
+        reader: BodyReader,
+        pool: ConnectionPool,
+        origin: Origin,
+        connection: HttpConnection,
+        idle: Optional[float] = None,
+    ) -> None:
+        self._reader: BodyReader = reader
+        self._pool: ConnectionPool = pool
+        self._origin: Origin = origin
+        self._connection: Optional[HttpConnection] = connection
+        self._idle: Optional[float] = idle
+
+    async def read(self, size: int = _CHUNK_SIZE) -> bytes:
+        """See base class."""
+        try:
+            data: bytes = await asyncio.wait_for(self._reader.read(size), self._idle)
+        except BaseException:
+            await self.close()
+            raise
+        if self._reader.done:
+            await self._release()
+        return data
+
+    async def read_all(self) -> bytes:
+        """See base class."""
+        try:
+            data: bytes = await self._read_all()
+        except BaseException:
+            await self.close()
+            raise
+        await self._release()
+        return data
+
+    async def close(self) -> None:
+        """See base class."""
+        if self._connection is not None and not self._reader.done:
+            self._connection.close()
+        await self._release()
+
+    async def _read_all(self) -> bytes:
+        """Returns the rest of data, every piece is awaited at most for idle timeout if any."""
+        if self._idle is None:
+            return await self._reader.read_all()
+        pieces: List[bytes] = []
+        piece: bytes = await asyncio.wait_for(self._reader.read(), self._idle)
+        while piece:
+            pieces.append(piece)
+            piece = await asyncio.wait_for(self._reader.read(), self._idle)
+        return b"".join(pieces)
+
+    async def _release(self) -> None:
+        """Returns a connection to a pool once, a closed connection is dropped by a pool."""
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            await self._pool.release(self._origin, connection)
+
+
+class _TracedBody(Body):
+    """The class represents response data which end is reported to a request trace."""
+
+    def __init__(self, body: Body, trace: Trace) -> None:
+        self._body: Body = body
+        self._trace: Optional[Trace] = trace
+
+    async def read(self, size: int = _CHUNK_SIZE) -> bytes:
+        """See base class."""
+        data: bytes = await self._body.read(size)
+        if not data and self._trace is not None:
+            trace, self._trace = self._trace, None
+            trace.emit(BODY_COMPLETE)
+        return data
+
+    async def close(self) -> None:
+        """See base class."""
+        await self._body.close()
+
+
+async def _respond(
+    code: int,
+    headers: Headers,
+    content: Body,
+    options: RequestOptions,
+    decompress: bool,
+    head: Optional[bytes] = None,
+) -> Response:
+    """Returns a response which data is either read at once or streamed.
+
+    Args:
+        code: HTTP status code of a response
+        headers: HTTP headers of a response
+        content: data of a response
+        options: options of a request, data is streamed and decoded as they say
+        decompress: whether compressed data is decompressed
+        head: raw header lines of a response, data read at once is kept in a compact
+            response if they are given
+    """
+    if decompress:
+        content = decompressed(content, headers)
+    if options.stream:
+        trace: Optional[Trace] = current()
+        return StreamResponse(
+            code,
+            headers,
+            stream=content if trace is None else _TracedBody(content, trace),
+            codec=options.codec,
+        )
+    data: bytes = await content.read_all()
+    emit(BODY_COMPLETE)
+    if head is not None:
+        return SlimResponse(code, head, data, options.codec)
+    return StreamResponse(code, headers, data, codec=options.codec)
+
+
+def _prepared(
+    method: str, parts: SplitResult, options: RequestOptions, compressed: bool
+) -> _Request:
+    """Returns a request ready to be sent to an origin of a URL.
+
+    Args:
+        method: HTTP method name
+        parts: split URL of a request
+        options: options of a request
+        compressed: whether compressed response data is accepted
+    """
+    origin: Origin = _origin(parts)
+    data: Union[str, bytes, Upload, None] = options.data
+    body: Union[bytes, Upload] = data.encode("utf-8") if isinstance(data, str) else data or b""
+    head: Dict[str, str] = _head(origin, method, body, compressed)
+    head.update(options.headers or {})
+    target: str = f"{parts.path or '/'}{'?' + parts.query if parts.query else ''}"
+    return _Request(origin, method, target, head, body)
+
+
+def _replayable(request: _Request, written: bool) -> bool:
+    """Returns `True` if a request failed over a reused connection may be sent once more.
+
+    A request which is not written yet or which method is idempotent is replayed, other
+    ones might have been processed by a server already. A request which data cannot be
+    sent once more is never replayed.
+
+    Args:
+        request: a failed request
+        written: whether a request is written into a connection
+    """
+    if isinstance(request.body, Upload) and not request.body.replayable():
+        return False
+    return not written or request.method in IDEMPOTENT_METHODS
+
+
+def _origin(parts: SplitResult) -> Origin:
+    """Returns scheme, host and port of a URL.
+
+    Args:
+        parts: split URL
+    """
+    if parts.scheme not in _DEFAULT_PORTS or not parts.hostname:
+        raise ValueError(f"Unsupported URL '{parts.geturl()}'")
+    return parts.scheme, parts.hostname, parts.port or _DEFAULT_PORTS[parts.scheme]
+
+
+def _alpn_context() -> ssl.SSLContext:
+    """Returns a default TLS context offering HTTP/2 and HTTP/1.1 with ALPN."""
+    context: ssl.SSLContext = ssl.create_default_context()
+    context.set_alpn_protocols(["h2", "http/1.1"])
+    return context
+
+
+def _authority(origin: Origin) -> str:
+    """Returns host of an origin with its port unless it is a default one.
+
+    Args:
+        origin: scheme, host and port of a URL
+    """
+    scheme, host, port = origin
+    return host if port == _DEFAULT_PORTS[scheme] else f"{host}:{port}"
+
+
+def _head(
+    origin: Origin, method: str, body: Union[bytes, Upload], compressed: bool
+) -> Dict[str, str]:
+    """Returns default request headers.
+
+    Args:
+        origin: scheme, host and port of a URL
+        method: HTTP method name
+        body: request body
+        compressed: whether compressed response data is accepted
+    """
+    head: Dict[str, str] = {
+        "Host": _authority(origin),
+        "User-Agent": "aiorequest",
+        "Accept": "*/*",
+        "Accept-Encoding": ACCEPT_ENCODING if compressed else "identity",
+        "Connection": "keep-alive",
+    }
+    if isinstance(body, Upload):
+        if body.content_type() is not None:
+            head["Content-Type"] = str(body.content_type())
+        size: Optional[int] = body.size()
+        if size is None:
+            head["Transfer-Encoding"] = "chunked"
+        else:
+            head["Content-Length"] = str(size)
+    elif body or method in _BODY_METHODS:
+        head["Content-Length"] = str(len(body))
+    return head
+
+
+def _requests_timeout(timeouts: Timeouts) -> Tuple[Optional[float], Optional[float]]:
+    """Returns connect and read timeouts of `requests` library.
+
+    Args:
+        timeouts: timeouts of request phases
+    """
+    connect: Optional[float] = timeouts.connect
+    if connect is not None and timeouts.tls is not None:
+        connect += timeouts.tls
+    reads: List[float] = [
+        timeout for timeout in (timeouts.first_byte, timeouts.read) if timeout is not None
+    ]
+    return connect, max(reads) if reads else None
@@ -0,0 +1,200 @@
+"""The module provides API for request data streamed from files and asynchronous sources."""
+import asyncio
+import io
+import os
+from typing import IO, AsyncIterable, AsyncIterator, Optional, Union
+from punish import AbstractStyle, abstractstyle
+
+_CHUNK_SIZE: int = 262144
+
+Uploadable = Union["Upload", bytes, str, "os.PathLike[str]", IO[bytes], AsyncIterable[bytes]]
+
+
+class Upload(AbstractStyle):
+    """The class represents an abstraction of request data sent without holding it in memory."""
+
+    @abstractstyle
+    def size(self) -> Optional[int]:
+        """Returns number of bytes of data if it is known in advance.
+
+        Data of unknown size is sent with ``chunked`` transfer encoding.
+        """
+        pass
+
+    @abstractstyle
+    def chunks(self) -> AsyncIterator[bytes]:
+        """Returns asynchronous iterator over pieces of data."""
+        pass
+
+    def content_type(self) -> Optional[str]:
+        """Returns media type of data if it is defined by data itself."""
+        return None
+
+    def replayable(self) -> bool:
+        """Returns `True` if data may be sent once more otherwise `False`.
+
+        Requests which data is not replayable are neither resent over a new connection
+        nor retried.
+        """
+        return True
+
+    async def write(self, writer: asyncio.StreamWriter) -> None:
+        """Writes data of known size into a connection.
+
+        Args:
+            writer: a writer of a connection
+        """
+        async for chunk in self.chunks():
+            writer.write(chunk)
+            await writer.drain()
+
+
+class BytesUpload(Upload):
+    """The class represents request data already held in memory.
+
+    Args:
+        data: request data
+    """
+
+    def __init__(self, data: bytes) -> None:
+        self._data: bytes = data
+
+    def size(self) -> Optional[int]:
+        """See base class."""
+        return len(self._data)
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """See base class."""
+        if self._data:
+            yield self._data
+
+
+class IterableUpload(Upload):
+    """The class represents request data produced by an asynchronous iterable of bytes.
+
+    The iterable is consumed once, so such a request cannot be retried.
+
+    Args:
+        source: pieces of data
+        size: number of bytes of data if it is known
+    """
+
+    def __init__(self, source: AsyncIterable[bytes], size: Optional[int] = None) -> None:
+        self._source: AsyncIterable[bytes] = source
+        self._size: Optional[int] = size
+        self._consumed: bool = False
+
+    def size(self) -> Optional[int]:
+        """See base class."""
+        return self._size
+
+    def replayable(self) -> bool:
+        """See base class."""
+        return not self._consumed
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """See base class."""
+        if self._consumed:
+            raise RuntimeError("Upload data source is already consumed")
+        self._consumed = True
+        async for chunk in self._source:
+            if chunk:
+                yield bytes(chunk)
+
+
+class FileUpload(Upload):
+    """The class represents request data read from a file.
+
+    A file given by a path is opened for every sending, so a request may be retried.
+    Data is sent to plain connections with ``sendfile`` where the platform supports it,
+    other connections receive pieces read in a thread pool.
+
+    Args:
+        file: a path or a file object opened in binary mode
+        offset: a position data starts at, the current position of a file object by default
+        size: number of bytes to send, the rest of a file by default
+    """
+
+    def __init__(
+        self,
+        file: Union[str, "os.PathLike[str]", IO[bytes]],
+        offset: Optional[int] = None,
+        size: Optional[int] = None,
+    ) -> None:
+        self._file: Union[str, "os.PathLike[str]", IO[bytes]] = file
+        if isinstance(file, (str, os.PathLike)):
+            self._offset: int = offset or 0
+            total: int = os.stat(file).st_size
+        else:
+            self._offset = file.tell() if offset is None else offset
+            total = file.seek(0, io.SEEK_END)
+        self._size: int = max(0, total - self._offset) if size is None else size
+
+    def size(self) -> Optional[int]:
+        """See base class."""
+        return self._size
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """See base class."""
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        file: IO[bytes] = self._open()
+        try:
+            file.seek(self._offset)
+            left: int = self._size
+            while left > 0:
+                chunk: bytes = await loop.run_in_executor(None, file.read, min(_CHUNK_SIZE, left))
+                if not chunk:
+                    raise EOFError(f"File ends {left} bytes before expected size")
+                left -= len(chunk)
+                yield chunk
+        finally:
+            self._close(file)
+
+    async def write(self, writer: asyncio.StreamWriter) -> None:
+        """See base class."""
+        file: IO[bytes] = self._open()
+        try:
+            try:
+                file.fileno()
+            except (AttributeError, io.UnsupportedOperation):
+                await super().write(writer)
+                return
+            await writer.drain()
+            await asyncio.get_event_loop().sendfile(
+                writer.transport, file, self._offset, self._size
+            )
+        finally:
+            self._close(file)
+
+    def _open(self) -> IO[bytes]:
+        """Returns a file to read data from, a path is opened anew."""
+        if isinstance(self._file, (str, os.PathLike)):
+            return open(self._file, "rb")
+        return self._file
+
+    def _close(self, file: IO[bytes]) -> None:
+        """Closes a file opened by the upload, a given file object is left open.
+
+        Args:
+            file: a file data is read from
+        """
+        if file is not self._file:
+            file.close()
+
+
+def uploaded(source: Uploadable) -> Upload:
+    """Returns request data of a given source.
+
+    Args:
+        source: an upload, bytes, a file path, a binary file object or an asynchronous
+            iterable of bytes
+    """
+    if isinstance(source, Upload):
+        return source
+    if isinstance(source, bytes):
+        return BytesUpload(source)
+    if isinstance(source, (str, os.PathLike)) or hasattr(source, "read"):
+        return FileUpload(source)  # type: ignore
+    if hasattr(source, "__aiter__"):
+        return IterableUpload(source)
+    raise TypeError(f"Unsupported upload source '{type(source).__name__}'")
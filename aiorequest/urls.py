@@ -1,10 +1,34 @@
 """The module provides API for Unified Resource Locator (URL) endpoints."""
+from string import Formatter
+from typing import Any, List, Mapping, Optional, Sequence, Tuple, Union
+from urllib.parse import quote, urlencode
 from punish import AbstractStyle, abstractstyle
 
+QueryValue = Union[str, bytes, int, float, Sequence[Union[str, bytes, int, float]]]
+Query = Union[Mapping[str, QueryValue], Sequence[Tuple[str, QueryValue]]]
+
 
 class Address(AbstractStyle):
     """The class represents an interface of an address."""
 
+    @property
+    @abstractstyle
+    def url(self) -> str:
+        """Returns address as a string without awaiting."""
+        pass
+
+    @property
+    @abstractstyle
+    def hostname(self) -> str:
+        """Returns a domain name (host) without awaiting."""
+        pass
+
+    @property
+    @abstractstyle
+    def path(self) -> str:
+        """Returns a path of the URL without awaiting."""
+        pass
+
     @abstractstyle
     async def matcher(self) -> str:
         """Returns a path of the URL."""
@@ -22,12 +46,51 @@ class Address(AbstractStyle):
 
 
 class Url(Address):
-    """The class represents regular WEB URL item."""
+    """The class represents regular WEB URL item.
+
+    The address string is built once. Query parameters are percent-encoded and appended to
+    it, a sequence value is sent as a repeated parameter.
+    """
+
+    def __init__(
+        self, host: str, protocol: str, path: str = "", query: Optional[Query] = None
+    ) -> None:
+        self._host: str = host
+        self._path: str = path
+        self._protocol: str = protocol
+        self._url: str = _joined(host, protocol, path, _encoded(query))
+
+    @classmethod
+    def built(cls, host: str, protocol: str, path: str, url: str) -> "Url":
+        """Returns a url of an already built address string without building it again.
+
+        Args:
+            host: a domain name (host)
+            protocol: a protocol of a url
+            path: a path of a url
+            url: an address string
+        """
+        built: Url = cls.__new__(cls)
+        built._host = host
+        built._protocol = protocol
+        built._path = path
+        built._url = url
+        return built
+
+    @property
+    def url(self) -> str:
+        """See base class."""
+        return self._url
+
+    @property
+    def hostname(self) -> str:
+        """See base class."""
+        return self._host
 
-    def __init__(self, host: str, protocol: str, path: str = "") -> None:
-        self._host = host
-        self._path = path
-        self._protocol = protocol
+    @property
+    def path(self) -> str:
+        """See base class."""
+        return self._path
 
     async def matcher(self) -> str:
         """See base class."""
@@ -39,47 +102,128 @@ class Url(Address):
 
     async def as_str(self) -> str:
         """See base class."""
-        if self._host.startswith(self._protocol):
-            return self._host
-        return (
-            f"{self._protocol}://{self._host}"
-            f"/{self._path if not self._path.startswith('/') else self._path[1:]}"
-        )
+        return self._url
 
 
-class HttpUrl(Address):
+class HttpUrl(Url):
     """The class represents HTTP WEB URL item."""
 
-    def __init__(self, host: str, path: str = "") -> None:
-        self._http: Url = Url(host, protocol="http", path=path)
+    def __init__(self, host: str, path: str = "", query: Optional[Query] = None) -> None:
+        super().__init__(host, "http", path, query)
 
-    async def matcher(self) -> str:
-        """See base class."""
-        return await self._http.matcher()
 
-    async def host(self) -> str:
-        """See base class."""
-        return await self._http.host()
+class HttpsUrl(Url):
+    """The class represents HTTPS WEB URL item."""
 
-    async def as_str(self) -> str:
-        """See base class."""
-        return await self._http.as_str()
+    def __init__(self, host: str, path: str = "", query: Optional[Query] = None) -> None:
+        super().__init__(host, "https", path, query)
 
 
-class HttpsUrl(Address):
-    """The class represents HTTPS WEB URL item."""
+class UrlTemplate:
+    """The class represents a url which path contains ``{name}`` placeholders.
 
-    def __init__(self, host: str, path: str = "") -> None:
-        self._https: Url = Url(host, protocol="https", path=path)
+    A template is parsed once, binding values only joins percent-encoded values with
+    constant pieces of a path, e.g. ``/users/{id}`` bound with ``id=7`` gives ``/users/7``.
+    A host which already starts with a protocol is taken as a base of urls.
 
-    async def matcher(self) -> str:
-        """See base class."""
-        return await self._https.matcher()
+    Args:
+        host: a domain name (host) or a base url
+        path: a path with placeholders
+        protocol: a protocol of urls
+        query: query parameters of every url
+    """
 
-    async def host(self) -> str:
-        """See base class."""
-        return await self._https.host()
+    def __init__(
+        self, host: str, path: str, protocol: str = "https", query: Optional[Query] = None
+    ) -> None:
+        self._host: str = host
+        self._protocol: str = protocol
+        self._prefix: str = (
+            host.rstrip("/") if host.startswith(f"{protocol}://") else f"{protocol}://{host}"
+        )
+        self._query: str = _encoded(query)
+        pieces: List[str] = []
+        fields: List[str] = []
+        for literal, field, spec, conversion in Formatter().parse(
+            path if path.startswith("/") else f"/{path}"
+        ):
+            if field is not None and (not field or spec or conversion):
+                raise ValueError(f"Url template '{path}' expects plain named placeholders")
+            pieces.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is not None:
+                pieces.append("{}")
+                fields.append(field)
+        self._pattern: str = "".join(pieces)
+        self._fields: Tuple[str, ...] = tuple(fields)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """Returns names of placeholders of a path."""
+        return self._fields
+
+    def bind(self, query: Optional[Query] = None, **values: Any) -> Url:
+        """Returns a url with placeholders of a path replaced with given values.
+
+        Args:
+            query: query parameters added to ones of a template
+            values: values of placeholders
+
+        Raises:
+            `KeyError` if a value of a placeholder is not given
+        """
+        path: str = self._pattern.format(*[_segment(values[field]) for field in self._fields])
+        parameters: str = self._query
+        if query:
+            parameters = f"{parameters}&{_encoded(query)}" if parameters else _encoded(query)
+        return Url.built(
+            self._host,
+            self._protocol,
+            path,
+            f"{self._prefix}{path}?{parameters}" if parameters else f"{self._prefix}{path}",
+        )
 
-    async def as_str(self) -> str:
-        """See base class."""
-        return await self._https.as_str()
+
+def _joined(host: str, protocol: str, path: str, query: str) -> str:
+    """Returns an address string.
+
+    A host which already starts with a protocol is taken as a complete url.
+
+    Args:
+        host: a domain name (host) or a complete url
+        protocol: a protocol of a url
+        path: a path of a url
+        query: percent-encoded query parameters
+    """
+    url: str = (
+        host
+        if host.startswith(f"{protocol}://")
+        else f"{protocol}://{host}/{path[1:] if path.startswith('/') else path}"
+    )
+    if not query:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{query}"
+
+
+def _encoded(query: Optional[Query]) -> str:
+    """Returns percent-encoded query parameters.
+
+    Args:
+        query: query parameters
+    """
+    if not query:
+        return ""
+    return urlencode(query, doseq=True, quote_via=quote)
+
+
+def _segment(value: Any) -> str:
+    """Returns a value percent-encoded to be put into a path segment.
+
+    Args:
+        value: a value of a placeholder
+    """
+    if isinstance(value, int):
+        return str(value)
+    text: str = str(value)
+    if text.isascii() and text.isalnum():
+        return text
+    return quote(text, safe="")
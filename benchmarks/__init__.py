@@ -0,0 +1 @@
+"""Package provides benchmarks of aiorequest sessions against a local HTTP server."""
@@ -0,0 +1,108 @@
+"""The module provides a command line entrypoint of benchmarks.
+
+Run ``python -m benchmarks`` from the root of the repository.
+"""
+import argparse
+import os
+import sys
+from typing import List, Sequence
+from benchmarks.suite import (
+    SCENARIOS,
+    SESSIONS,
+    Result,
+    compare,
+    load_baseline,
+    measure,
+    save_baseline,
+)
+
+_BASELINE: str = os.path.join(os.path.dirname(__file__), "baseline.json")
+_COLUMNS: Sequence[str] = (
+    "scenario",
+    "session",
+    "requests",
+    "errors",
+    "rps",
+    "p50 ms",
+    "p99 ms",
+    "blocked ms",
+    "peak rss MB",
+)
+
+
+def _arguments(argv: Sequence[str]) -> argparse.Namespace:
+    """Returns parsed command line arguments.
+
+    Args:
+        argv: command line arguments
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmarks aiorequest sessions."
+    )
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), help="scenarios to run"
+    )
+    parser.add_argument(
+        "--session", action="append", choices=sorted(SESSIONS), help="sessions to measure"
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier of requests")
+    parser.add_argument("--baseline", default=_BASELINE, help="baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative degradation")
+    parser.add_argument("--save", action="store_true", help="store results as a baseline")
+    return parser.parse_args(argv)
+
+
+def _table(results: Sequence[Result]) -> str:
+    """Returns results formatted as a plain text table.
+
+    Args:
+        results: measured results
+    """
+    lines: List[Sequence[str]] = [_COLUMNS] + [
+        (
+            result.scenario,
+            result.session,
+            str(result.requests),
+            str(result.errors),
+            f"{result.rps:.1f}",
+            f"{result.p50 * 1000:.2f}",
+            f"{result.p99 * 1000:.2f}",
+            f"{result.blocked * 1000:.1f}",
+            f"{result.peak_rss:.1f}",
+        )
+        for result in results
+    ]
+    widths: List[int] = [max(len(line[index]) for line in lines) for index in range(len(_COLUMNS))]
+    return "\n".join(
+        "  ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in lines
+    )
+
+
+def main(argv: Sequence[str]) -> int:
+    """Runs benchmarks and returns an exit code, ``1`` means a regression is found.
+
+    Args:
+        argv: command line arguments
+    """
+    arguments: argparse.Namespace = _arguments(argv)
+    results: List[Result] = []
+    for scenario in arguments.scenario or SCENARIOS:
+        for session in arguments.session or SESSIONS:
+            results.append(measure(SCENARIOS[scenario], session, arguments.scale))
+            print(_table(results[-1:]).splitlines()[-1], file=sys.stderr, flush=True)
+    print(_table(results))
+    if arguments.save:
+        save_baseline(arguments.baseline, results)
+        return 0
+    if not os.path.exists(arguments.baseline):
+        return 0
+    regressions: List[str] = compare(
+        results, load_baseline(arguments.baseline), arguments.tolerance
+    )
+    for regression in regressions:
+        print(f"regression: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
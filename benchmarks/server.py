@@ -0,0 +1,193 @@
+"""The module provides API for a local HTTP/1.1 server standing in for remote APIs."""
+import asyncio
+import json
+import multiprocessing
+import random
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Dict, Optional, Tuple, Type
+
+_CRLF: bytes = b"\r\n"
+
+
+@dataclass(frozen=True)
+class ServerProfile:
+    """The class represents behaviour of a benchmark server.
+
+    Args:
+        latency: number of seconds every response is delayed for
+        body_size: approximate number of bytes of every response body
+        json: whether a body is a JSON document of records
+        chunked: whether a body is sent with chunked transfer encoding
+        chunk_size: number of bytes of every chunk of a chunked body
+        statuses: pairs of HTTP status code and its share of responses
+        keep_alive: whether connections are kept open between requests
+    """
+
+    latency: float = 0.0
+    body_size: int = 1024
+    json: bool = False
+    chunked: bool = False
+    chunk_size: int = 65536
+    statuses: Tuple[Tuple[int, float], ...] = ((200, 1.0),)
+    keep_alive: bool = True
+
+    def body(self) -> bytes:
+        """Returns a body of every response."""
+        if not self.json:
+            return b"x" * self.body_size
+        record: Dict[str, Any] = {
+            "id": 0,
+            "title": "benchmark",
+            "tags": ["a", "b", "c"],
+            "score": 0.5,
+            "ok": True,
+        }
+        count: int = max(1, self.body_size // (len(json.dumps(record)) + 2))
+        return json.dumps([dict(record, id=index) for index in range(count)]).encode()
+
+
+class BenchServer:
+    """The class represents a benchmark server running in its own process.
+
+    The server runs apart from a benchmark so that its work is not accounted to an event
+    loop and memory of a measured client.
+
+    Args:
+        profile: behaviour of the server
+    """
+
+    def __init__(self, profile: ServerProfile) -> None:
+        self._profile: ServerProfile = profile
+        self._process: Optional[Any] = None
+        self._port: int = 0
+
+    @property
+    def host(self) -> str:
+        """Returns host and port the server listens on."""
+        return f"127.0.0.1:{self._port}"
+
+    def __enter__(self) -> "BenchServer":
+        """Starts a server process and waits for its port."""
+        context: Any = multiprocessing.get_context("spawn")
+        ports: Any = context.Queue()
+        self._process = context.Process(target=_serve, args=(self._profile, ports), daemon=True)
+        self._process.start()
+        self._port = ports.get(timeout=30)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Terminates a server process."""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+
+
+def _serve(profile: ServerProfile, ports: Any) -> None:
+    """Runs a benchmark server until its process is terminated.
+
+    Args:
+        profile: behaviour of a server
+        ports: a queue the port of a server is reported to
+    """
+    asyncio.run(_listen(profile, ports))
+
+
+async def _listen(profile: ServerProfile, ports: Any) -> None:
+    """Accepts connections of a benchmark server forever.
+
+    Args:
+        profile: behaviour of a server
+        ports: a queue the port of a server is reported to
+    """
+    body: bytes = profile.body()
+    chooser: random.Random = random.Random(0)
+    codes: Tuple[int, ...] = tuple(code for code, _ in profile.statuses)
+    weights: Tuple[float, ...] = tuple(weight for _, weight in profile.statuses)
+
+    async def respond(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answers requests of a connection until it is closed."""
+        try:
+            while True:
+                head: bytes = await _received(reader)
+                if profile.latency:
+                    await asyncio.sleep(profile.latency)
+                code: int = chooser.choices(codes, weights)[0]
+                await _send(writer, profile, code, body, head.startswith(b"HEAD "))
+                if not profile.keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server: asyncio.AbstractServer = await asyncio.start_server(
+        respond, "127.0.0.1", 0, backlog=1024
+    )
+    ports.put(server.sockets[0].getsockname()[1])
+    async with server:
+        await server.serve_forever()
+
+
+async def _received(reader: asyncio.StreamReader) -> bytes:
+    """Reads a request and returns its head.
+
+    Args:
+        reader: a reader of a connection
+    """
+    head: bytes = await reader.readuntil(_CRLF + _CRLF)
+    length: int = 0
+    for line in head.split(_CRLF)[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return head
+
+
+async def _send(
+    writer: asyncio.StreamWriter, profile: ServerProfile, code: int, body: bytes, head_only: bool
+) -> None:
+    """Writes a response.
+
+    Args:
+        writer: a writer of a connection
+        profile: behaviour of a server
+        code: HTTP status code
+        body: response data
+        head_only: whether only a head is written e.g. for ``HEAD`` requests
+    """
+    writer.write(_head(profile, code, len(body)))
+    if head_only:
+        pass
+    elif profile.chunked:
+        for start in range(0, len(body), profile.chunk_size):
+            chunk: bytes = body[start : start + profile.chunk_size]
+            writer.write(f"{len(chunk):x}\r\n".encode("ascii") + chunk + _CRLF)
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+    else:
+        writer.write(body)
+    await writer.drain()
+
+
+def _head(profile: ServerProfile, code: int, length: int) -> bytes:
+    """Returns a response head.
+
+    Args:
+        profile: behaviour of a server
+        code: HTTP status code
+        length: number of bytes of a body
+    """
+    framing: str = "Transfer-Encoding: chunked" if profile.chunked else f"Content-Length: {length}"
+    return (
+        f"HTTP/1.1 {code} Benchmark\r\n"
+        f"Content-Type: {'application/json' if profile.json else 'text/plain'}\r\n"
+        f"{framing}\r\n"
+        f"Connection: {'keep-alive' if profile.keep_alive else 'close'}\r\n\r\n"
+    ).encode("latin-1")
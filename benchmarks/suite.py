@@ -0,0 +1,352 @@
+"""The module provides API for benchmark scenarios of sessions and their results."""
+import asyncio
+import json
+import math
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from typing import Callable, Dict, List, Optional, Sequence
+from aiorequest import HttpSession, HttpUrl, LoggedHttpSession, Session, StreamTransport
+from aiorequest.responses import Response, ResponseError
+from benchmarks.server import BenchServer, ServerProfile
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+_SLACK: float = 0.001
+
+SESSIONS: Dict[str, Callable[[], Session]] = {
+    "http": HttpSession,
+    "stream": lambda: HttpSession(transport=StreamTransport()),
+    "logged": lambda: LoggedHttpSession("benchmark", "benchmark"),
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """The class represents a workload sessions are measured with.
+
+    Args:
+        name: a name of a scenario
+        profile: behaviour of a server
+        requests: number of requests to perform
+        concurrency: number of requests performed at once
+        stream: whether response data is iterated in pieces instead of read at once
+        parse: whether response data is decoded as JSON
+    """
+
+    name: str
+    profile: ServerProfile
+    requests: int
+    concurrency: int = 1
+    stream: bool = False
+    parse: bool = False
+
+    def scaled(self, scale: float) -> "Scenario":
+        """Returns a scenario with number of requests multiplied by a given scale.
+
+        Args:
+            scale: a multiplier of number of requests
+        """
+        return replace(self, requests=max(1, int(self.requests * scale)))
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario(
+            "sequential",
+            ServerProfile(body_size=1024, statuses=((200, 0.95), (404, 0.05))),
+            requests=1000,
+        ),
+        Scenario(
+            "fan-out", ServerProfile(latency=0.01, body_size=1024), requests=1000, concurrency=50
+        ),
+        Scenario(
+            "large-body",
+            ServerProfile(body_size=8 * 1024 * 1024, chunked=True),
+            requests=20,
+            stream=True,
+        ),
+        Scenario(
+            "json-heavy",
+            ServerProfile(body_size=256 * 1024, json=True),
+            requests=200,
+            concurrency=10,
+            parse=True,
+        ),
+    )
+}
+
+
+@dataclass(frozen=True)
+class Result:
+    """The class represents measurements of a session running a scenario.
+
+    Args:
+        scenario: a name of a scenario
+        session: a name of a session
+        requests: number of performed requests
+        errors: number of requests failed with an error status or an exception
+        rps: number of requests per second
+        p50: median latency of a request in seconds
+        p99: 99th percentile latency of a request in seconds
+        blocked: number of seconds the event loop was stalled for
+        peak_rss: peak resident memory of a benchmark process in megabytes
+    """
+
+    scenario: str
+    session: str
+    requests: int
+    errors: int
+    rps: float
+    p50: float
+    p99: float
+    blocked: float
+    peak_rss: float
+
+    @property
+    def key(self) -> str:
+        """Returns a key of a result in a baseline."""
+        return f"{self.scenario}/{self.session}"
+
+
+class LoopMonitor:
+    """The class represents a watcher of event loop stalls.
+
+    A monitor wakes up every `interval` seconds and accounts any delay of its wake up
+    as time the event loop was blocked by synchronous work.
+
+    Args:
+        interval: number of seconds between wake ups
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self._interval: float = interval
+        self._blocked: float = 0.0
+        self._slept: float = 0.0
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def blocked(self) -> float:
+        """Returns number of seconds the event loop was blocked for."""
+        return self._blocked
+
+    def start(self) -> None:
+        """Starts watching a running event loop."""
+        self._task = asyncio.ensure_future(self._watch())
+
+    async def stop(self) -> None:
+        """Stops watching an event loop.
+
+        A wake up which is overdue at the moment is accounted as well, so a loop blocked
+        until the very end is not missed.
+        """
+        if self._task is not None:
+            self._blocked += max(0.0, time.perf_counter() - self._slept - self._interval)
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _watch(self) -> None:
+        """Accounts late wake ups of a sleeping task."""
+        while True:
+            self._slept = time.perf_counter()
+            await asyncio.sleep(self._interval)
+            self._blocked += max(0.0, time.perf_counter() - self._slept - self._interval)
+
+
+def measure(scenario: Scenario, session: str, scale: float = 1.0) -> Result:
+    """Runs a scenario against a fresh server and a fresh process of a given session.
+
+    A process is spawned for every measurement so that peak memory of one does not
+    leak into another.
+
+    Args:
+        scenario: a scenario to run
+        session: a name of a session from `SESSIONS`
+        scale: a multiplier of number of requests
+    """
+    scenario = scenario.scaled(scale)
+    with BenchServer(scenario.profile) as server:
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            return executor.submit(_measure, scenario, session, server.host).result()
+
+
+def compare(
+    results: Sequence[Result], baseline: Dict[str, Dict[str, float]], tolerance: float = 0.2
+) -> List[str]:
+    """Returns descriptions of results which are worse than a baseline beyond a tolerance.
+
+    Results missing from a baseline are not compared.
+
+    Args:
+        results: measured results
+        baseline: metrics of results keyed by `Result.key`
+        tolerance: an allowed relative degradation e.g. ``0.2`` for 20 percent
+    """
+    regressions: List[str] = []
+    for result in results:
+        expected: Optional[Dict[str, float]] = baseline.get(result.key)
+        if expected is None:
+            continue
+        if result.rps < expected["rps"] * (1 - tolerance):
+            regressions.append(
+                f"{result.key}: rps {result.rps:.1f} is below baseline {expected['rps']:.1f}"
+            )
+        for metric in ("p50", "p99", "blocked", "peak_rss"):
+            value: float = getattr(result, metric)
+            if value > expected[metric] * (1 + tolerance) + _SLACK:
+                regressions.append(
+                    f"{result.key}: {metric} {value:.4f} is above baseline {expected[metric]:.4f}"
+                )
+    return regressions
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    """Returns metrics of a baseline stored in a JSON file.
+
+    Args:
+        path: a path of a baseline file
+    """
+    with open(path) as baseline:
+        return json.load(baseline)
+
+
+def save_baseline(path: str, results: Sequence[Result]) -> None:
+    """Stores metrics of results as a baseline JSON file.
+
+    Args:
+        path: a path of a baseline file
+        results: measured results
+    """
+    with open(path, "w") as baseline:
+        json.dump(
+            {
+                result.key: {
+                    metric: value
+                    for metric, value in asdict(result).items()
+                    if metric not in ("scenario", "session")
+                }
+                for result in results
+            },
+            baseline,
+            indent=2,
+            sort_keys=True,
+        )
+        baseline.write("\n")
+
+
+def _measure(scenario: Scenario, session: str, host: str) -> Result:
+    """Returns a result of a scenario run in a current process.
+
+    Args:
+        scenario: a scenario to run
+        session: a name of a session from `SESSIONS`
+        host: host and port of a benchmark server
+    """
+    return asyncio.run(_run(scenario, session, host))
+
+
+async def _run(scenario: Scenario, name: str, host: str) -> Result:
+    """Returns a result of a scenario run in a current event loop.
+
+    Args:
+        scenario: a scenario to run
+        name: a name of a session from `SESSIONS`
+        host: host and port of a benchmark server
+    """
+    latencies: List[float] = []
+    errors: List[int] = [0]
+    pending: List[int] = list(range(scenario.requests))
+    monitor: LoopMonitor = LoopMonitor()
+    async with SESSIONS[name]() as session:
+        monitor.start()
+        started: float = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _work(session, scenario, host, pending, errors, latencies)
+                for _ in range(scenario.concurrency)
+            )
+        )
+        elapsed: float = time.perf_counter() - started
+        await monitor.stop()
+    latencies.sort()
+    return Result(
+        scenario.name,
+        name,
+        scenario.requests,
+        errors[0],
+        scenario.requests / elapsed,
+        _percentile(latencies, 0.5),
+        _percentile(latencies, 0.99),
+        monitor.blocked,
+        _peak_rss(),
+    )
+
+
+async def _work(
+    session: Session,
+    scenario: Scenario,
+    host: str,
+    pending: List[int],
+    errors: List[int],
+    latencies: List[float],
+) -> None:
+    """Performs requests of a scenario until none of them is pending.
+
+    Args:
+        session: a session to perform requests with
+        scenario: a scenario to run
+        host: host and port of a benchmark server
+        pending: requests left to perform
+        errors: a counter of failed requests
+        latencies: seconds every request took
+    """
+    while pending:
+        pending.pop()
+        started: float = time.perf_counter()
+        try:
+            await _consume(await session.get(HttpUrl(host), stream=scenario.stream), scenario)
+        except (ResponseError, OSError):
+            errors[0] += 1
+        latencies.append(time.perf_counter() - started)
+
+
+async def _consume(response: Response, scenario: Scenario) -> None:
+    """Reads data of a response the way a scenario requires.
+
+    Args:
+        response: a response to read
+        scenario: a scenario being run
+    """
+    if scenario.stream:
+        async for _ in response.iter_bytes():
+            pass
+    elif scenario.parse:
+        await response.as_json()
+    else:
+        await response.as_str()
+
+
+def _percentile(ordered: List[float], rank: float) -> float:
+    """Returns a nearest rank percentile.
+
+    Args:
+        ordered: sorted values
+        rank: a percentile rank from 0 to 1
+    """
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(rank * len(ordered)) - 1)]
+
+
+def _peak_rss() -> float:
+    """Returns peak resident memory of a current process in megabytes."""
+    if resource is None:
+        return 0.0
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
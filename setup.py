@@ -43,9 +43,17 @@ if __name__ == "__main__":
         long_description=__readme(),
         long_description_content_type="text/markdown",
         url=f"https://github.com/aiorequest/{__name}",
-        packages=__find_packages(exclude=("*.tests", "*.tests.*", "tests.*", "tests")),
+        packages=__find_packages(
+            exclude=("*.tests", "*.tests.*", "tests.*", "tests", "benchmarks", "benchmarks.*")
+        ),
         include_package_data=True,
         install_requires=__requirements(),
+        extras_require={
+            "orjson": ("orjson",),
+            "ujson": ("ujson",),
+            "brotli": ("brotli>=1.2",),
+            "zstd": ('backports.zstd; python_version < "3.14"',),
+        },
         classifiers=(
             "Programming Language :: Python :: 3.7",
             "Programming Language :: Python :: 3.8",
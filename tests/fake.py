@@ -1,3 +1,5 @@
+from typing import AsyncIterator, Dict, Mapping, Optional
+from aiorequest.decoders import json_items
 from aiorequest.responses import HTTPStatus, JsonType, Response
 
 
@@ -5,12 +7,22 @@ class FakeHttpResponse(Response):
     """The class represents fake HTTP response interface."""
 
     def __init__(
-        self, code: HTTPStatus, is_ok: bool = True, as_str: str = str(), as_dict: JsonType = {}
+        self,
+        code: HTTPStatus,
+        is_ok: bool = True,
+        as_str: str = str(),
+        as_dict: JsonType = {},
+        headers: Optional[Dict[str, str]] = None,
     ) -> None:
         self._code: HTTPStatus = code
         self._is_ok: bool = is_ok
         self._as_str: str = as_str
         self._as_dict: JsonType = as_dict
+        self._headers: Dict[str, str] = headers or {}
+
+    @property
+    def status_code(self) -> int:
+        return int(self._code)
 
     async def is_ok(self) -> bool:
         return self._is_ok
@@ -18,8 +30,28 @@ class FakeHttpResponse(Response):
     async def status(self) -> HTTPStatus:
         return self._code
 
+    async def headers(self) -> Mapping[str, str]:
+        return self._headers
+
     async def as_json(self) -> JsonType:
         return self._as_dict
 
     async def as_str(self) -> str:
         return self._as_str
+
+    async def iter_bytes(self, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        data: bytes = self._as_str.encode()
+        for start in range(0, len(data), chunk_size):
+            yield data[start : start + chunk_size]
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        async for chunk in self.iter_bytes():
+            yield chunk
+
+    async def iter_lines(self) -> AsyncIterator[str]:
+        for line in self._as_str.splitlines():
+            yield line
+
+    async def iter_json_items(self, path: str = "item") -> AsyncIterator[JsonType]:
+        async for item in json_items(self.iter_chunks(), path):
+            yield item
@@ -0,0 +1,225 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+Reply = Tuple[int, Dict[str, str], bytes]
+Route = Callable[[str, str, Dict[str, str], bytes], Awaitable[Reply]]
+
+
+async def echo(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    """Returns request details as JSON document."""
+    return (
+        200,
+        {"Content-Type": "application/json"},
+        json.dumps(
+            {"method": method, "path": path, "headers": headers, "body": body.decode()}
+        ).encode(),
+    )
+
+
+async def _chunked(reader: asyncio.StreamReader) -> bytes:
+    """Returns request body sent with chunked transfer encoding."""
+    body: bytearray = bytearray()
+    size: int = int((await reader.readuntil(b"\r\n"))[:-2], 16)
+    while size:
+        body.extend(await reader.readexactly(size))
+        await reader.readexactly(2)
+        size = int((await reader.readuntil(b"\r\n"))[:-2], 16)
+    await reader.readexactly(2)
+    return bytes(body)
+
+
+async def _request(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str], bytes]:
+    """Returns method, path, headers and body of the next request of a connection."""
+    head: bytes = await reader.readuntil(b"\r\n\r\n")
+    lines: List[str] = head.decode("latin-1").split("\r\n")
+    method, path, _ = lines[0].split(" ")
+    headers: Dict[str, str] = {
+        name.strip().lower(): value.strip()
+        for name, _, value in (line.partition(":") for line in lines[1:] if line)
+    }
+    if headers.get("transfer-encoding") == "chunked":
+        return method, path, headers, await _chunked(reader)
+    return method, path, headers, await reader.readexactly(int(headers.get("content-length", 0)))
+
+
+class LocalServer:
+    """The class represents local HTTP/1.1 keep-alive server used in tests."""
+
+    def __init__(self, route: Route = echo) -> None:
+        self._route: Route = route
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.connections: int = 0
+        self._writers: List[asyncio.StreamWriter] = []
+        self.requests: List[str] = []
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]  # type: ignore
+
+    @property
+    def host(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    async def start(self) -> "LocalServer":
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            for writer in self._writers:
+                writer.close()
+            await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.append(writer)
+        try:
+            while True:
+                try:
+                    method, path, headers, body = await _request(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                self.requests.append(path)
+                status, response_headers, content = await self._route(method, path, headers, body)
+                if "Transfer-Encoding" not in response_headers:
+                    response_headers.setdefault("Content-Length", str(len(content)))
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} Status\r\n"
+                        + "".join(f"{key}: {value}\r\n" for key, value in response_headers.items())
+                        + "\r\n"
+                    ).encode("latin-1")
+                    + (content if method != "HEAD" else b"")
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+class _Http2Exchange:
+    """Serves requests of a single HTTP/2 connection, every one concurrently."""
+
+    def __init__(
+        self,
+        writer: asyncio.StreamWriter,
+        route: Route,
+        requests: List[str],
+        goaway_after: Optional[int] = None,
+    ) -> None:
+        import h2.config
+        import h2.connection
+
+        self._writer: asyncio.StreamWriter = writer
+        self._route: Route = route
+        self._log: List[str] = requests
+        self._connection: Any = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        self._requests: Dict[int, Tuple[Dict[str, str], bytearray]] = {}
+        self._pending: Dict[int, bytes] = {}
+        self._tasks: List["asyncio.Future[None]"] = []
+        self._left: Optional[int] = goaway_after
+        self._connection.initiate_connection()
+        writer.write(self._connection.data_to_send())
+
+    def receive(self, data: bytes) -> None:
+        """Handles received frames and writes frames they lead to."""
+        for event in self._connection.receive_data(data):
+            self._dispatch(event)
+        self._flush()
+
+    def close(self) -> None:
+        """Stops serving requests in progress."""
+        for task in self._tasks:
+            task.cancel()
+
+    def _dispatch(self, event: Any) -> None:
+        """Handles a received event."""
+        import h2.events
+
+        if isinstance(event, h2.events.RequestReceived):
+            self._requests[event.stream_id] = (dict(event.headers), bytearray())
+        elif isinstance(event, h2.events.DataReceived):
+            self._requests[event.stream_id][1].extend(event.data)
+            self._connection.acknowledge_received_data(
+                event.flow_controlled_length, event.stream_id
+            )
+        elif isinstance(event, h2.events.StreamEnded):
+            headers, body = self._requests.pop(event.stream_id)
+            self._tasks.append(
+                asyncio.ensure_future(self._respond(event.stream_id, headers, bytes(body)))
+            )
+        elif isinstance(event, h2.events.StreamReset):
+            self._pending.pop(event.stream_id, None)
+
+    async def _respond(self, stream_id: int, headers: Dict[str, str], body: bytes) -> None:
+        """Sends a response of a request."""
+        self._log.append(headers[":path"])
+        status, response_headers, content = await self._route(
+            headers[":method"], headers[":path"], headers, body
+        )
+        self._connection.send_headers(
+            stream_id,
+            [(":status", str(status))]
+            + [(key.lower(), value) for key, value in response_headers.items()],
+        )
+        self._pending[stream_id] = content
+        self._flush()
+        if self._left is not None:
+            self._left -= 1
+            if self._left <= 0 and not self._pending:
+                self._connection.close_connection(last_stream_id=stream_id)
+                self._writer.write(self._connection.data_to_send())
+
+    def _flush(self) -> None:
+        """Sends as much pending response data as flow control windows allow."""
+        for stream_id in list(self._pending):
+            self._send(stream_id)
+        self._writer.write(self._connection.data_to_send())
+
+    def _send(self, stream_id: int) -> None:
+        """Sends pending data of a response while its flow control window allows."""
+        data: bytes = self._pending[stream_id]
+        while stream_id in self._pending:
+            size: int = min(
+                self._connection.local_flow_control_window(stream_id),
+                self._connection.max_outbound_frame_size,
+                len(data),
+            )
+            if data and not size:
+                break
+            self._connection.send_data(stream_id, data[:size], end_stream=size == len(data))
+            data = self._pending[stream_id] = data[size:]
+            if not data:
+                del self._pending[stream_id]
+
+
+class Http2Server(LocalServer):
+    """The class represents local HTTP/2 prior knowledge (h2c) server used in tests.
+
+    Requests of every connection are served concurrently. A connection is asked to be
+    replaced with ``GOAWAY`` frame after `goaway_after` requests if it is given.
+    """
+
+    def __init__(self, route: Route = echo, goaway_after: Optional[int] = None) -> None:
+        super().__init__(route)
+        self._goaway_after: Optional[int] = goaway_after
+        self.closed: int = 0
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.append(writer)
+        exchange: _Http2Exchange = _Http2Exchange(
+            writer, self._route, self.requests, self._goaway_after
+        )
+        try:
+            data: bytes = await reader.read(65536)
+            while data:
+                exchange.receive(data)
+                data = await reader.read(65536)
+        finally:
+            self.closed += 1
+            exchange.close()
+            writer.close()
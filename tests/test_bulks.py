@@ -0,0 +1,67 @@
+import asyncio
+from typing import Dict, List
+import pytest
+from aiorequest.bulks import Outcome
+from aiorequest.responses import Response, ResponseError
+from aiorequest.sessions import HttpSession, Session
+from aiorequest.transports import StreamTransport
+from aiorequest.urls import Address, HttpUrl
+from tests.markers import asyncio as asyncio_marker, unit
+from tests.server import LocalServer, Reply, echo
+
+pytestmark = [unit, asyncio_marker]
+
+
+async def _delayed(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    if path == "/fail":
+        return 503, {}, b"unavailable"
+    await asyncio.sleep(0.01 * int(path[1:]))
+    return await echo(method, path, headers, body)
+
+
+@pytest.fixture()
+async def server() -> LocalServer:
+    local_server: LocalServer = await LocalServer(_delayed).start()
+    yield local_server
+    await local_server.stop()
+
+
+@pytest.fixture()
+async def stream_session() -> Session:
+    session: Session
+    async with HttpSession(transport=StreamTransport()) as session:
+        yield session
+
+
+async def test_map_keeps_order(stream_session: Session, server: LocalServer) -> None:
+    urls: List[Address] = [HttpUrl(server.host, f"/{delay}") for delay in (5, 1, 3, 0)]
+    outcomes: List[Outcome] = await stream_session.mapped("get", urls, concurrency=2)
+    assert [(await outcome.as_json())["path"] for outcome in outcomes] == [  # type: ignore
+        "/5",
+        "/1",
+        "/3",
+        "/0",
+    ]
+    assert server.connections == 2
+
+
+async def test_map_returns_exceptions(stream_session: Session, server: LocalServer) -> None:
+    outcomes: List[Outcome] = await stream_session.mapped(
+        "get", [HttpUrl(server.host, "/fail"), HttpUrl(server.host, "/0")]
+    )
+    assert isinstance(outcomes[0], ResponseError)
+    assert isinstance(outcomes[1], Response)
+
+
+async def test_map_raises_exceptions(stream_session: Session, server: LocalServer) -> None:
+    with pytest.raises(ResponseError):
+        await stream_session.mapped("get", [HttpUrl(server.host, "/fail")], return_exceptions=False)
+
+
+async def test_as_completed(stream_session: Session, server: LocalServer) -> None:
+    urls: List[Address] = [HttpUrl(server.host, f"/{delay}") for delay in (9, 0, "fail")]
+    completed: List[Address] = [
+        url async for url, _ in stream_session.as_completed("get", urls, concurrency=3)
+    ]
+    assert completed[-1] is urls[0]
+    assert len(completed) == 3
@@ -0,0 +1,187 @@
+import asyncio as aio
+from pathlib import Path
+from typing import Dict, List, Optional
+import pytest
+from aiorequest.caches import CacheEntry, CachedSession, DiskCache, MemoryCache
+from aiorequest.responses import HTTPStatus, Response
+from aiorequest.sessions import HttpSession
+from aiorequest.transports import StreamTransport
+from aiorequest.urls import HttpUrl
+from tests.markers import asyncio, unit
+from tests.server import LocalServer, Reply
+
+pytestmark = [unit, asyncio]
+
+
+class _Origin:
+    """Replies with given headers and answers conditional requests."""
+
+    def __init__(self, headers: Dict[str, str], etag: Optional[str] = None) -> None:
+        self._headers: Dict[str, str] = headers
+        self._etag: Optional[str] = etag
+        self.conditional: List[str] = []
+
+    async def __call__(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+        reply: Dict[str, str] = dict(self._headers)
+        if self._etag is not None:
+            reply["ETag"] = self._etag
+            if headers.get("if-none-match") == self._etag:
+                self.conditional.append(path)
+                return HTTPStatus.NOT_MODIFIED, reply, b""
+        return HTTPStatus.OK, reply, f"{method} {path} {headers.get('accept-language')}".encode()
+
+
+async def _served(route: _Origin, paths: List[str], **kwargs: Dict[str, str]) -> LocalServer:
+    server: LocalServer = await LocalServer(route).start()
+    try:
+        async with CachedSession(HttpSession(transport=StreamTransport())) as session:
+            for path in paths:
+                response: Response = await session.get(HttpUrl(server.host, path), **kwargs)
+                assert await response.as_str() == f"GET /{path} None"
+    finally:
+        await server.stop()
+    return server
+
+
+def _entry(headers: Dict[str, str], content: bytes = b"", stored: float = 1000.0) -> CacheEntry:
+    return CacheEntry(200, tuple(headers.items()), content, (), stored)
+
+
+async def test_fresh_response_is_served_from_cache() -> None:
+    server: LocalServer = await _served(_Origin({"Cache-Control": "max-age=60"}), ["a", "a", "b"])
+    assert server.requests == ["/a", "/b"]
+
+
+async def test_uncacheable_response_is_not_stored() -> None:
+    server: LocalServer = await _served(_Origin({"Cache-Control": "no-store"}), ["a", "a"])
+    assert server.requests == ["/a", "/a"]
+
+
+async def test_stale_response_is_revalidated() -> None:
+    route: _Origin = _Origin({"Cache-Control": "no-cache"}, etag='"v1"')
+    server: LocalServer = await _served(route, ["a", "a", "a"])
+    assert server.requests == ["/a", "/a", "/a"]
+    assert route.conditional == ["/a", "/a"]
+
+
+async def test_request_no_cache_bypasses_fresh_response() -> None:
+    route: _Origin = _Origin({"Cache-Control": "max-age=60"}, etag='"v1"')
+    server: LocalServer = await LocalServer(route).start()
+    try:
+        async with CachedSession(HttpSession(transport=StreamTransport())) as session:
+            await session.get(HttpUrl(server.host, "a"))
+            await session.get(HttpUrl(server.host, "a"), headers={"Cache-Control": "no-cache"})
+    finally:
+        await server.stop()
+    assert route.conditional == ["/a"]
+
+
+async def test_vary_selects_stored_response() -> None:
+    server: LocalServer = await LocalServer(
+        _Origin({"Cache-Control": "max-age=60", "Vary": "Accept-Language"})
+    ).start()
+    try:
+        async with CachedSession(HttpSession(transport=StreamTransport())) as session:
+            for language in ("en", "en", "uk"):
+                response: Response = await session.get(
+                    HttpUrl(server.host), headers={"Accept-Language": language}
+                )
+                assert await response.as_str() == f"GET / {language}"
+    finally:
+        await server.stop()
+    assert len(server.requests) == 2
+
+
+async def test_unsafe_method_invalidates_stored_response() -> None:
+    server: LocalServer = await LocalServer(_Origin({"Cache-Control": "max-age=60"})).start()
+    try:
+        async with CachedSession(HttpSession(transport=StreamTransport())) as session:
+            await session.get(HttpUrl(server.host))
+            await session.post(HttpUrl(server.host), plain="data")
+            await session.get(HttpUrl(server.host))
+    finally:
+        await server.stop()
+    assert len(server.requests) == 3
+
+
+@pytest.mark.parametrize(
+    "headers, lifetime",
+    [
+        ({"Cache-Control": "max-age=30", "Expires": "0"}, 30.0),
+        (
+            {"Date": "Wed, 21 Oct 2015 07:28:00 GMT", "Expires": "Wed, 21 Oct 2015 07:29:00 GMT"},
+            60.0,
+        ),
+        ({"Expires": "0"}, 0.0),
+        (
+            {
+                "Date": "Wed, 21 Oct 2015 07:28:00 GMT",
+                "Last-Modified": "Wed, 21 Oct 2015 07:18:00 GMT",
+            },
+            60.0,
+        ),
+        ({}, 0.0),
+    ],
+)
+async def test_entry_lifetime(headers: Dict[str, str], lifetime: float) -> None:
+    assert _entry(headers).lifetime() == lifetime
+
+
+async def test_entry_freshness() -> None:
+    entry: CacheEntry = _entry({"Cache-Control": "max-age=60", "Age": "10"})
+    assert entry.is_fresh(now=1040.0)
+    assert not entry.is_fresh(now=1050.0)
+    assert not entry.is_fresh(max_age=20, now=1040.0)
+
+
+async def test_entry_refresh_keeps_body_headers() -> None:
+    entry: CacheEntry = _entry({"ETag": '"v1"', "Content-Length": "2"}, b"ok").refreshed(
+        {"ETag": '"v2"', "Content-Length": "0", "Cache-Control": "max-age=5"}, now=2000.0
+    )
+    assert entry.headers == (
+        ("ETag", '"v2"'),
+        ("Content-Length", "2"),
+        ("Cache-Control", "max-age=5"),
+    )
+    assert entry.stored == 2000.0
+    assert entry.validators() == {"If-None-Match": '"v2"'}
+
+
+async def test_memory_cache_evicts_least_recently_used() -> None:
+    cache: MemoryCache = MemoryCache(entries=2)
+    for key in ("a", "b"):
+        await cache.put(key, _entry({}))
+    await cache.get("a")
+    await cache.put("c", _entry({}))
+    assert await cache.get("b") is None
+    assert await cache.get("a") is not None
+    assert len(cache) == 2
+
+
+async def test_memory_cache_is_bounded_by_size() -> None:
+    cache: MemoryCache = MemoryCache(size=10)
+    await cache.put("a", _entry({}, b"12345"))
+    await cache.put("b", _entry({}, b"123456"))
+    await cache.put("c", _entry({}, b"12345678901"))
+    assert await cache.get("a") is None
+    assert await cache.get("c") is None
+    assert cache.size == 6
+
+
+async def test_disk_cache_stores_entries(tmp_path: Path) -> None:
+    cache: DiskCache = DiskCache(str(tmp_path))
+    entry: CacheEntry = CacheEntry(200, (("ETag", '"v1"'),), b"\x00body", (("accept", "*/*"),), 5.0)
+    await cache.put("GET http://a.com", entry)
+    assert await DiskCache(str(tmp_path)).get("GET http://a.com") == entry
+    await cache.delete("GET http://a.com")
+    assert await cache.get("GET http://a.com") is None
+
+
+async def test_disk_cache_concurrent_puts_of_a_key(tmp_path: Path) -> None:
+    cache: DiskCache = DiskCache(str(tmp_path))
+    entries: List[CacheEntry] = [
+        CacheEntry(200, (), bytes([number]) * 1_000_000, (), 5.0) for number in range(16)
+    ]
+    await aio.gather(*(cache.put("GET http://a.com", entry) for entry in entries))
+    assert await cache.get("GET http://a.com") in entries
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,49 @@
+import pytest
+from aiorequest.codecs import JsonCodec, OrJsonCodec, StdJsonCodec, UJsonCodec, fastest_codec
+from aiorequest.responses import Response
+from aiorequest.sessions import HttpSession
+from aiorequest.transports import StreamTransport
+from aiorequest.urls import HttpUrl
+from tests.markers import asyncio, unit
+from tests.server import LocalServer
+
+pytestmark = [unit, asyncio]
+
+_data = {"name": "é", "items": [1, 2.5, None, True]}
+
+
+async def test_std_codec_encode() -> None:
+    assert StdJsonCodec().decode(StdJsonCodec().encode(_data)) == _data
+
+
+async def test_std_codec_decode_memoryview() -> None:
+    assert StdJsonCodec().decode(memoryview(b"[1]")) == [1]
+
+
+async def test_orjson_codec() -> None:
+    pytest.importorskip("orjson")
+    codec: JsonCodec = OrJsonCodec()
+    assert isinstance(codec.encode(_data), bytes)
+    assert codec.decode(codec.encode(_data)) == _data
+
+
+async def test_ujson_codec() -> None:
+    pytest.importorskip("ujson")
+    codec: JsonCodec = UJsonCodec()
+    assert codec.decode(codec.encode(_data)) == _data
+
+
+async def test_fastest_codec() -> None:
+    assert isinstance(fastest_codec(), JsonCodec)
+
+
+async def test_session_codec() -> None:
+    server: LocalServer = await LocalServer().start()
+    try:
+        async with HttpSession(transport=StreamTransport(), codec=fastest_codec()) as session:
+            response: Response = await session.post(HttpUrl(server.host), as_dict=_data)
+            echoed = await response.as_json()
+            assert echoed["headers"]["content-type"] == "application/json"
+            assert fastest_codec().decode(echoed["body"]) == _data
+    finally:
+        await server.stop()
@@ -0,0 +1,52 @@
+from typing import AsyncIterator, List
+import pytest
+from aiorequest.decoders import JsonItems, json_items
+from aiorequest.types import AnyUnionDict
+from tests.fake import FakeHttpResponse
+from aiorequest.responses import HTTPStatus
+from tests.markers import asyncio, unit
+
+pytestmark = [unit, asyncio]
+
+_document: str = (
+    '{"meta": {"items": [0]}, "items": [{"id": 1}, "a\\\\\\"]", [2], null], "count": 4}'
+)
+
+
+def _decode(document: str, path: str, size: int) -> List[AnyUnionDict]:
+    items: JsonItems = JsonItems(path)
+    decoded: List[AnyUnionDict] = []
+    for start in range(0, len(document), size):
+        decoded.extend(items.feed(document[start : start + size]))
+    return decoded + items.close()
+
+
+@pytest.mark.parametrize("size", (1, 3, 1024))  # noqa: PT006, PT007
+async def test_json_items_nested_path(size: int) -> None:
+    assert _decode(_document, "items.item", size) == [{"id": 1}, 'a\\"]', [2], None]
+
+
+async def test_json_items_top_level_array() -> None:
+    assert _decode("[1, [2], {}]", "item", 1) == [1, [2], {}]
+
+
+async def test_json_items_missing_path() -> None:
+    assert _decode('{"other": [1]}', "items.item", 2) == []
+
+
+async def test_json_items_incomplete_document() -> None:
+    with pytest.raises(ValueError):
+        _decode("[1, 2", "item", 2)
+
+
+async def test_json_items_from_chunks() -> None:
+    async def chunks() -> AsyncIterator[bytes]:
+        for chunk in (b'[{"name": "\xc3', b'\xa9"}, 2]'):
+            yield chunk
+
+    assert [item async for item in json_items(chunks())] == [{"name": "é"}, 2]
+
+
+async def test_response_iter_json_items() -> None:
+    response: FakeHttpResponse = FakeHttpResponse(HTTPStatus.OK, as_str=_document)
+    assert [item async for item in response.iter_json_items("items.item")][0] == {"id": 1}
@@ -0,0 +1,86 @@
+import asyncio as aio
+import time
+from typing import Any, Dict, List
+import pytest
+from aiorequest.diagnostics import BlockingDetector, CallStats, DiagnosedSession, SlowCall
+from aiorequest.responses import Response
+from aiorequest.sessions import HttpSession
+from aiorequest.transports import StreamTransport
+from aiorequest.urls import HttpUrl
+from tests.markers import asyncio, unit
+from tests.server import LocalServer, Reply
+
+pytestmark = [unit, asyncio]
+
+
+async def _lines(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    return 200, {}, b"first\nsecond\n"
+
+
+class _Blocking(HttpSession):
+    """Blocks the event loop before every request."""
+
+    async def _request(self, method: str, url: Any, **kwargs: Any) -> Response:
+        time.sleep(0.03)
+        return await super()._request(method, url, **kwargs)
+
+
+async def test_slow_call_is_reported_with_caller_stack() -> None:
+    calls: List[SlowCall] = []
+    detector: BlockingDetector = BlockingDetector(threshold=0.01, report=calls.append)
+    server: LocalServer = await LocalServer().start()
+    url: HttpUrl = HttpUrl(server.host, "slow")
+    try:
+        async with DiagnosedSession(_Blocking(transport=StreamTransport()), detector) as session:
+            await session.get(url)
+    finally:
+        await server.stop()
+    assert len(calls) == 1
+    assert (calls[0].call, calls[0].method, calls[0].address) == ("session.get", "GET", url)
+    assert calls[0].url == await url.as_str()
+    assert calls[0].stall >= 0.03
+    assert calls[0].stack[0].name == "test_slow_call_is_reported_with_caller_stack"
+
+
+async def test_counters_of_session_and_response_calls() -> None:
+    detector: BlockingDetector = BlockingDetector(threshold=10, report=pytest.fail)
+    server: LocalServer = await LocalServer(_lines).start()
+    try:
+        async with DiagnosedSession(HttpSession(transport=StreamTransport()), detector) as session:
+            response: Response = await session.get(HttpUrl(server.host))
+            assert await response.status() == 200
+            assert [line async for line in response.iter_lines()] == ["first", "second"]
+            await session.get(HttpUrl(server.host))
+    finally:
+        await server.stop()
+    counters: Dict[str, CallStats] = await detector.counters()
+    assert sorted(counters) == ["response.iter_lines", "response.status", "session.get"]
+    assert counters["session.get"].calls == 2
+    assert counters["response.iter_lines"].calls == 1
+    assert all(stats.slow == 0 and stats.stall <= stats.blocked for stats in counters.values())
+    detector.reset()
+    assert await detector.counters() == {}
+
+
+async def test_stall_excludes_time_spent_suspended() -> None:
+    detector: BlockingDetector = BlockingDetector(threshold=0.01, report=pytest.fail)
+
+    async def delayed(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+        await aio.sleep(0.05)
+        return 200, {}, b""
+
+    server: LocalServer = await LocalServer(delayed).start()
+    try:
+        async with DiagnosedSession(HttpSession(transport=StreamTransport()), detector) as session:
+            await session.get(HttpUrl(server.host))
+    finally:
+        await server.stop()
+    assert (await detector.counters())["session.get"].stall < 0.01
+
+
+async def test_failed_call_is_counted() -> None:
+    detector: BlockingDetector = BlockingDetector()
+    async with DiagnosedSession(HttpSession(transport=StreamTransport()), detector) as session:
+        with pytest.raises(OSError):
+            await session.get(HttpUrl("127.0.0.1:9"))
+    assert (await detector.counters())["session.get"].calls == 1
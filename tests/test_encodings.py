@@ -0,0 +1,160 @@
+import gzip
+import json
+import sys
+import tracemalloc
+import zlib
+from typing import Callable, Dict, List
+import pytest
+from aiorequest.connections import Headers
+from aiorequest.encodings import ACCEPT_ENCODING, Compression, decompressed
+from aiorequest.responses import Body, Response
+from aiorequest.sessions import HttpSession, SessionOptions
+from aiorequest.transports import StreamTransport
+from aiorequest.urls import HttpUrl
+from tests.markers import asyncio, unit
+from tests.server import LocalServer, Reply
+
+pytestmark = [unit, asyncio]
+
+_DOCUMENT: bytes = json.dumps({"items": list(range(1000))}).encode()
+
+
+class _Chunks(Body):
+    """Returns given pieces of data one by one."""
+
+    def __init__(self, data: bytes, size: int = 100) -> None:
+        self._pieces: List[bytes] = [
+            data[start : start + size] for start in range(0, len(data), size)
+        ]
+        self.closed: bool = False
+
+    async def read(self, size: int = 65536) -> bytes:
+        return self._pieces.pop(0) if self._pieces else b""
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+async def _compressed(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    if "gzip" in headers.get("accept-encoding", ""):
+        return 200, {"Content-Encoding": "gzip"}, gzip.compress(_DOCUMENT)
+    return 200, {}, _DOCUMENT
+
+
+async def _inflated(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    if headers.get("content-encoding") == "gzip":
+        body = gzip.decompress(body)
+    return (
+        200,
+        {},
+        json.dumps({"encoding": headers.get("content-encoding"), "body": body.decode()}).encode(),
+    )
+
+
+@pytest.mark.parametrize(
+    "encoding, data",
+    (
+        pytest.param("gzip", gzip.compress(_DOCUMENT), id="gzip"),
+        pytest.param("deflate", zlib.compress(_DOCUMENT), id="deflate"),
+        pytest.param("deflate", zlib.compress(_DOCUMENT)[2:-4], id="raw deflate"),
+        pytest.param("gzip, identity", gzip.compress(_DOCUMENT), id="identity"),
+    ),
+)
+async def test_decompressed_body(encoding: str, data: bytes) -> None:
+    assert (
+        await decompressed(_Chunks(data), Headers([("Content-Encoding", encoding)])).read_all()
+        == _DOCUMENT
+    )
+
+
+async def test_stacked_encodings_are_undone_in_reverse() -> None:
+    data: bytes = zlib.compress(gzip.compress(_DOCUMENT))
+    body: Body = decompressed(_Chunks(data), Headers([("Content-Encoding", "gzip, deflate")]))
+    assert await body.read_all() == _DOCUMENT
+
+
+async def test_unsupported_encoding_is_kept() -> None:
+    body: _Chunks = _Chunks(b"data")
+    assert decompressed(body, Headers([("Content-Encoding", "unknown")])) is body
+
+
+async def test_brotli_and_zstd_are_negotiated_when_installed() -> None:
+    brotli = pytest.importorskip("brotli")
+    zstd = pytest.importorskip(
+        "compression.zstd" if sys.version_info >= (3, 14) else "backports.zstd"
+    )
+    assert ACCEPT_ENCODING.startswith("zstd, br")
+    for encoding, data in (
+        ("br", brotli.compress(_DOCUMENT)),
+        ("zstd", zstd.compress(_DOCUMENT)),
+    ):
+        body: Body = decompressed(_Chunks(data), Headers([("Content-Encoding", encoding)]))
+        assert await body.read_all() == _DOCUMENT
+
+
+@pytest.mark.parametrize(
+    "encoding, compress",
+    (
+        pytest.param("gzip", gzip.compress, id="gzip"),
+        pytest.param("deflate", zlib.compress, id="deflate"),
+        pytest.param("br", lambda data: pytest.importorskip("brotli").compress(data), id="br"),
+        pytest.param(
+            "zstd",
+            lambda data: pytest.importorskip(
+                "compression.zstd" if sys.version_info >= (3, 14) else "backports.zstd"
+            ).compress(data),
+            id="zstd",
+        ),
+    ),
+)
+async def test_expanding_data_is_read_in_bounded_pieces(
+    encoding: str, compress: Callable[[bytes], bytes]
+) -> None:
+    data: bytes = compress(b"\x00" * 50_000_000)
+    body: Body = decompressed(_Chunks(data, len(data)), Headers([("Content-Encoding", encoding)]))
+    tracemalloc.start()
+    try:
+        pieces: List[bytes] = [await body.read(4096) for _ in range(100)]
+        peak: int = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert all(0 < len(piece) <= 4096 for piece in pieces)
+    assert not any(b"".join(pieces))
+    assert peak < 1_000_000
+
+
+async def test_stream_transport_decompresses() -> None:
+    server: LocalServer = await LocalServer(_compressed).start()
+    try:
+        async with HttpSession(transport=StreamTransport()) as session:
+            assert len((await (await session.get(HttpUrl(server.host))).as_json())["items"]) == 1000
+            response: Response = await session.get(HttpUrl(server.host), stream=True)
+            assert (await response.headers())["content-encoding"] == "gzip"
+            assert b"".join([chunk async for chunk in response.iter_bytes(4096)]) == _DOCUMENT
+        async with HttpSession(transport=StreamTransport(decompress=False)) as session:
+            assert (
+                "content-encoding" not in await (await session.get(HttpUrl(server.host))).headers()
+            )
+    finally:
+        await server.stop()
+
+
+async def test_large_request_data_is_compressed() -> None:
+    server: LocalServer = await LocalServer(_inflated).start()
+    try:
+        async with HttpSession(
+            transport=StreamTransport(),
+            options=SessionOptions(compression=Compression(min_size=100)),
+        ) as session:
+            large: Response = await session.post(HttpUrl(server.host), as_dict={"data": "x" * 1000})
+            small: Response = await session.put(HttpUrl(server.host), plain="small")
+    finally:
+        await server.stop()
+    assert (await large.as_json())["encoding"] == "gzip"
+    assert json.loads((await large.as_json())["body"]) == {"data": "x" * 1000}
+    assert await small.as_json() == {"encoding": None, "body": "small"}
+
+
+async def test_unknown_compression() -> None:
+    with pytest.raises(ValueError):
+        Compression("lzma")
@@ -0,0 +1,108 @@
+import asyncio as aio
+from typing import Dict, List, Union
+import pytest
+from aiorequest.flights import SingleFlight
+from aiorequest.responses import Response, ResponseError
+from aiorequest.sessions import HttpSession, SessionOptions
+from aiorequest.transports import StreamTransport
+from aiorequest.urls import HttpUrl
+from tests.fake import FakeHttpResponse
+from tests.markers import asyncio as asyncio_marker, unit
+from tests.server import LocalServer, Reply
+
+pytestmark = [unit, asyncio_marker]
+
+
+class _Counted:
+    """Counts performed requests which take a while."""
+
+    def __init__(self, outcome: Union[Response, Exception] = FakeHttpResponse(200)) -> None:
+        self._outcome: Union[Response, Exception] = outcome
+        self.calls: int = 0
+
+    async def __call__(self) -> Response:
+        self.calls += 1
+        await aio.sleep(0.01)
+        if isinstance(self._outcome, Exception):
+            raise self._outcome
+        return self._outcome
+
+
+async def _slow(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    await aio.sleep(0.05)
+    return 200, {}, path.encode()
+
+
+async def test_identical_requests_share_one_call() -> None:
+    flight: SingleFlight = SingleFlight()
+    request: _Counted = _Counted()
+    responses: List[Response] = await aio.gather(
+        *(flight.call("GET", "http://a.com", {}, request) for _ in range(10))
+    )
+    assert request.calls == 1
+    assert all(response is responses[0] for response in responses)
+    assert not len(flight)
+
+
+@pytest.mark.parametrize(
+    "method, options",
+    [
+        ("POST", {}),
+        ("GET", {"stream": True}),
+    ],
+)
+async def test_other_requests_are_not_shared(method: str, options: Dict[str, bool]) -> None:
+    flight: SingleFlight = SingleFlight()
+    request: _Counted = _Counted()
+    await aio.gather(*(flight.call(method, "http://a.com", options, request) for _ in range(3)))
+    assert request.calls == 3
+
+
+async def test_selected_headers_distinguish_requests() -> None:
+    flight: SingleFlight = SingleFlight(headers=("Authorization",))
+    request: _Counted = _Counted()
+    await aio.gather(
+        flight.call("GET", "http://a.com", {"headers": {"Authorization": "a"}}, request),
+        flight.call("GET", "http://a.com", {"headers": {"authorization": "a", "X": "1"}}, request),
+        flight.call("GET", "http://a.com", {"headers": {"Authorization": "b"}}, request),
+    )
+    assert request.calls == 2
+
+
+async def test_failure_is_shared() -> None:
+    flight: SingleFlight = SingleFlight()
+    request: _Counted = _Counted(ResponseError("failed"))
+    outcomes: List[Union[Response, BaseException]] = await aio.gather(
+        *(flight.call("GET", "http://a.com", {}, request) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert request.calls == 1
+    assert all(isinstance(outcome, ResponseError) for outcome in outcomes)
+
+
+async def test_cancelled_caller_does_not_cancel_shared_request() -> None:
+    flight: SingleFlight = SingleFlight()
+    request: _Counted = _Counted()
+    first: "aio.Future[Response]" = aio.ensure_future(flight.call("GET", "a", {}, request))
+    second: "aio.Future[Response]" = aio.ensure_future(flight.call("GET", "a", {}, request))
+    await aio.sleep(0)
+    first.cancel()
+    assert await (await second).status() == 200
+    assert request.calls == 1
+
+
+async def test_session_coalesces_requests() -> None:
+    server: LocalServer = await LocalServer(_slow).start()
+    try:
+        async with HttpSession(
+            transport=StreamTransport(), options=SessionOptions(flight=SingleFlight())
+        ) as session:
+            responses: List[Response] = await aio.gather(
+                *(session.get(HttpUrl(server.host, "a")) for _ in range(10)),
+                session.get(HttpUrl(server.host, "b")),
+            )
+            assert await responses[0].as_str() == "/a"
+            assert await responses[-1].as_str() == "/b"
+    finally:
+        await server.stop()
+    assert sorted(server.requests) == ["/a", "/b"]
@@ -0,0 +1,106 @@
+import asyncio as aio
+import time
+from typing import Any, Dict, List
+import pytest
+from aiorequest.http2 import Http2Stream
+from aiorequest.pools import PoolStats
+from aiorequest.responses import Response, StreamResponse
+from aiorequest.sessions import HttpSession, Session
+from aiorequest.transports import Http2Transport
+from aiorequest.urls import HttpUrl
+from tests.markers import asyncio, unit
+from tests.server import Http2Server, LocalServer, Reply, echo
+
+pytestmark = [unit, asyncio]
+
+pytest.importorskip("h2")
+
+
+async def _slow(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    await aio.sleep(0.1)
+    return 200, {}, path.encode()
+
+
+async def _large(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    return 200, {}, b"x" * 300000
+
+
+async def test_http2_get() -> None:
+    server: LocalServer = await Http2Server().start()
+    try:
+        async with HttpSession(transport=Http2Transport()) as session:
+            response: Response = await session.get(HttpUrl(server.host, "path?a=1"))
+            data: Dict[str, Any] = await response.as_json()  # type: ignore
+            assert (data["method"], data["path"]) == ("GET", "/path?a=1")
+            assert data["headers"][":scheme"] == "http"
+            assert (await response.headers())["Content-Type"] == "application/json"
+    finally:
+        await server.stop()
+
+
+async def test_http2_multiplexes_requests() -> None:
+    server: LocalServer = await Http2Server(_slow).start()
+    started: float = time.monotonic()
+    try:
+        session: Session
+        async with HttpSession(transport=Http2Transport()) as session:
+            responses: List[Response] = await aio.gather(
+                *(session.get(HttpUrl(server.host, str(number))) for number in range(20))
+            )
+            assert [await response.as_str() for response in responses] == [
+                f"/{number}" for number in range(20)
+            ]
+            assert await session.pool_stats() == {  # type: ignore
+                f"http://127.0.0.1:{server.port}": PoolStats(opened=1, idle=1, in_use=0)
+            }
+    finally:
+        await server.stop()
+    assert time.monotonic() - started < 1
+    assert server.connections == 1
+
+
+async def test_http2_post_large_body() -> None:
+    server: LocalServer = await Http2Server(echo).start()
+    try:
+        async with HttpSession(transport=Http2Transport()) as session:
+            response: Response = await session.post(HttpUrl(server.host), plain="a" * 200000)
+            assert (await response.as_json())["body"] == "a" * 200000
+    finally:
+        await server.stop()
+
+
+async def test_http2_stream_large_response() -> None:
+    server: LocalServer = await Http2Server(_large).start()
+    try:
+        async with HttpSession(transport=Http2Transport()) as session:
+            response: Response = await session.get(HttpUrl(server.host), stream=True)
+            assert isinstance(response, StreamResponse)
+            assert isinstance(response.stream, Http2Stream)
+            assert sum([len(chunk) async for chunk in response.iter_bytes(1000)]) == 300000
+            assert response.stream is None
+            response = await session.get(HttpUrl(server.host))
+            assert len(await response.as_str()) == 300000
+    finally:
+        await server.stop()
+
+
+async def test_http2_falls_back_to_http1() -> None:
+    server: LocalServer = await LocalServer().start()
+    try:
+        async with HttpSession(transport=Http2Transport(h2c=False)) as session:
+            response: Response = await session.get(HttpUrl(server.host, "old"))
+            assert (await response.as_json())["path"] == "/old"
+    finally:
+        await server.stop()
+
+
+async def test_http2_connection_replaced_on_goaway_is_closed() -> None:
+    server: Http2Server = await Http2Server(goaway_after=1).start()
+    try:
+        async with HttpSession(transport=Http2Transport()) as session:
+            for _ in range(5):
+                assert await (await session.get(HttpUrl(server.host))).is_ok()
+            await aio.sleep(0.05)
+            assert (server.connections, server.closed) == (5, 4)
+    finally:
+        await server.stop()
@@ -0,0 +1,87 @@
+import asyncio as aio
+import time
+from typing import Callable, List
+import pytest
+from aiorequest.limits import RateLimiter, TokenBucket
+from aiorequest.sessions import HttpSession, SessionOptions
+from aiorequest.transports import StreamTransport
+from aiorequest.urls import Address, HttpUrl, Url, UrlTemplate
+from tests.markers import asyncio, unit
+from tests.server import LocalServer
+
+pytestmark = [unit, asyncio]
+
+
+async def test_bucket_allows_burst() -> None:
+    bucket: TokenBucket = TokenBucket(rate=1, capacity=3)
+    started: float = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    assert time.monotonic() - started < 0.1
+
+
+async def test_bucket_waits_for_refill() -> None:
+    bucket: TokenBucket = TokenBucket(rate=20, capacity=1)
+    started: float = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    assert time.monotonic() - started >= 0.09
+
+
+async def test_bucket_serves_waiters_in_order() -> None:
+    bucket: TokenBucket = TokenBucket(rate=50, capacity=1)
+    served: List[int] = []
+
+    async def waiter(index: int) -> None:
+        await bucket.acquire()
+        served.append(index)
+
+    await aio.gather(*(waiter(index) for index in range(5)))
+    assert served == list(range(5))
+
+
+async def test_bucket_rejects_non_positive_rate() -> None:
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+async def test_limiter_limits_hosts_separately() -> None:
+    limiter: RateLimiter = RateLimiter(per_host={"slow.com": 10})
+    started: float = time.monotonic()
+    for _ in range(5):
+        await limiter.acquire("fast.com")
+    assert time.monotonic() - started < 0.1
+    for _ in range(12):
+        await limiter.acquire("slow.com")
+    assert time.monotonic() - started >= 0.15
+
+
+async def test_limiter_limits_globally() -> None:
+    limiter: RateLimiter = RateLimiter(rate=10)
+    started: float = time.monotonic()
+    for host in ("a.com", "b.com", "c.com") * 4:
+        await limiter.acquire(host)
+    assert time.monotonic() - started >= 0.15
+
+
+@pytest.mark.parametrize(
+    "address",
+    (
+        pytest.param(HttpUrl, id="host"),
+        pytest.param(lambda host: Url(f"http://{host}/", "http"), id="full url"),
+        pytest.param(lambda host: UrlTemplate(f"http://{host}", "/", "http").bind(), id="template"),
+    ),
+)
+async def test_session_waits_for_limiter(address: Callable[[str], Address]) -> None:
+    server: LocalServer = await LocalServer().start()
+    try:
+        async with HttpSession(
+            transport=StreamTransport(),
+            options=SessionOptions(limiter=RateLimiter(per_host={server.host: 20})),
+        ) as session:
+            started: float = time.monotonic()
+            await session.mapped("get", [address(server.host)] * 25)
+            assert time.monotonic() - started >= 0.2
+            assert len(server.requests) == 25
+    finally:
+        await server.stop()
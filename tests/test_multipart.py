@@ -0,0 +1,100 @@
+import json
+import pathlib
+from email.message import Message
+from email.parser import BytesParser
+from typing import AsyncIterator, Dict, List, Optional
+from aiorequest.multipart import Multipart
+from aiorequest.responses import Response
+from aiorequest.sessions import HttpSession
+from aiorequest.transports import StreamTransport
+from aiorequest.urls import HttpUrl
+from tests.markers import asyncio, unit
+from tests.server import LocalServer, Reply
+
+pytestmark = [unit, asyncio]
+
+
+async def _form(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    message: Message = BytesParser().parsebytes(
+        f"Content-Type: {headers['content-type']}\r\n\r\n".encode() + body
+    )
+    parts: List[Dict[str, Optional[str]]] = [
+        {
+            "name": part.get_param("name", header="content-disposition"),
+            "filename": part.get_filename(),
+            "type": part.get("content-type"),
+            "data": part.get_payload(decode=True).decode(),
+        }
+        for part in message.get_payload()
+    ]
+    return (
+        200,
+        {},
+        json.dumps(
+            {
+                "length": headers.get("content-length"),
+                "received": len(body),
+                "encoding": headers.get("transfer-encoding"),
+                "parts": parts,
+            }
+        ).encode(),
+    )
+
+
+async def _pieces() -> AsyncIterator[bytes]:
+    for piece in (b"stre", b"amed"):
+        yield piece
+
+
+async def _posted(form: Multipart) -> Dict[str, object]:
+    server: LocalServer = await LocalServer(_form).start()
+    try:
+        async with HttpSession(transport=StreamTransport()) as session:
+            response: Response = await session.post(HttpUrl(server.host), upload=form)
+            return await response.as_json()
+    finally:
+        await server.stop()
+
+
+async def test_form_of_known_size(tmp_path: pathlib.Path) -> None:
+    report: pathlib.Path = tmp_path / "report.json"
+    report.write_bytes(b'{"ok": true}')
+    form: Multipart = Multipart()
+    form.add("title", "nightly")
+    form.add("report", report)
+    form.add("blob", b"raw", filename="blob.bin")
+    form.add("stream", _pieces(), filename="stream.txt", size=8)
+    posted: Dict[str, object] = await _posted(form)
+    assert posted["length"] == str(posted["received"]) == str(form.size())
+    assert posted["parts"] == [
+        {"name": "title", "filename": None, "type": None, "data": "nightly"},
+        {
+            "name": "report",
+            "filename": "report.json",
+            "type": "application/json",
+            "data": '{"ok": true}',
+        },
+        {
+            "name": "blob",
+            "filename": "blob.bin",
+            "type": "application/octet-stream",
+            "data": "raw",
+        },
+        {"name": "stream", "filename": "stream.txt", "type": "text/plain", "data": "streamed"},
+    ]
+
+
+async def test_form_of_unknown_size_is_chunked() -> None:
+    form: Multipart = Multipart()
+    form.add("stream", _pieces(), filename="stream.bin")
+    posted: Dict[str, object] = await _posted(form)
+    assert form.size() is None
+    assert posted["encoding"] == "chunked"
+    assert posted["parts"][0]["data"] == "streamed"  # type: ignore
+
+
+async def test_quoted_names() -> None:
+    form: Multipart = Multipart(boundary="edge")
+    form.add('a"b', "value")
+    assert b'name="a%22b"' in b"".join([chunk async for chunk in form.chunks()])
+    assert form.content_type() == "multipart/form-data; boundary=edge"
@@ -0,0 +1,168 @@
+import asyncio
+import json
+from typing import Dict, List
+from urllib.parse import SplitResult, parse_qs, parse_qsl, urlsplit
+import pytest
+from aiorequest.pages import CursorPages, LinkPages, OffsetPages, next_link, paginated
+from aiorequest.responses import Body, Response, ResponseError, SlimResponse, StreamResponse
+from aiorequest.sessions import HttpSession, Session
+from aiorequest.transports import StreamTransport
+from aiorequest.urls import Address, HttpUrl
+from tests.markers import asyncio as asyncio_marker, unit
+from tests.server import LocalServer, Reply
+
+pytestmark = [unit, asyncio_marker]
+
+_ITEMS: List[int] = list(range(7))
+
+
+async def _pages(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    target: SplitResult = urlsplit(path)
+    query: Dict[str, List[str]] = parse_qs(target.query)
+    if target.path == "/links":
+        page: int = int(query.get("page", ["1"])[0])
+        links: Dict[str, str] = (
+            {"Link": f'</links?page={page + 1}>; rel="next"'} if page < 3 else {}
+        )
+        return 200, links, json.dumps({"page": page}).encode()
+    if target.path == "/cursors":
+        cursor: int = int(query.get("cursor", ["0"])[0])
+        following: object = cursor + 1 if cursor < 2 else None
+        return 200, {}, json.dumps({"page": cursor, "meta": {"next": following}}).encode()
+    if target.path == "/offsets":
+        offset, limit = int(query["offset"][0]), int(query["limit"][0])
+        return 200, {}, json.dumps({"data": _ITEMS[offset : offset + limit]}).encode()
+    if target.path == "/slow":
+        await asyncio.sleep(0.05)
+        page = int(query.get("page", ["1"])[0])
+        return 200, {"Link": f"</slow?page={page + 1}>; rel=next"}, b"{}"
+    return 503, {}, b"unavailable"
+
+
+class _Slow(Body):
+    """Returns given data in pieces, every piece after a pause."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data: bytes = data
+
+    async def read(self, size: int = 65536) -> bytes:
+        await asyncio.sleep(0.01)
+        piece, self._data = self._data[:4], self._data[4:]
+        return piece
+
+    async def close(self) -> None:
+        self._data = b""
+
+
+async def _slow_cursors(address: Address) -> Response:
+    cursor: int = int(dict(parse_qsl(urlsplit(address.url).query)).get("cursor", "0"))
+    following: object = cursor + 1 if cursor < 2 else None
+    return StreamResponse(
+        200, {}, stream=_Slow(json.dumps({"page": cursor, "next_cursor": following}).encode())
+    )
+
+
+@pytest.fixture()
+async def server() -> LocalServer:
+    local_server: LocalServer = await LocalServer(_pages).start()
+    yield local_server
+    await local_server.stop()
+
+
+@pytest.fixture()
+async def session() -> Session:
+    stream_session: Session
+    async with HttpSession(transport=StreamTransport()) as stream_session:
+        yield stream_session
+
+
+async def test_link_pages(session: Session, server: LocalServer) -> None:
+    pages: List[Response] = [
+        page async for page in session.paginate(HttpUrl(server.host, "links"), LinkPages())
+    ]
+    assert [(await page.as_json())["page"] for page in pages] == [1, 2, 3]
+
+
+async def test_cursor_pages(session: Session, server: LocalServer) -> None:
+    assert [
+        (await page.as_json())["page"]
+        async for page in session.paginate(
+            HttpUrl(server.host, "cursors", query={"q": "x"}), CursorPages("meta.next")
+        )
+    ] == [0, 1, 2]
+    assert server.requests[-1] == "/cursors?q=x&cursor=2"
+
+
+async def test_offset_pages(session: Session, server: LocalServer) -> None:
+    assert [
+        (await page.as_json())["data"]
+        async for page in session.paginate(
+            HttpUrl(server.host, "offsets"), OffsetPages(limit=3, items="data")
+        )
+    ] == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+async def test_streamed_pages_are_read_by_strategy_and_caller() -> None:
+    assert [
+        (await page.as_json())["page"]
+        async for page in paginated(_slow_cursors, HttpUrl("api.io", "items"), CursorPages())
+    ] == [0, 1, 2]
+
+
+async def test_pages_are_prefetched_within_bound(session: Session, server: LocalServer) -> None:
+    async for page in session.paginate(HttpUrl(server.host, "slow"), prefetch=2, pages=10):
+        await asyncio.sleep(0.2)
+        requested: int = len(server.requests)
+        break
+    assert requested == 3
+
+
+async def test_pages_limit(session: Session, server: LocalServer) -> None:
+    assert (
+        len([page async for page in session.paginate(HttpUrl(server.host, "slow"), pages=2)]) == 2
+    )
+
+
+async def test_failed_page_is_raised(session: Session, server: LocalServer) -> None:
+    seen: List[Response] = []
+    with pytest.raises(ResponseError):
+        async for page in session.paginate(HttpUrl(server.host, "fail"), prefetch=0):
+            seen.append(page)
+    assert seen == []
+
+
+@pytest.mark.parametrize("host", ["httpbin.org", "http-api.local"])
+async def test_pages_of_host_named_after_protocol(host: str) -> None:
+    url: HttpUrl = HttpUrl(host, "/items", query={"q": "x"})
+    cursor: Address = await CursorPages().following(
+        url, SlimResponse(200, b"", b'{"next_cursor": "c 1"}')
+    )
+    assert cursor.url == f"http://{host}/items?q=x&cursor=c%201"
+    assert cursor.hostname == host
+    assert cursor.path == "/items"
+    offset: Address = OffsetPages(limit=2).first(HttpUrl(host, "/items"))
+    assert offset.url == f"http://{host}/items?offset=0&limit=2"
+    link: Address = await LinkPages().following(
+        url, SlimResponse(200, b'Link: </items?page=2>; rel="next"')
+    )
+    assert link.url == f"http://{host}/items?page=2"
+    assert link.hostname == host
+
+
+async def test_prefetched_pages_are_released(session: Session, server: LocalServer) -> None:
+    async for page in session.paginate(HttpUrl(server.host, "links"), prefetch=2, stream=True):
+        await asyncio.sleep(0.1)
+        break
+    await asyncio.sleep(0.01)
+    assert (await session.pool_stats())[f"http://{server.host}"].in_use == 1
+    assert (await page.as_json())["page"] == 1
+    assert (await session.pool_stats())[f"http://{server.host}"].in_use == 0
+
+
+async def test_next_link() -> None:
+    assert (
+        next_link('<https://a.io/2>; rel="prev", <https://a.io/4>; title="x"; rel="last next"')
+        == "https://a.io/4"
+    )
+    assert next_link('<https://a.io/1>; rel="prev"') is None
+    assert next_link("") is None
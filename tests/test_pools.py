@@ -0,0 +1,58 @@
+import asyncio
+from typing import Dict
+import pytest
+from aiorequest.pools import ConnectionPool, PoolLimits, PoolStats
+from aiorequest.sessions import HttpSession
+from aiorequest.transports import StreamTransport
+from aiorequest.urls import HttpUrl
+from tests.markers import asyncio as asyncio_marker, unit
+from tests.server import LocalServer, Reply, echo
+
+pytestmark = [unit, asyncio_marker]
+
+
+async def _slow(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    await asyncio.sleep(0.05)
+    return await echo(method, path, headers, body)
+
+
+@pytest.fixture()
+async def server() -> LocalServer:
+    local_server: LocalServer = await LocalServer(_slow).start()
+    yield local_server
+    await local_server.stop()
+
+
+async def test_pool_per_host_limit(server: LocalServer) -> None:
+    async with HttpSession(
+        transport=StreamTransport(ConnectionPool(PoolLimits(per_host=2)))
+    ) as session:
+        await asyncio.gather(*(session.get(HttpUrl(server.host)) for _ in range(6)))
+    assert server.connections == 2
+
+
+async def test_pool_total_limit(server: LocalServer) -> None:
+    async with HttpSession(
+        transport=StreamTransport(ConnectionPool(PoolLimits(total=3)))
+    ) as session:
+        await asyncio.gather(*(session.get(HttpUrl(server.host)) for _ in range(6)))
+    assert server.connections == 3
+
+
+async def test_pool_stats(server: LocalServer) -> None:
+    async with HttpSession(transport=StreamTransport()) as session:
+        await asyncio.gather(*(session.get(HttpUrl(server.host)) for _ in range(2)))
+        assert await session.pool_stats() == {
+            f"http://127.0.0.1:{server.port}": PoolStats(opened=2, idle=2, in_use=0)
+        }
+
+
+async def test_pool_idle_eviction(server: LocalServer) -> None:
+    async with HttpSession(
+        transport=StreamTransport(ConnectionPool(PoolLimits(idle_ttl=0.1)))
+    ) as session:
+        await session.get(HttpUrl(server.host))
+        await asyncio.sleep(0.3)
+        assert await session.pool_stats() == {
+            f"http://127.0.0.1:{server.port}": PoolStats(opened=0, idle=0, in_use=0)
+        }
@@ -0,0 +1,104 @@
+import asyncio
+import socket
+from typing import List, Optional, Tuple
+import pytest
+from aiorequest.pools import ConnectionPool
+from aiorequest.resolvers import CachingResolver, Resolution, Resolver, SystemResolver
+from aiorequest.sessions import HttpSession
+from aiorequest.transports import StreamTransport
+from aiorequest.urls import HttpUrl
+from tests.markers import asyncio as asyncio_marker, unit
+from tests.server import LocalServer
+
+pytestmark = [unit, asyncio_marker]
+
+
+class _Counted(Resolver):
+    """Resolves every host to given addresses and counts lookups."""
+
+    def __init__(
+        self,
+        addresses: Tuple[Tuple[int, Tuple[str, int]], ...] = ((socket.AF_INET, ("127.0.0.1", 80)),),
+        ttl: Optional[float] = None,
+        error: Optional[OSError] = None,
+    ) -> None:
+        self._addresses: Tuple[Tuple[int, Tuple[str, int]], ...] = addresses
+        self._ttl: Optional[float] = ttl
+        self._error: Optional[OSError] = error
+        self.lookups: List[str] = []
+
+    async def resolve(self, host: str, port: int) -> Resolution:
+        self.lookups.append(host)
+        await asyncio.sleep(0)
+        if self._error is not None:
+            raise self._error
+        return Resolution(self._addresses, self._ttl)
+
+
+async def test_system_resolver() -> None:
+    resolution: Resolution = await SystemResolver().resolve("127.0.0.1", 80)
+    assert resolution.addresses[0] == (socket.AF_INET, ("127.0.0.1", 80))
+    assert resolution.ttl is None
+
+
+async def test_resolutions_are_cached() -> None:
+    counted: _Counted = _Counted()
+    resolver: CachingResolver = CachingResolver(counted)
+    first: Resolution = await resolver.resolve("example.com", 80)
+    assert await resolver.resolve("EXAMPLE.com", 80) == first
+    assert counted.lookups == ["example.com"]
+
+
+async def test_concurrent_resolutions_share_lookup() -> None:
+    counted: _Counted = _Counted()
+    resolver: CachingResolver = CachingResolver(counted)
+    await asyncio.gather(*(resolver.resolve("example.com", 80) for _ in range(5)))
+    assert len(counted.lookups) == 1
+
+
+async def test_short_record_ttl_is_respected() -> None:
+    counted: _Counted = _Counted(ttl=0)
+    resolver: CachingResolver = CachingResolver(counted, ttl=60)
+    await resolver.resolve("example.com", 80)
+    await resolver.resolve("example.com", 80)
+    assert len(counted.lookups) == 2
+
+
+async def test_failures_are_cached() -> None:
+    counted: _Counted = _Counted(error=socket.gaierror(socket.EAI_NONAME, "unknown"))
+    resolver: CachingResolver = CachingResolver(counted, negative_ttl=60)
+    for _ in range(2):
+        with pytest.raises(socket.gaierror):
+            await resolver.resolve("unknown.invalid", 80)
+    assert len(counted.lookups) == 1
+
+
+async def test_least_recent_hosts_are_forgotten() -> None:
+    counted: _Counted = _Counted()
+    resolver: CachingResolver = CachingResolver(counted, entries=2)
+    for host in ("a.com", "b.com", "a.com", "c.com", "a.com", "b.com"):
+        await resolver.resolve(host, 80)
+    assert len(resolver) == 2
+    assert counted.lookups == ["a.com", "b.com", "c.com", "b.com"]
+
+
+async def test_refused_address_is_skipped() -> None:
+    closed: socket.socket = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    port: int = closed.getsockname()[1]
+    closed.close()
+    server: LocalServer = await LocalServer().start()
+    resolver: _Counted = _Counted(
+        (
+            (socket.AF_INET, ("127.0.0.1", port)),
+            (socket.AF_INET, ("127.0.0.1", server.port)),
+        )
+    )
+    try:
+        async with HttpSession(
+            transport=StreamTransport(ConnectionPool(resolver=resolver))
+        ) as session:
+            assert await (await session.get(HttpUrl(server.host))).is_ok()
+    finally:
+        await server.stop()
+    assert server.connections == 1
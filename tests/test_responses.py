@@ -1,7 +1,8 @@
-from typing import Iterable
+from typing import Iterable, List
 import pytest
 from tests.fake import FakeHttpResponse
 from aiorequest.responses import HTTPStatus, Response, ResponseError, safe_response
+from aiorequest.responses import Body, SlimResponse, StreamResponse
 from tests.markers import asyncio, unit
 
 pytestmark = [unit, asyncio]
@@ -79,3 +80,66 @@ async def test_logged_response_code(logged_response: Response) -> None:
 
 async def test_logged_response_text(logged_response: Response) -> None:
     assert await logged_response.as_str()
+
+
+async def test_safe_response_error_reason_is_bounded() -> None:
+    with pytest.raises(ResponseError, match=r"Reason: x{512}\.\.\.$"):
+        await safe_response(FakeHttpResponse(HTTPStatus.BAD_GATEWAY, as_str="x" * 10000))
+
+
+class _Pieces(Body):
+    """Returns given pieces of data and remembers whether it is closed."""
+
+    def __init__(self, pieces: List[bytes]) -> None:
+        self._pieces: List[bytes] = pieces
+        self.closed: bool = False
+
+    async def read(self, size: int = 65536) -> bytes:
+        return self._pieces.pop(0) if self._pieces else b""
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+async def test_safe_response_error_keeps_streamed_data() -> None:
+    body: _Pieces = _Pieces([b"x" * 500, b"y" * 12])
+    with pytest.raises(ResponseError, match=r"Reason: x{500}y{12}$") as error:
+        await safe_response(StreamResponse(HTTPStatus.BAD_GATEWAY, {}, stream=body))
+    assert body.closed
+    assert await error.value.response.as_str() == "x" * 500 + "y" * 12  # type: ignore
+
+
+async def test_safe_response_error_decodes_bounded_prefix() -> None:
+    body: _Pieces = _Pieces(["é".encode("latin-1") * 600, b"\xff" * 1000])
+    with pytest.raises(ResponseError, match=r"Reason: é{512}\.\.\.$"):
+        await safe_response(
+            StreamResponse(
+                HTTPStatus.BAD_GATEWAY, {"content-type": "text/plain; charset=latin-1"}, stream=body
+            )
+        )
+    assert body.closed
+
+
+async def test_slim_response_data() -> None:
+    content: bytes = b'{"items": [1, 2]}\nline'
+    slim: SlimResponse = SlimResponse(
+        200, b"Content-Type: application/json; charset=utf-8\r\nX-Id: 1", content
+    )
+    view: memoryview = await slim.as_bytes()
+    assert view.obj is content
+    assert (await slim.headers())["x-id"] == "1"
+    assert await slim.as_str() == content.decode()
+    assert [line async for line in slim.iter_lines()] == ['{"items": [1, 2]}', "line"]
+    assert await slim.status() is HTTPStatus.OK
+
+
+@pytest.mark.parametrize(  # noqa: PT006, PT007
+    "response, ok",
+    (
+        pytest.param(StreamResponse(201, {}), True, id="stream"),
+        pytest.param(SlimResponse(404, b""), False, id="slim"),
+    ),
+)
+async def test_response_status_code(response: Response, ok: bool) -> None:
+    assert response.status_code == await response.status()
+    assert response.ok is ok is await response.is_ok()
@@ -0,0 +1,103 @@
+import time
+from typing import Dict, List
+import pytest
+from aiorequest.responses import HTTPStatus, Response, ResponseError
+from aiorequest.retries import Backoff, RetryPolicy
+from aiorequest.sessions import HttpSession, SessionOptions
+from aiorequest.transports import StreamTransport
+from aiorequest.urls import HttpUrl
+from tests.fake import FakeHttpResponse
+from tests.markers import asyncio, unit
+from tests.server import LocalServer, Reply
+
+pytestmark = [unit, asyncio]
+
+
+class _Flaky:
+    """Fails given number of requests with given status and headers."""
+
+    def __init__(self, failures: int, status: int = 503, headers: Dict[str, str] = {}) -> None:
+        self._failures: int = failures
+        self._status: int = status
+        self._headers: Dict[str, str] = headers
+        self.attempts: int = 0
+
+    async def __call__(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+        self.attempts += 1
+        if self.attempts <= self._failures:
+            return self._status, dict(self._headers), b"failed"
+        return 200, {}, b"ok"
+
+
+async def _attempts(route: _Flaky, policy: RetryPolicy, method: str = "get") -> int:
+    server: LocalServer = await LocalServer(route).start()
+    try:
+        async with HttpSession(
+            transport=StreamTransport(), options=SessionOptions(policy)
+        ) as session:
+            response: Response = await getattr(session, method)(HttpUrl(server.host))
+            assert await response.as_str() == "ok"
+    finally:
+        await server.stop()
+    return route.attempts
+
+
+async def test_retry_transient_status() -> None:
+    assert await _attempts(_Flaky(2), RetryPolicy(attempts=3, backoff=Backoff(0.01))) == 3
+
+
+async def test_retry_gives_up() -> None:
+    with pytest.raises(ResponseError):
+        await _attempts(_Flaky(3), RetryPolicy(attempts=3, backoff=Backoff(0.01)))
+
+
+async def test_retry_skips_post() -> None:
+    with pytest.raises(ResponseError):
+        await _attempts(_Flaky(1), RetryPolicy(backoff=Backoff(0.01)), method="post")
+
+
+async def test_retry_skips_client_error() -> None:
+    with pytest.raises(ResponseError):
+        await _attempts(_Flaky(1, status=404), RetryPolicy(backoff=Backoff(0.01)))
+
+
+async def test_retry_after_header() -> None:
+    start: float = time.monotonic()
+    await _attempts(
+        _Flaky(1, status=429, headers={"Retry-After": "1"}), RetryPolicy(backoff=Backoff(0))
+    )
+    assert time.monotonic() - start >= 1
+
+
+async def test_retry_after_header_is_limited_by_maximum_wait() -> None:
+    start: float = time.monotonic()
+    await _attempts(
+        _Flaky(1, status=503, headers={"Retry-After": "60"}),
+        RetryPolicy(backoff=Backoff(0, maximum=0.01)),
+    )
+    assert time.monotonic() - start < 1
+
+
+async def test_retry_deadline() -> None:
+    policy: RetryPolicy = RetryPolicy(attempts=5, backoff=Backoff(10, maximum=10, deadline=0.01))
+    calls: List[int] = []
+
+    async def request() -> Response:
+        calls.append(1)
+        raise ConnectionError()
+
+    with pytest.raises(ConnectionError):
+        await policy.call("GET", request)
+    assert len(calls) <= 2
+
+
+async def test_retry_fake_response() -> None:
+    responses: List[Response] = [FakeHttpResponse(HTTPStatus.OK)]
+
+    async def request() -> Response:
+        if len(responses) == 1:
+            responses.append(FakeHttpResponse(HTTPStatus.BAD_GATEWAY))
+            raise ResponseError("bad gateway", responses[-1])
+        return responses[0]
+
+    assert await RetryPolicy(backoff=Backoff(0)).call("GET", request) is responses[0]
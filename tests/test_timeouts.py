@@ -0,0 +1,123 @@
+import asyncio
+import time
+from typing import Dict, Optional
+import pytest
+from aiorequest.connections import HttpConnection
+from aiorequest.responses import Response, ResponseError
+from aiorequest.retries import Backoff, RetryPolicy
+from aiorequest.sessions import HttpSession, SessionOptions
+from aiorequest.timeouts import Deadline, Timeouts, remaining
+from aiorequest.transports import StreamTransport
+from aiorequest.urls import HttpUrl
+from tests.markers import asyncio as asyncio_marker, unit
+from tests.server import LocalServer, Reply
+
+pytestmark = [unit, asyncio_marker]
+
+
+async def _slow(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    await asyncio.sleep(float(path.strip("/") or 0))
+    return 503 if path == "/0" else 200, {}, b"done"
+
+
+async def _stalled(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    await reader.readuntil(b"\r\n\r\n")
+    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nstart")
+    await writer.drain()
+    await asyncio.sleep(1)
+    writer.close()
+
+
+async def test_timeouts_are_merged() -> None:
+    assert Timeouts(connect=1, read=2).merged(Timeouts(read=3, total=4)) == Timeouts(
+        connect=1, read=3, total=4
+    )
+    assert Timeouts(connect=1).merged(None) == Timeouts(connect=1)
+
+
+async def test_timeouts_are_bounded() -> None:
+    assert Timeouts(connect=1, read=5).within(2) == Timeouts(1, 2, 2, 2, 2)
+    assert Timeouts(connect=1).within(None) == Timeouts(connect=1)
+
+
+async def test_deadline_expires() -> None:
+    started: float = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        async with Deadline(0.05):
+            await asyncio.sleep(1)
+    assert time.monotonic() - started < 0.5
+    assert remaining() is None
+
+
+async def test_nested_deadline_keeps_closest_one() -> None:
+    async with Deadline(0.5):
+        async with Deadline(10):
+            left: Optional[float] = remaining()
+            assert left is not None and left <= 0.5
+        async with Deadline(None):
+            assert remaining() is not None
+
+
+async def test_connect_timeout() -> None:
+    server: LocalServer = await LocalServer().start()
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await HttpConnection.opened("127.0.0.1", server.port, timeouts=Timeouts(connect=0))
+    finally:
+        await server.stop()
+
+
+async def test_first_byte_timeout() -> None:
+    server: LocalServer = await LocalServer(_slow).start()
+    try:
+        async with HttpSession(
+            transport=StreamTransport(), options=SessionOptions(timeouts=Timeouts(first_byte=0.05))
+        ) as session:
+            with pytest.raises(asyncio.TimeoutError):
+                await session.get(HttpUrl(server.host, "1"))
+            response: Response = await session.get(
+                HttpUrl(server.host, "0.1"), timeouts=Timeouts(first_byte=1)
+            )
+            assert await response.as_str() == "done"
+    finally:
+        await server.stop()
+
+
+async def test_read_idle_timeout() -> None:
+    server: asyncio.AbstractServer = await asyncio.start_server(_stalled, "127.0.0.1", 0)
+    port: int = server.sockets[0].getsockname()[1]
+    try:
+        async with HttpSession(transport=StreamTransport()) as session:
+            with pytest.raises(asyncio.TimeoutError):
+                await session.get(HttpUrl(f"127.0.0.1:{port}"), timeouts=Timeouts(read=0.05))
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+async def test_total_timeout_covers_retries() -> None:
+    server: LocalServer = await LocalServer(_slow).start()
+    started: float = time.monotonic()
+    try:
+        async with HttpSession(
+            transport=StreamTransport(),
+            options=SessionOptions(RetryPolicy(attempts=100, backoff=Backoff(0.01))),
+        ) as session:
+            with pytest.raises((asyncio.TimeoutError, ResponseError)):
+                await session.get(HttpUrl(server.host, "0"), timeouts=Timeouts(total=0.2))
+    finally:
+        await server.stop()
+    assert time.monotonic() - started < 1
+
+
+async def test_session_deadline_cancels_bulk() -> None:
+    server: LocalServer = await LocalServer(_slow).start()
+    started: float = time.monotonic()
+    try:
+        async with HttpSession(transport=StreamTransport()) as session:
+            with pytest.raises(asyncio.TimeoutError):
+                async with session.deadline(0.1):
+                    await session.mapped("get", [HttpUrl(server.host, "1")] * 5)
+    finally:
+        await server.stop()
+    assert time.monotonic() - started < 0.5
@@ -0,0 +1,115 @@
+from typing import Dict, List, Tuple
+from aiorequest.responses import Response, ResponseError
+from aiorequest.retries import Backoff, RetryPolicy
+from aiorequest.sessions import HttpSession, SessionOptions
+from aiorequest.traces import LatencyStats, Percentiles, Trace, TraceEvent, Tracer, current
+from aiorequest.transports import StreamTransport
+from aiorequest.urls import HttpUrl
+from tests.markers import asyncio, unit
+from tests.server import LocalServer, Reply
+
+pytestmark = [unit, asyncio]
+
+
+class _Recorder(Tracer):
+    """Keeps received trace events."""
+
+    def __init__(self) -> None:
+        self.events: List[TraceEvent] = []
+
+    def record(self, event: TraceEvent) -> None:
+        self.events.append(event)
+
+    def phases(self) -> List[str]:
+        return [event.phase for event in self.events]
+
+
+async def _unavailable(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    return 503, {}, b"unavailable"
+
+
+async def test_request_phases_are_traced() -> None:
+    tracer: _Recorder = _Recorder()
+    server: LocalServer = await LocalServer().start()
+    try:
+        async with HttpSession(
+            transport=StreamTransport(), options=SessionOptions(tracer=tracer)
+        ) as session:
+            await session.get(HttpUrl(server.host))
+            await session.get(HttpUrl(server.host))
+    finally:
+        await server.stop()
+    assert tracer.phases() == [
+        "request_start",
+        "dns_resolved",
+        "connection_acquired",
+        "headers_sent",
+        "first_byte",
+        "body_complete",
+        "request_start",
+        "connection_acquired",
+        "headers_sent",
+        "first_byte",
+        "body_complete",
+    ]
+    assert [event.reused for event in tracer.events if event.phase == "connection_acquired"] == [
+        False,
+        True,
+    ]
+    assert all(event.at >= event.previous >= event.started for event in tracer.events)
+    assert current() is None
+
+
+async def test_streamed_body_completion_is_traced() -> None:
+    tracer: _Recorder = _Recorder()
+    server: LocalServer = await LocalServer().start()
+    try:
+        async with HttpSession(
+            transport=StreamTransport(), options=SessionOptions(tracer=tracer)
+        ) as session:
+            response: Response = await session.get(HttpUrl(server.host), stream=True)
+            assert "body_complete" not in tracer.phases()
+            async for _ in response.iter_bytes():
+                pass
+    finally:
+        await server.stop()
+    assert tracer.phases()[-1] == "body_complete"
+
+
+async def test_retries_and_failure_are_traced() -> None:
+    tracer: _Recorder = _Recorder()
+    server: LocalServer = await LocalServer(_unavailable).start()
+    try:
+        async with HttpSession(
+            transport=StreamTransport(),
+            options=SessionOptions(RetryPolicy(attempts=2, backoff=Backoff(0)), tracer=tracer),
+        ) as session:
+            try:
+                await session.get(HttpUrl(server.host))
+            except ResponseError:
+                pass
+    finally:
+        await server.stop()
+    assert [event.phase for event in tracer.events if event.phase in ("retry", "exception")] == [
+        "retry",
+        "exception",
+    ]
+    assert isinstance(tracer.events[-1].error, ResponseError)
+    assert tracer.events[-1].attempt == 2
+
+
+async def test_latency_percentiles() -> None:
+    stats: LatencyStats = LatencyStats()
+    for number in range(1, 101):
+        stats.record(TraceEvent("first_byte", "GET", "url", "a.com", 0, 0, number / 100))
+    stats.record(TraceEvent("first_byte", "GET", "url", "b.com", 0, 0, 1))
+    percentiles: Dict[Tuple[str, str], Percentiles] = await stats.percentiles()
+    assert percentiles[("a.com", "first_byte")] == Percentiles(100, 0.5, 0.95, 0.99)
+    assert percentiles[("b.com", "first_byte")] == Percentiles(1, 1, 1, 1)
+
+
+async def test_trace_is_current_within_its_context() -> None:
+    trace: Trace = Trace(_Recorder(), "GET", "url", "a.com")
+    with trace:
+        assert current() is trace
+    assert current() is None
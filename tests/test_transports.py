@@ -0,0 +1,176 @@
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List
+import pytest
+import requests
+from aiorequest.responses import HTTPStatus, Response, SlimResponse
+from aiorequest.sessions import HttpSession, Session
+from aiorequest.transports import RequestOptions, StreamTransport
+from aiorequest.uploads import IterableUpload
+from aiorequest.urls import HttpUrl
+from tests.markers import asyncio as asyncio_marker, unit
+from tests.server import LocalServer, Reply, echo
+
+pytestmark = [unit, asyncio_marker]
+
+
+async def _slow(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    await asyncio.sleep(0.2)
+    return await echo(method, path, headers, body)
+
+
+@pytest.fixture()
+async def server() -> LocalServer:
+    local_server: LocalServer = await LocalServer().start()
+    yield local_server
+    await local_server.stop()
+
+
+@pytest.fixture()
+async def stream_session() -> Session:
+    session: Session
+    async with HttpSession(transport=StreamTransport()) as session:
+        yield session
+
+
+async def test_stream_get(stream_session: Session, server: LocalServer) -> None:
+    response: Response = await stream_session.get(HttpUrl(server.host, "/api?q=1"))
+    assert await response.status() is HTTPStatus.OK
+    assert (await response.as_json())["path"] == "/api?q=1"
+
+
+async def test_stream_post_as_dict(stream_session: Session, server: LocalServer) -> None:
+    response: Response = await stream_session.post(HttpUrl(server.host), as_dict={"key": 1})
+    assert (await response.as_json())["body"] == '{"key": 1}'
+
+
+async def test_stream_head(stream_session: Session, server: LocalServer) -> None:
+    assert not await (await stream_session.head(HttpUrl(server.host))).as_str()
+
+
+async def test_stream_keep_alive(stream_session: Session, server: LocalServer) -> None:
+    for _ in range(3):
+        await stream_session.get(HttpUrl(server.host))
+    assert server.connections == 1
+
+
+async def test_stream_gather_overlaps() -> None:
+    server: LocalServer = await LocalServer(_slow).start()
+    try:
+        async with HttpSession(transport=StreamTransport()) as session:
+            start: float = time.monotonic()
+            await asyncio.gather(*(session.get(HttpUrl(server.host)) for _ in range(10)))
+            assert time.monotonic() - start < 1
+    finally:
+        await server.stop()
+
+
+async def test_requests_workers_overlap() -> None:
+    server: LocalServer = await LocalServer(_slow).start()
+    try:
+        async with HttpSession(requests.Session(), workers=10) as session:
+            start: float = time.monotonic()
+            await asyncio.gather(*(session.get(HttpUrl(server.host)) for _ in range(10)))
+            assert time.monotonic() - start < 1
+    finally:
+        await server.stop()
+
+
+async def _lines(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    return (
+        200,
+        {"Transfer-Encoding": "chunked"},
+        b"5\r\nfirst\r\n7\r\n\nsecond\r\n1\r\n\n\r\n0\r\n\r\n",
+    )
+
+
+async def test_stream_iter_lines() -> None:
+    server: LocalServer = await LocalServer(_lines).start()
+    try:
+        async with HttpSession(transport=StreamTransport()) as session:
+            response: Response = await session.get(HttpUrl(server.host), stream=True)
+            assert [line async for line in response.iter_lines()] == ["first", "second"]
+            assert (await session.pool_stats())[f"http://{server.host}"].idle == 1
+    finally:
+        await server.stop()
+
+
+async def test_stream_iter_bytes(stream_session: Session, server: LocalServer) -> None:
+    response: Response = await stream_session.post(HttpUrl(server.host), "x" * 10, stream=True)
+    chunks = [chunk async for chunk in response.iter_bytes(chunk_size=7)]
+    assert all(len(chunk) == 7 for chunk in chunks[:-1])
+    assert b"".join(chunks).endswith(b'"body": "xxxxxxxxxx"}')
+
+
+async def test_stream_consumed_once(stream_session: Session, server: LocalServer) -> None:
+    response: Response = await stream_session.get(HttpUrl(server.host), stream=True)
+    assert [chunk async for chunk in response.iter_chunks()]
+    with pytest.raises(RuntimeError):
+        await response.as_str()
+
+
+async def test_stream_slim_response(server: LocalServer) -> None:
+    async with HttpSession(transport=StreamTransport(slim=True)) as session:
+        response: Response = await session.get(HttpUrl(server.host, "/slim"))
+        assert isinstance(response, SlimResponse)
+        assert (await response.headers())["content-type"] == "application/json"
+        assert (await response.as_json())["path"] == "/slim"
+        assert not isinstance(await session.get(HttpUrl(server.host), stream=True), SlimResponse)
+
+
+async def _piece() -> AsyncIterator[bytes]:
+    yield b"x"
+
+
+@pytest.mark.parametrize(  # noqa: PT006, PT007
+    "method, streamed, replayed",
+    (("GET", False, True), ("DELETE", False, True), ("POST", False, False), ("PUT", True, False)),
+)
+async def test_stream_replay_on_stale_connection(
+    method: str, streamed: bool, replayed: bool
+) -> None:
+    connections: List[int] = []
+
+    async def drop_second(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connections.append(1)
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+        await writer.drain()
+        await reader.readuntil(b"\r\n\r\n")
+        writer.close()
+
+    server: asyncio.AbstractServer = await asyncio.start_server(drop_second, "127.0.0.1", 0)
+    url: str = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/"
+    transport: StreamTransport = StreamTransport()
+    try:
+        await transport.request("GET", url)
+        if replayed:
+            assert await (await transport.request(method, url)).status() is HTTPStatus.OK
+        else:
+            with pytest.raises((ConnectionError, asyncio.IncompleteReadError)):
+                await transport.request(
+                    method, url, RequestOptions(data=IterableUpload(_piece()) if streamed else "x")
+                )
+    finally:
+        await transport.close()
+        server.close()
+        await server.wait_closed()
+    assert len(connections) == (2 if replayed else 1)
+
+
+async def _cookie(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    status, response_headers, content = await echo(method, path, headers, body)
+    return status, dict(response_headers, **{"Set-Cookie": "token=1; Path=/"}), content
+
+
+async def test_requests_workers_use_sessions_of_their_own() -> None:
+    server: LocalServer = await LocalServer(_cookie).start()
+    try:
+        async with HttpSession(workers=4) as pooled, HttpSession(workers=2) as other:
+            await pooled.get(HttpUrl(server.host))
+            sent: Response = await pooled.get(HttpUrl(server.host))
+            assert "cookie" in (await sent.as_json())["headers"]
+            sent = await other.get(HttpUrl(server.host))
+            assert "cookie" not in (await sent.as_json())["headers"]
+    finally:
+        await server.stop()
@@ -0,0 +1,130 @@
+import hashlib
+import io
+import json
+import os
+from typing import AsyncIterator, Dict
+import pytest
+from aiorequest.responses import Response, ResponseError
+from aiorequest.retries import Backoff, RetryPolicy
+from aiorequest.sessions import HttpSession, SessionOptions
+from aiorequest.transports import Http2Transport, StreamTransport, Transport
+from aiorequest.uploads import FileUpload, IterableUpload, uploaded
+from aiorequest.urls import HttpUrl
+from tests.markers import asyncio, unit
+from tests.server import Http2Server, LocalServer, Reply
+
+pytestmark = [unit, asyncio]
+
+_DATA: bytes = os.urandom(300000)
+
+
+async def _digest(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+    return (
+        200,
+        {},
+        json.dumps(
+            {
+                "sha256": hashlib.sha256(body).hexdigest(),
+                "length": headers.get("content-length"),
+                "encoding": headers.get("transfer-encoding"),
+            }
+        ).encode(),
+    )
+
+
+async def _pieces() -> AsyncIterator[bytes]:
+    for start in range(0, len(_DATA), 70000):
+        yield _DATA[start : start + 70000]
+
+
+@pytest.fixture()
+def path(tmp_path: str) -> str:
+    file_path: str = os.path.join(str(tmp_path), "artefact.bin")
+    with open(file_path, "wb") as artefact:
+        artefact.write(_DATA)
+    return file_path
+
+
+async def _sent(server: LocalServer, transport: Transport, **kwargs: object) -> Dict[str, str]:
+    await server.start()
+    try:
+        async with HttpSession(transport=transport) as session:
+            response: Response = await session.post(HttpUrl(server.host), **kwargs)
+            return await response.as_json()
+    finally:
+        await server.stop()
+
+
+async def test_file_path_is_sent_with_length(path: str) -> None:
+    sent: Dict[str, str] = await _sent(LocalServer(_digest), StreamTransport(), upload=path)
+    assert sent == {
+        "sha256": hashlib.sha256(_DATA).hexdigest(),
+        "length": str(len(_DATA)),
+        "encoding": None,
+    }
+
+
+async def test_file_object_is_sent_from_its_position(path: str) -> None:
+    with open(path, "rb") as artefact:
+        artefact.seek(1000)
+        sent: Dict[str, str] = await _sent(LocalServer(_digest), StreamTransport(), upload=artefact)
+    assert sent["sha256"] == hashlib.sha256(_DATA[1000:]).hexdigest()
+
+
+async def test_in_memory_file_is_sent() -> None:
+    sent: Dict[str, str] = await _sent(
+        LocalServer(_digest), StreamTransport(), upload=io.BytesIO(_DATA)
+    )
+    assert sent["sha256"] == hashlib.sha256(_DATA).hexdigest()
+
+
+async def test_async_iterable_is_sent_chunked() -> None:
+    sent: Dict[str, str] = await _sent(LocalServer(_digest), StreamTransport(), upload=_pieces())
+    assert sent == {
+        "sha256": hashlib.sha256(_DATA).hexdigest(),
+        "length": None,
+        "encoding": "chunked",
+    }
+
+
+async def test_http2_uploads(path: str) -> None:
+    pytest.importorskip("h2")
+    for upload in (path, _pieces()):
+        sent: Dict[str, str] = await _sent(Http2Server(_digest), Http2Transport(), upload=upload)
+        assert sent["sha256"] == hashlib.sha256(_DATA).hexdigest()
+
+
+async def test_file_upload_part() -> None:
+    upload: FileUpload = FileUpload(io.BytesIO(_DATA), offset=10, size=20)
+    assert upload.size() == 20
+    assert b"".join([chunk async for chunk in upload.chunks()]) == _DATA[10:30]
+
+
+async def test_iterable_upload_is_consumed_once() -> None:
+    upload: IterableUpload = IterableUpload(_pieces())
+    assert len(b"".join([chunk async for chunk in upload.chunks()])) == len(_DATA)
+    with pytest.raises(RuntimeError):
+        async for _ in upload.chunks():
+            pass
+
+
+async def test_iterable_upload_is_not_retried() -> None:
+    async def unavailable(method: str, path: str, headers: Dict[str, str], body: bytes) -> Reply:
+        return 503, {}, b""
+
+    server: LocalServer = await LocalServer(unavailable).start()
+    try:
+        async with HttpSession(
+            transport=StreamTransport(),
+            options=SessionOptions(RetryPolicy(attempts=3, backoff=Backoff(0))),
+        ) as session:
+            with pytest.raises(ResponseError):
+                await session.put(HttpUrl(server.host), upload=_pieces())
+    finally:
+        await server.stop()
+    assert len(server.requests) == 1
+
+
+async def test_unsupported_upload() -> None:
+    with pytest.raises(TypeError):
+        uploaded(42)  # type: ignore
@@ -1,5 +1,5 @@
 import pytest
-from aiorequest.urls import Address, HttpUrl, HttpsUrl, Url
+from aiorequest.urls import Address, HttpUrl, HttpsUrl, Url, UrlTemplate
 from tests.markers import asyncio, unit
 
 _host: str = "9.9.9.9"
@@ -35,6 +35,10 @@ async def test_url_with_full_host_path() -> None:
     assert await Url(f"ftp://{_host}/w/r", protocol="ftp").as_str() == f"ftp://{_host}/w/r"
 
 
+async def test_url_host_named_after_protocol() -> None:
+    assert await HttpUrl("httpbin.org", "get").as_str() == "http://httpbin.org/get"
+
+
 async def test_url_host(url: Address) -> None:
     assert await url.host() == _host
 
@@ -69,3 +73,57 @@ async def test_https_url_matcher(https_url: Address) -> None:
 
 async def test_https_url_as_str(https_url: Address) -> None:
     assert await https_url.as_str() == f"https://{_host}{_path}"
+
+
+async def test_url_query_is_percent_encoded() -> None:
+    assert (
+        await HttpsUrl(_host, "find", query={"q": "a b/c&d", "tag": ["x", "y"], "page": 2}).as_str()
+        == f"https://{_host}/find?q=a%20b%2Fc%26d&tag=x&tag=y&page=2"
+    )
+
+
+async def test_url_query_extends_existing_one() -> None:
+    assert (
+        await HttpUrl(_host, "find?q=1", query=[("page", 2)]).as_str()
+        == f"http://{_host}/find?q=1&page=2"
+    )
+
+
+async def test_url_template_binds_values() -> None:
+    template: UrlTemplate = UrlTemplate(_host, "/users/{id}/posts/{post}", query={"v": 1})
+    url: Url = template.bind(id="a/b", post=7, query={"page": 2})
+    assert template.fields == ("id", "post")
+    assert await url.as_str() == f"https://{_host}/users/a%2Fb/posts/7?v=1&page=2"
+    assert await url.host() == _host
+    assert await url.matcher() == "/users/a%2Fb/posts/7"
+
+
+async def test_url_template_without_placeholders() -> None:
+    assert await UrlTemplate(_host, "ping", "http").bind().as_str() == f"http://{_host}/ping"
+
+
+async def test_url_template_with_full_host() -> None:
+    assert (
+        await UrlTemplate(f"https://{_host}/api/", "/users/{id}").bind(id=7).as_str()
+        == f"https://{_host}/api/users/7"
+    )
+
+
+async def test_url_template_host_named_after_protocol() -> None:
+    assert await UrlTemplate("https.io", "ping").bind().as_str() == "https://https.io/ping"
+
+
+async def test_url_template_requires_values() -> None:
+    with pytest.raises(KeyError):
+        UrlTemplate(_host, "/users/{id}").bind()
+
+
+async def test_url_template_rejects_positional_placeholders() -> None:
+    with pytest.raises(ValueError):
+        UrlTemplate(_host, "/users/{}")
+
+
+async def test_url_sync_accessors(http_url: Address) -> None:
+    assert http_url.url == await http_url.as_str()
+    assert http_url.hostname == await http_url.host()
+    assert http_url.path == await http_url.matcher()